@@ -0,0 +1,200 @@
+# pipeline/bulk_load.py
+
+import io
+import os
+import tempfile
+
+import pandas as pd
+import sqlalchemy
+from sqlalchemy import text
+
+
+# ==========================================================
+# [THEM MOI] Nap DataFrame vao bang staging bang duong bulk rieng cua tung DB (chon theo DB_TYPE):
+# - mysql:      LOAD DATA LOCAL INFILE (file tam)
+# - postgresql: COPY ... FROM STDIN (CSV trong bo nho)
+# - sqlserver:  executemany voi fast_executemany (pyodbc gui ca lo tham so 1 lan)
+# - khac / LOAD DATA bi tat: INSERT nhieu dong, moi cau lenh vua voi gioi han packet cua server
+# ==========================================================
+
+MSSQL_CHUNK_ROWS = 5000
+DEFAULT_PACKET_BYTES = 4 * 1024 * 1024
+PACKET_SAFETY = 0.75 # Chi dung 3/4 gioi han packet cho 1 cau INSERT
+MYSQL_LOCAL_INFILE_ERRORS = ("1148", "2068", "3948") # Ma loi MySQL khi LOAD DATA LOCAL bi tat (server/client)
+
+_DIALECT_TO_DB_TYPE = {"mysql": "mysql", "mariadb": "mysql", "postgresql": "postgresql", "mssql": "sqlserver"}
+
+
+def create_load_engine(database_url, db_type=None, **kwargs):
+    """Engine cho viec nap: bat local_infile (MySQL) / fast_executemany (SQL Server)."""
+    if db_type == "mysql":
+        kwargs.setdefault("connect_args", {}).setdefault("local_infile", True)
+    elif db_type == "sqlserver":
+        kwargs.setdefault("fast_executemany", True)
+    return sqlalchemy.create_engine(database_url, **kwargs)
+
+
+def _db_type_of(engine, db_type):
+    return db_type or _DIALECT_TO_DB_TYPE.get(engine.dialect.name, engine.dialect.name)
+
+
+def _records(df):
+    """DataFrame -> list tuple, NaN/NaT -> None."""
+    clean = df.astype(object).where(pd.notna(df), None)
+    return list(clean.itertuples(index=False, name=None))
+
+
+def _write_delimited(records, out, null_token):
+    """
+    Ghi CSV ma moi gia tri deu nam trong "..." (dau " nhan doi), NULL la `null_token` KHONG co ngoac
+    -> phan biet duoc NULL va chuoi rong / chuoi 'NULL'.
+    """
+    for record in records:
+        out.write(",".join(
+            null_token if value is None else '"' + str(value).replace('"', '""') + '"'
+            for value in record
+        ))
+        out.write("\n")
+
+
+def _qualified(engine, table_name, schema):
+    preparer = engine.dialect.identifier_preparer
+    if schema:
+        return f"{preparer.quote_schema(schema)}.{preparer.quote(table_name)}"
+    return preparer.quote(table_name)
+
+
+def _column_list(engine, columns):
+    preparer = engine.dialect.identifier_preparer
+    return ", ".join(preparer.quote(col) for col in columns)
+
+
+# ---------- MySQL ----------
+def _load_mysql(df, engine, table_name, schema, connection=None):
+    fd, tmp_path = tempfile.mkstemp(suffix=".csv", prefix="bulk_")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            _write_delimited(_records(df), f, "NULL")
+        path_sql = tmp_path.replace("\\", "/").replace("'", "''")
+        sql = (
+            f"LOAD DATA LOCAL INFILE '{path_sql}' INTO TABLE {_qualified(engine, table_name, schema)} "
+            "CHARACTER SET utf8mb4 FIELDS TERMINATED BY ',' ENCLOSED BY '\"' ESCAPED BY '' "
+            f"LINES TERMINATED BY '\\n' ({_column_list(engine, df.columns)})"
+        )
+        if connection is not None:
+            connection.execute(text(sql))
+        else:
+            with engine.begin() as conn:
+                conn.execute(text(sql))
+    finally:
+        os.remove(tmp_path)
+    return len(df)
+
+
+# ---------- PostgreSQL ----------
+def _load_postgresql(df, engine, table_name, schema, connection=None):
+    buffer = io.StringIO()
+    _write_delimited(_records(df), buffer, "\\N")
+    buffer.seek(0)
+    sql = (
+        f"COPY {_qualified(engine, table_name, schema)} ({_column_list(engine, df.columns)}) "
+        "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    )
+    if connection is not None:
+        cursor = connection.connection.cursor()
+        cursor.copy_expert(sql, buffer)
+        return len(df)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.copy_expert(sql, buffer)
+        raw.commit()
+    except Exception:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    return len(df)
+
+
+# ---------- SQL Server ----------
+def _load_sqlserver(df, engine, table_name, schema, connection=None):
+    if not getattr(engine.dialect, "fast_executemany", False):
+        print("Canh bao: engine SQL Server chua bat fast_executemany (dung create_load_engine).")
+    df.to_sql(name=table_name, con=connection if connection is not None else engine, schema=schema,
+              if_exists='append', index=False, chunksize=MSSQL_CHUNK_ROWS)
+    return len(df)
+
+
+# ---------- Chung: INSERT nhieu dong theo gioi han packet ----------
+def max_packet_bytes(engine, db_type=None):
+    """Gioi han kich thuoc 1 cau lenh (max_allowed_packet voi MySQL), mac dinh 4MB."""
+    if _db_type_of(engine, db_type) == "mysql":
+        try:
+            with engine.connect() as conn:
+                return int(conn.execute(text("SELECT @@max_allowed_packet")).scalar())
+        except Exception:
+            pass
+    return DEFAULT_PACKET_BYTES
+
+
+def packet_limited_insert(packet_bytes, max_params=None):
+    """Tao `method` cho DataFrame.to_sql: gom dong thanh INSERT nhieu dong, moi cau < packet_bytes."""
+    budget = int(packet_bytes * PACKET_SAFETY)
+
+    def _insert(table, conn, keys, data_iter):
+        batch, batch_bytes = [], 0
+        for row in data_iter:
+            row_bytes = sum(len(str(v)) * 4 + 4 if v is not None else 5 for v in row) # utf8mb4: toi da 4 byte/ky tu
+            too_many_params = max_params and (len(batch) + 1) * len(keys) > max_params
+            if batch and (batch_bytes + row_bytes > budget or too_many_params):
+                conn.execute(table.table.insert().values(batch))
+                batch, batch_bytes = [], 0
+            batch.append(dict(zip(keys, row)))
+            batch_bytes += row_bytes
+        if batch:
+            conn.execute(table.table.insert().values(batch))
+
+    return _insert
+
+
+def _load_multirow(df, engine, table_name, schema, connection=None, db_type=None):
+    # SQLite gioi han so tham so moi cau lenh
+    max_params = 999 if engine.dialect.name == "sqlite" else None
+    method = packet_limited_insert(max_packet_bytes(engine, db_type), max_params=max_params)
+    df.to_sql(name=table_name, con=connection if connection is not None else engine, schema=schema,
+              if_exists='append', index=False, method=method)
+    return len(df)
+
+
+def _mysql_error_code(error):
+    """Ma loi MySQL (chuoi) cua exception driver (pymysql/mysqlclient: args[0], mysql-connector: errno); khong co -> None."""
+    orig = getattr(error, "orig", None) or error
+    code = getattr(orig, "errno", None)
+    if code is None and getattr(orig, "args", None) and isinstance(orig.args[0], int):
+        code = orig.args[0]
+    return None if code is None else str(code)
+
+
+def bulk_insert(df, engine, table_name, schema=None, db_type=None, connection=None):
+    """
+    Nap DataFrame vao bang co san bang duong nhanh nhat cua DB. Tra ve so dong da nap.
+    `connection`: neu truyen vao thi chay trong transaction cua caller (khong tu commit).
+    """
+    if df.empty:
+        return 0
+    db_type = _db_type_of(engine, db_type)
+    if db_type == "mysql":
+        try:
+            return _load_mysql(df, engine, table_name, schema, connection)
+        except Exception as e:
+            # Server tat local_infile -> INSERT nhieu dong theo max_allowed_packet
+            if _mysql_error_code(e) not in MYSQL_LOCAL_INFILE_ERRORS:
+                raise
+            print(f"Canh bao: LOAD DATA LOCAL INFILE bi tu choi ({e}). Dung INSERT nhieu dong.")
+            return _load_multirow(df, engine, table_name, schema, connection, db_type)
+    if db_type == "postgresql":
+        return _load_postgresql(df, engine, table_name, schema, connection)
+    if db_type == "sqlserver":
+        return _load_sqlserver(df, engine, table_name, schema, connection)
+    return _load_multirow(df, engine, table_name, schema, connection, db_type)
@@ -0,0 +1,251 @@
+# pipeline/fanout.py
+
+import csv
+import os
+import queue
+import threading
+import time
+
+from pipeline.ingest import iter_dataset_chunks
+from pipeline.manifest import file_sha256, manifest_target
+
+
+# ==========================================================
+# [THEM MOI] Nap 1 lan doc -> nhieu dich (sink) chay dong thoi:
+# - Thread chinh doc file theo chunk va day chunk vao hang doi RIENG cua tung sink.
+# - Hang doi co gioi han (`queue_chunks`) -> sink cham lam thread doc phai cho (back-pressure), bo nho ~ so chunk dang cho.
+# - Moi sink 1 thread, tu thu lai chunk loi (`retries`, backoff luy thua). Sink het luot thu thi rollback file do
+#   (chi o sink do), cac sink khac van tiep tuc.
+# - Tong thoi gian ~ sink cham nhat, khong phai tong cac sink. File doc xong duoc day tiep file sau ngay.
+# ==========================================================
+
+SINK_QUEUE_CHUNKS = 4
+SINK_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 2.0
+
+_BEGIN, _CHUNK, _END, _ABORT, _STOP = "begin", "chunk", "end", "abort", "stop"
+
+
+class DatabaseSink:
+    """
+    Sink 1 bang DB: 1 transaction / file, moi chunk 1 savepoint (thu lai chunk khong ghi trung).
+    `manifest` (pipeline/manifest.py): bo qua file / dong da nap, ghi cung transaction.
+    `columns`: chi ghi cac cot nay (neu file co). `dtype`: dtype cho to_sql.
+    """
+
+    def __init__(self, name, engine, table_name, schema=None, manifest=None, columns=None, dtype=None):
+        self.name = name
+        self.engine = engine
+        self.table_name = table_name
+        self.schema = schema
+        self.manifest = manifest
+        self.columns = columns
+        self.dtype = dtype or {}
+        self.target = manifest_target(schema, table_name)
+        self._conn = None
+        self._tx = None
+
+    def is_loaded(self, file_path, file_hash):
+        return self.manifest is not None and self.manifest.is_loaded(file_hash, self.target)
+
+    def begin_file(self, file_path, file_hash):
+        self._close()
+        self._conn = self.engine.connect()
+        self._tx = self._conn.begin()
+        self._seen_keys = set()
+        self.rows = 0
+
+    def write_chunk(self, chunk):
+        if self.columns:
+            chunk = chunk[[col for col in self.columns if col in chunk.columns]]
+        savepoint = self._conn.begin_nested()
+        try:
+            seen_keys = set(self._seen_keys) # Chi cap nhat khi chunk ghi thanh cong
+            if self.manifest is not None:
+                chunk = self.manifest.filter_new_rows(self._conn, chunk, self.target, seen_keys)
+            chunk.to_sql(
+                name=self.table_name, con=self._conn, schema=self.schema, if_exists='append', index=False,
+                dtype={k: v for k, v in self.dtype.items() if k in chunk.columns},
+            )
+            savepoint.commit()
+        except Exception:
+            if savepoint.is_active:
+                savepoint.rollback()
+            raise
+        self._seen_keys = seen_keys
+        self.rows += len(chunk)
+
+    def commit_file(self, file_path, file_hash):
+        try:
+            if self.manifest is not None:
+                self.manifest.record_file(self._conn, file_hash, file_path, self.target, self.rows)
+            self._tx.commit()
+        finally:
+            self._close()
+        return self.rows
+
+    def rollback_file(self):
+        try:
+            if self._tx is not None and self._tx.is_active:
+                self._tx.rollback()
+        finally:
+            self._close()
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = self._tx = None
+
+
+class FileSink:
+    """
+    Sink ghi ban sao CSV (utf-8-sig) vao `directory`: ghi file tam, doi ten khi xong file.
+    Chunk loi thi cat file ve vi tri truoc chunk roi thu lai. File dich da ton tai -> coi nhu da nap.
+    """
+
+    def __init__(self, name, directory):
+        self.name = name
+        self.directory = directory
+        self._f = None
+
+    def _final_path(self, file_path):
+        return os.path.join(self.directory, os.path.splitext(os.path.basename(file_path))[0] + ".csv")
+
+    def is_loaded(self, file_path, file_hash):
+        return os.path.exists(self._final_path(file_path))
+
+    def begin_file(self, file_path, file_hash):
+        os.makedirs(self.directory, exist_ok=True)
+        self._path = self._final_path(file_path)
+        self._tmp_path = f"{self._path}.{os.getpid()}.tmp"
+        self._f = open(self._tmp_path, "w", encoding="utf-8-sig", newline="")
+        self._header_written = False
+        self.rows = 0
+
+    def write_chunk(self, chunk):
+        position = self._f.tell()
+        try:
+            writer = csv.writer(self._f)
+            if not self._header_written:
+                writer.writerow(chunk.columns)
+            writer.writerows(chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None))
+        except Exception:
+            self._f.seek(position)
+            self._f.truncate()
+            raise
+        self._header_written = True
+        self.rows += len(chunk)
+
+    def commit_file(self, file_path, file_hash):
+        self._f.close()
+        self._f = None
+        os.replace(self._tmp_path, self._path)
+        return self.rows
+
+    def rollback_file(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+            os.remove(self._tmp_path)
+
+
+class _SinkWorker(threading.Thread):
+    """1 thread / sink: doc hang doi rieng, thu lai thao tac loi, bao ket qua tung file."""
+
+    def __init__(self, sink, queue_chunks, retries, backoff, results):
+        super().__init__(name=f"sink-{sink.name}", daemon=True)
+        self.sink = sink
+        self.queue = queue.Queue(maxsize=queue_chunks)
+        self.retries = retries
+        self.backoff = backoff
+        self.results = results
+
+    def _with_retry(self, action, *args):
+        for attempt in range(self.retries + 1):
+            try:
+                return action(*args)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                wait = self.backoff * (2 ** attempt)
+                print(f"[{self.sink.name}] Loi ({e}). Thu lai lan {attempt + 1}/{self.retries} sau {wait:.0f}s.")
+                time.sleep(wait)
+
+    def run(self):
+        failed = False # File hien tai da loi -> bo qua cac chunk con lai cua file
+        while True:
+            kind, file_path, payload = self.queue.get()
+            if kind == _STOP:
+                return
+            file_name = os.path.basename(file_path)
+            try:
+                if kind == _BEGIN:
+                    failed = False
+                    self._with_retry(self.sink.begin_file, file_path, payload)
+                elif kind == _CHUNK and not failed:
+                    self._with_retry(self.sink.write_chunk, payload)
+                elif kind == _END and not failed:
+                    rows = self.sink.commit_file(file_path, payload)
+                    self.results[(file_path, self.sink.name)] = rows
+                    print(f"Thanh cong ({self.sink.name}): Da nap {rows} dong tu {file_name}.")
+                elif kind == _ABORT and not failed:
+                    self.sink.rollback_file()
+                    self.results[(file_path, self.sink.name)] = None
+            except Exception as e:
+                print(f"LOI NAP ({self.sink.name}) cho file {file_name}: {e}")
+                failed = True
+                self.results[(file_path, self.sink.name)] = None
+                try:
+                    self.sink.rollback_file()
+                except Exception as rollback_error:
+                    print(f"[{self.sink.name}] Loi khi rollback {file_name}: {rollback_error}")
+
+
+def fan_out_load(files, sinks, queue_chunks=SINK_QUEUE_CHUNKS, retries=SINK_RETRIES, backoff=RETRY_BACKOFF_SECONDS):
+    """
+    Doc tung file 1 lan theo chunk va nap dong thoi vao moi sink.
+    Tra ve {file_path: {sink.name: so dong | 0 neu da nap truoc do | None neu loi}}.
+    """
+    results = {}
+    workers = [_SinkWorker(sink, queue_chunks, retries, backoff, results) for sink in sinks]
+    for worker in workers:
+        worker.start()
+
+    outcome = {}
+    for file_path in files:
+        file_name = os.path.basename(file_path)
+        file_hash = file_sha256(file_path)
+        active = []
+        for worker in workers:
+            if worker.sink.is_loaded(file_path, file_hash):
+                print(f"Manifest: File {file_name} da nap vao {worker.sink.name} truoc do. Bo qua sink nay.")
+                results[(file_path, worker.sink.name)] = 0
+            else:
+                active.append(worker)
+        outcome[file_path] = [w.sink.name for w in workers]
+        if not active:
+            continue
+
+        for worker in active:
+            worker.queue.put((_BEGIN, file_path, file_hash))
+        try:
+            for chunk in iter_dataset_chunks(file_path):
+                for worker in active:
+                    worker.queue.put((_CHUNK, file_path, chunk)) # Block khi hang doi sink day (back-pressure)
+        except Exception as e:
+            print(f"LOI khi doc file {file_name}: {e}. Huy nap file nay o moi sink.")
+            for worker in active:
+                worker.queue.put((_ABORT, file_path, None))
+            continue
+        for worker in active:
+            worker.queue.put((_END, file_path, file_hash))
+
+    for worker in workers:
+        worker.queue.put((_STOP, "", None))
+    for worker in workers:
+        worker.join()
+
+    return {
+        file_path: {name: results.get((file_path, name)) for name in names}
+        for file_path, names in outcome.items()
+    }
@@ -0,0 +1,118 @@
+# pipeline/ingest.py
+
+import csv
+import glob
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError: # Khong co pyarrow thi chi doc duoc CSV (bang pandas)
+    pa = None
+    pa_csv = None
+    pq = None
+
+
+# [THEM MOI] File du lieu scraper: CSV (utf-8-sig) hoac Parquet (SCRAPER_OUTPUT_FORMAT=parquet)
+DATASET_PATTERNS = ("*_jobs_*.csv", "*_jobs_*.parquet")
+
+# [THEM MOI] Doc theo lo: so dong moi chunk, kich thuoc block doc cua pyarrow (byte)
+CHUNK_ROWS = 20000
+CSV_BLOCK_BYTES = 8 * 1024 * 1024
+
+
+def find_dataset_files(directory):
+    """Tat ca file du lieu (CSV + Parquet) trong thu muc, sap xep theo ten."""
+    files = []
+    for pattern in DATASET_PATTERNS:
+        files.extend(glob.glob(os.path.join(directory, pattern)))
+    return sorted(files)
+
+
+def is_parquet(file_path):
+    return file_path.lower().endswith(".parquet")
+
+
+def read_dataset_file(file_path, dtype=None):
+    """
+    Doc 1 file du lieu thanh DataFrame.
+    - CSV: pd.read_csv (utf-8-sig), `dtype` nhu pandas (vd dtype=str).
+    - Parquet: doc bang memory map (khong copy buffer file), cot tu dien (Nguon) / ngay (NgayCaoDuLieu) ve string.
+    """
+    if not is_parquet(file_path):
+        return pd.read_csv(file_path, encoding='utf-8-sig', dtype=dtype)
+    if pq is None:
+        raise ImportError("Can cai pyarrow de doc file Parquet.")
+
+    table = pq.read_table(file_path, memory_map=True)
+    return _to_object_columns(table)
+
+
+def _to_object_columns(table):
+    """
+    Table/RecordBatch Arrow -> DataFrame giong ket qua doc CSV dtype=str:
+    [THAY DOI] cot ngay (date32, vd NgayCaoDuLieu) -> chuoi YYYY-MM-DD, cot categorical (tu dien Parquet) -> object.
+    """
+    for idx, field in enumerate(table.schema):
+        if pa.types.is_date(field.type):
+            table = table.set_column(idx, field.name, table.column(idx).cast(pa.string()))
+    df = table.to_pandas()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    return df
+
+
+def _csv_header(file_path):
+    with open(file_path, "r", encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f), None)
+
+
+def _iter_csv_pyarrow(file_path, chunk_rows):
+    header = _csv_header(file_path)
+    if not header:
+        return
+    reader = pa_csv.open_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(column_names=header, skip_rows=1, block_size=CSV_BLOCK_BYTES),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True), # Mo ta cong viec co xuong dong trong "..."
+        convert_options=pa_csv.ConvertOptions(
+            column_types={col: pa.string() for col in header}, strings_can_be_null=True,
+        ),
+    )
+    pending, pending_rows = [], 0
+    for batch in reader:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= chunk_rows:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, chunk_rows).to_pandas()
+            rest = table.slice(chunk_rows)
+            pending, pending_rows = rest.to_batches(), rest.num_rows
+    if pending_rows:
+        yield pa.Table.from_batches(pending).to_pandas()
+
+
+def iter_dataset_chunks(file_path, chunk_rows=CHUNK_ROWS):
+    """
+    [THEM MOI] Doc 1 file du lieu theo tung DataFrame toi da `chunk_rows` dong, moi cot la string (o rong -> None).
+    Bo nho dinh ~1 chunk bat ke kich thuoc file:
+    - CSV: pyarrow.csv doc luong (parser C da luong) neu co pyarrow, khong thi pd.read_csv(chunksize, dtype=str).
+    - Parquet: ParquetFile.iter_batches tren memory map.
+    """
+    if is_parquet(file_path):
+        if pq is None:
+            raise ImportError("Can cai pyarrow de doc file Parquet.")
+        parquet_file = pq.ParquetFile(file_path, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+            yield _to_object_columns(batch)
+        return
+
+    if pa_csv is not None:
+        yield from _iter_csv_pyarrow(file_path, chunk_rows)
+        return
+    for chunk in pd.read_csv(file_path, encoding='utf-8-sig', dtype=str, chunksize=chunk_rows):
+        yield chunk
@@ -1,19 +1,31 @@
 # scripts/loader.py
 
-import sqlalchemy
 import pandas as pd
 import os 
-import glob 
 import sys 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 # Them project root (thu muc cha cua 'pipeline') vao sys.path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
 # Import cau hinh tu pipeline/config.py
-from pipeline.config import DATABASE_URL, DATASET_DIR, ARCHIVE_DIR
+from pipeline.config import DATABASE_URL, DATASET_DIR, ARCHIVE_DIR, DB_TYPE
+from pipeline.ingest import find_dataset_files, iter_dataset_chunks
+from pipeline.bulk_load import create_load_engine, bulk_insert
+from pipeline.manifest import LoadManifest, file_sha256, manifest_target
 
-engine = sqlalchemy.create_engine(DATABASE_URL)
+# [THAY DOI] Engine cho nap hang loat: bat local_infile (MySQL) / fast_executemany (SQL Server)
+engine = create_load_engine(DATABASE_URL, DB_TYPE)
+
+_manifests = {} # schema -> LoadManifest (tao bang manifest 1 lan / schema)
+
+
+def get_manifest(schema: str):
+    """[THEM MOI] Manifest nap (pipeline/manifest.py) nam cung schema voi bang dich."""
+    if schema not in _manifests:
+        _manifests[schema] = LoadManifest(engine, schema)
+    return _manifests[schema]
 
 def load_df_to_db(df: pd.DataFrame, table_name: str, schema: str):
     """Nap mot DataFrame co san vao bang duoc chi dinh."""
@@ -22,80 +34,111 @@ def load_df_to_db(df: pd.DataFrame, table_name: str, schema: str):
         return
         
     try:
-        df.to_sql(
-            name=table_name,
-            con=engine,
-            schema=schema,
-            if_exists='append',
-            index=False
-        )
-        print(f"-> Thanh cong: Da nap {len(df)} dong (tu DataFrame) vao '{schema}.{table_name}'.")
+        rows = bulk_insert(df, engine, table_name, schema, DB_TYPE)
+        print(f"-> Thanh cong: Da nap {rows} dong (tu DataFrame) vao '{schema}.{table_name}'.")
     except Exception as e:
         print(f"-> LOI khi nap du lieu (tu DataFrame) vao {schema}.{table_name}: {e}")
 
-def load_all_csv_to_staging_and_cleanup(csv_output_dir: str, schema: str, table_name: str):
+def _archive_file(file_path: str):
+    """Chuyen file vao thu muc luu tru. Tra ve True neu thanh cong."""
+    file_name = os.path.basename(file_path)
+    try:
+        os.rename(file_path, os.path.join(ARCHIVE_DIR, file_name))
+        print(f"Don dep: Da chuyen file {file_name} vao thu muc luu tru.")
+        return True
+    except Exception as e:
+        print(f"LOI DON DEP: Da nap DB thanh cong nhung khong thể di chuyen file {file_name}: {e}")
+        return False
+
+
+def load_file_streaming(file_path: str, schema: str, table_name: str):
+    """
+    [THEM MOI] Nap 1 file theo tung chunk (ingest.iter_dataset_chunks) trong 1 transaction rieng:
+    bo nho ~1 chunk, file loi thi rollback ca file. Chi archive sau khi commit thanh cong. Tra ve so dong.
+    [THEM MOI] File da co trong manifest (cung hash + bang dich) -> khong doc lai, chi archive;
+    dong da nap tu file khac bi loc theo khoa dong. Manifest ghi cung transaction voi du lieu.
+    """
+    file_name = os.path.basename(file_path)
+    manifest = get_manifest(schema)
+    target = manifest_target(schema, table_name)
+    file_hash = file_sha256(file_path)
+    if manifest.is_loaded(file_hash, target):
+        print(f"Manifest: File {file_name} da duoc nap vao '{target}' truoc do. Bo qua, chi chuyen vao luu tru.")
+        _archive_file(file_path)
+        return 0
+
+    rows = 0
+    seen_keys = set()
+    with engine.begin() as connection:
+        for chunk in iter_dataset_chunks(file_path):
+            chunk = manifest.filter_new_rows(connection, chunk, target, seen_keys)
+            rows += bulk_insert(chunk, engine, table_name, schema, DB_TYPE, connection=connection)
+        manifest.record_file(connection, file_hash, file_path, target, rows)
+    if rows:
+        print(f"Thanh cong: Da nap {rows} dong tu {file_name} vao bang '{schema}.{table_name}'.")
+    else:
+        print(f"File {file_name} rong / khong co dong moi, khong co gi de nap. Chuyen vao luu tru.")
+    _archive_file(file_path)
+    return rows
+
+
+def load_all_files_parallel(csv_files, schema: str, table_name: str, db_workers: int = 2):
+    """
+    [THEM MOI] Che do song song: toi da `db_workers` file cung luc, moi file 1 connection + 1 transaction rieng.
+    [THAY DOI] Moi worker doc file theo chunk (pyarrow parse ngoai GIL) thay cho process pool doc ca file
+    -> bo nho ~ db_workers chunk. File loi duoc giu lai, khong anh huong file khac.
+    """
+    total_rows_loaded = 0
+    get_manifest(schema) # Tao bang manifest truoc khi cac thread dung chung
+    with ThreadPoolExecutor(max_workers=db_workers) as db_pool:
+        futures = {db_pool.submit(load_file_streaming, file_path, schema, table_name): file_path for file_path in csv_files}
+        for future in as_completed(futures):
+            file_name = os.path.basename(futures[future])
+            try:
+                total_rows_loaded += future.result()
+            except Exception as e:
+                print(f"LOI NAP DATABASE cho file {file_name}: {e}")
+                print(f"File {file_name} SE DUOC GIU LAI de kiem tra (khong bi xoa/di chuyen).")
+    return total_rows_loaded
+
+
+def load_all_csv_to_staging_and_cleanup(csv_output_dir: str, schema: str, table_name: str,
+                                        parallel: bool = False, db_workers: int = 2):
     """
-    Tim tat ca file CSV, nap vao database, 
+    Tim tat ca file du lieu (CSV/Parquet), nap vao database, 
     va di chuyen file vao thu muc luu tru (archive) sau khi nap.
+    [THAY DOI] Doc + nap theo chunk (load_file_streaming), khong doc ca file vao bo nho.
+    `parallel=True`: dung load_all_files_parallel (nhieu connection nap).
     """
     print(f"\n--- Bat dau Quet va Nap du lieu tu thu muc: {csv_output_dir} ---")
     
     # Dam bao thu muc luu tru ton tai
     os.makedirs(ARCHIVE_DIR, exist_ok=True)
     
-    # Tim tat ca file CSV co pattern *_jobs_*.csv
-    search_path = os.path.join(csv_output_dir, "*_jobs_*.csv")
-    csv_files = glob.glob(search_path)
+    # Tim tat ca file co pattern *_jobs_*.csv / *_jobs_*.parquet
+    csv_files = find_dataset_files(csv_output_dir)
 
     if not csv_files:
         print("Khong tim thay file CSV moi nao de load.")
         return 0
 
     print(f"Tim thay {len(csv_files)} file CSV can load vao '{schema}.{table_name}'.")
+
+    if parallel and len(csv_files) > 1:
+        print(f"Che do song song: {db_workers} connection nap.")
+        return load_all_files_parallel(csv_files, schema, table_name, db_workers)
     
     total_rows_loaded = 0
     
     for file_path in csv_files:
         file_name = os.path.basename(file_path)
-        archive_path = os.path.join(ARCHIVE_DIR, file_name) # Dinh nghia duong dan luu tru
         
         print("-" * 20)
         print(f"Dang xu ly file: {file_name}")
 
-        # --- Buoc 1: Doc file CSV ---
+        # Doc theo chunk + nap trong 1 transaction; archive chi khi commit thanh cong
         try:
-            df = pd.read_csv(file_path, encoding='utf-8-sig') 
-            
-            if df.empty:
-                print(f"File {file_name} rong, khong co gi de nap. Chuyen vao luu tru.")
-                # Dung os.rename thay vi os.remove
-                os.rename(file_path, archive_path)
-                continue
-        except Exception as e:
-            print(f"LOI khi doc file {file_name}: {e}. Bo qua file nay.")
-            continue 
-
-        # --- Buoc 2: Nap (Load) vao Database ---
-        try:
-            df.to_sql(
-                name=table_name,
-                con=engine,
-                schema=schema,
-                if_exists='append',
-                index=False
-            )
-            rows = len(df)
-            total_rows_loaded += rows
-            print(f"Thanh cong: Da nap {rows} dong tu CSV vao bang '{schema}.{table_name}'.")
-            
-            # --- Buoc 3: Di chuyen file CSV (Chi chay khi Buoc 2 thanh cong) ---
-            try:
-                # Dung os.rename thay vi os.remove
-                os.rename(file_path, archive_path)
-                print(f"Don dep: Da chuyen file {file_name} vao thu muc luu tru.")
-            except Exception as e:
-                print(f"LOI DON DEP: Da nap DB thanh cong nhung khong thể di chuyen file {file_name}: {e}")
-
+            total_rows_loaded += load_file_streaming(file_path, schema, table_name)
         except Exception as e:
             print(f"LOI NAP DATABASE cho file {file_name}: {e}")
             print(f"File {file_name} SE DUOC GIU LAI de kiem tra (khong bi xoa/di chuyen).")
@@ -140,12 +183,15 @@ if __name__ == "__main__":
     print(f"Luu tru tai:   {ARCHIVE_DIR}")
     print("-" * 40)
 
-    # 4. Goi ham load
+    # 4. Goi ham load ([THEM MOI] LOADER_WORKERS > 1 -> che do song song)
+    loader_workers = int(os.getenv("LOADER_WORKERS", "1"))
     try:
         total = load_all_csv_to_staging_and_cleanup(
             csv_output_dir=DATASET_DIR,
             schema=SCHEMA_NAME,
-            table_name=TABLE_NAME
+            table_name=TABLE_NAME,
+            parallel=loader_workers > 1,
+            db_workers=loader_workers
         )
         print(f"\n--- KET THUC TEST: Da nap tong cong {total} dong. ---")
     except Exception as e:
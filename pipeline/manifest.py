@@ -0,0 +1,149 @@
+# pipeline/manifest.py
+
+import hashlib
+import os
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, and_, select
+from sqlalchemy.exc import IntegrityError
+
+
+# ==========================================================
+# [THEM MOI] Load manifest: ghi lai file / dong da nap vao tung bang dich, nam ngay trong DB dich
+# va duoc ghi CUNG transaction voi du lieu -> commit thanh cong thi manifest moi co.
+# - load_manifest:      hash noi dung file (sha256) + bang dich + so dong -> file da nap thi bo qua, khong parse lai
+#                       (vd lan truoc nap xong nhung khong archive duoc - nhanh "LOI DON DEP").
+# - load_manifest_rows: khoa tung dong (Nguon + Link + NgayCaoDuLieu) -> file khac chua mot phan dong da nap
+#                       (vd scraper crash roi cao lai) chi nap dong moi.
+# ==========================================================
+
+MANIFEST_TABLE = "load_manifest"
+MANIFEST_ROWS_TABLE = "load_manifest_rows"
+ROW_KEY_COLUMNS = ("Nguon", "LinkBaiTuyenDung", "NgayCaoDuLieu")
+HASH_BLOCK_BYTES = 1024 * 1024
+KEY_LOOKUP_BATCH = 500 # SQL Server gioi han 2100 tham so / cau lenh
+
+
+def file_sha256(file_path):
+    """Hash noi dung file theo block (khong doc ca file vao bo nho)."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def manifest_target(schema, table_name):
+    return f"{schema}.{table_name}" if schema else table_name
+
+
+def row_keys(df):
+    """Khoa sha1 cho tung dong: theo ROW_KEY_COLUMNS; dong khong co Link thi hash ca dong."""
+    key_cols = [col for col in ROW_KEY_COLUMNS if col in df.columns]
+    keys = []
+    for record in df.astype(object).where(df.notna(), None).to_dict("records"):
+        if record.get("LinkBaiTuyenDung"):
+            values = [record[col] for col in key_cols]
+        else:
+            values = [record[col] for col in df.columns]
+        raw = "\x1f".join("" if v is None else str(v) for v in values)
+        keys.append(hashlib.sha1(raw.encode("utf-8")).hexdigest())
+    return keys
+
+
+class LoadManifest:
+    """Manifest cua 1 DB dich. `schema`: schema chua 2 bang manifest (cung schema voi bang dich)."""
+
+    def __init__(self, engine, schema=None):
+        self.engine = engine
+        metadata = MetaData(schema=schema)
+        self.files = Table(
+            MANIFEST_TABLE, metadata,
+            Column("file_hash", String(64), primary_key=True),
+            Column("target", String(255), primary_key=True),
+            Column("file_name", String(255), nullable=False),
+            Column("row_count", Integer, nullable=False),
+            Column("loaded_at", DateTime, nullable=False),
+        )
+        self.rows = Table(
+            MANIFEST_ROWS_TABLE, metadata,
+            Column("target", String(255), primary_key=True),
+            Column("row_key", String(40), primary_key=True),
+        )
+        metadata.create_all(engine, checkfirst=True)
+
+    def is_loaded(self, file_hash, target):
+        with self.engine.connect() as conn:
+            found = conn.execute(
+                select(self.files.c.row_count).where(and_(self.files.c.file_hash == file_hash, self.files.c.target == target))
+            ).first()
+        return found is not None
+
+    def filter_new_rows(self, connection, df, target, seen_keys):
+        """
+        Bo cac dong da co trong manifest (hoac da gap trong file nay - `seen_keys`), ghi khoa dong moi
+        trong transaction `connection`. Tra ve DataFrame chi gom dong moi.
+        """
+        if df.empty:
+            return df
+        keys = row_keys(df)
+        candidates = list({k for k in keys if k not in seen_keys})
+        existing = set()
+        for start in range(0, len(candidates), KEY_LOOKUP_BATCH):
+            batch = candidates[start:start + KEY_LOOKUP_BATCH]
+            existing.update(connection.execute(
+                select(self.rows.c.row_key).where(and_(self.rows.c.target == target, self.rows.c.row_key.in_(batch)))
+            ).scalars())
+
+        new_keys = sorted({k for k in candidates if k not in existing})
+        # [THAY DOI] Gianh khoa bang INSERT (khoa chinh): file khac dang nap song song cung dong -> chi 1 ben thang,
+        # ben kia bo dong do thay vi loi trung khoa ca file
+        claimed = self._claim_keys(connection, target, new_keys)
+
+        keep = []
+        for key in keys:
+            if key in claimed and key not in seen_keys:
+                seen_keys.add(key)
+                keep.append(True)
+            else:
+                keep.append(False)
+        skipped = keep.count(False)
+        if skipped:
+            print(f"Manifest: Bo qua {skipped} dong da nap truoc do vao '{target}'.")
+        return df[keep]
+
+    def _claim_keys(self, connection, target, new_keys):
+        """
+        Ghi khoa dong moi trong transaction `connection`, tra ve tap khoa da ghi duoc (= dong duoc nap o day).
+        Ca lo trong 1 savepoint; trung khoa (transaction khac vua commit cung dong) -> ghi lai tung khoa,
+        khoa trung bi bo. Khoa duoc sap xep de cac transaction khoa theo cung thu tu (tranh deadlock).
+        """
+        if not new_keys:
+            return set()
+        savepoint = connection.begin_nested()
+        try:
+            connection.execute(self.rows.insert(), [{"target": target, "row_key": key} for key in new_keys])
+            savepoint.commit()
+            return set(new_keys)
+        except IntegrityError:
+            savepoint.rollback()
+
+        claimed = set()
+        for key in new_keys:
+            savepoint = connection.begin_nested()
+            try:
+                connection.execute(self.rows.insert(), [{"target": target, "row_key": key}])
+                savepoint.commit()
+                claimed.add(key)
+            except IntegrityError:
+                savepoint.rollback()
+        lost = len(new_keys) - len(claimed)
+        if lost:
+            print(f"Manifest: {lost} dong vua duoc nap boi file khac vao '{target}'. Bo qua.")
+        return claimed
+
+    def record_file(self, connection, file_hash, file_path, target, row_count):
+        connection.execute(self.files.insert().values(
+            file_hash=file_hash, target=target, file_name=os.path.basename(file_path),
+            row_count=int(row_count), loaded_at=datetime.now(),
+        ))
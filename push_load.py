@@ -2,12 +2,12 @@
 # CHẠY SCRIPT NÀY TRÊN MÁY LOCAL CỦA BẠN
 
 import sqlalchemy
-from sqlalchemy import text
-import pandas as pd
 import os 
-import glob 
 import sys 
 from pipeline.config import DATASET_DIR, ARCHIVE_DIR, LOCAL_MYSQL_URL, REMOTE_SERVER_URL
+from pipeline.ingest import find_dataset_files, DATASET_PATTERNS
+from pipeline.manifest import LoadManifest
+from pipeline.fanout import DatabaseSink, FileSink, fan_out_load
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
@@ -21,6 +21,10 @@ REMOTE_SCHEMA = "dbo"
 # --- CẤU HÌNH THƯ MỤC VÀ CỘT ---
 LOCAL_DATASET_DIR = DATASET_DIR
 LOCAL_ARCHIVE_DIR = ARCHIVE_DIR
+EXPORT_DIR = os.getenv("PUSH_EXPORT_DIR") # [THEM MOI] Dat thi them sink ghi ban sao CSV vao thu muc nay
+
+LOCAL_SINK = "BACKUP LOCAL"
+STAGING_SINK = "STAGING SERVER"
 
 STAGING_TABLE_COLUMNS = [ 
     "CongViec", "ViTri", "YeuCauKinhNghiem", "MucLuong",
@@ -47,6 +51,22 @@ except Exception as e:
     sys.exit(1)
 
 
+def build_sinks():
+    """[THEM MOI] Cac dich nap: Backup Local, Staging Server, (tuy chon) ban sao file."""
+    staging_dtype_map = {col: sqlalchemy.types.NVARCHAR() for col in ALL_TEXT_COLS}
+    sinks = [
+        DatabaseSink(LOCAL_SINK, local_engine, LOCAL_BACKUP_TABLE, LOCAL_SCHEMA,
+                     manifest=LoadManifest(local_engine, LOCAL_SCHEMA)),
+        # Staging chi co STAGING_TABLE_COLUMNS
+        DatabaseSink(STAGING_SINK, server_engine, REMOTE_STAGING_TABLE, REMOTE_SCHEMA,
+                     manifest=LoadManifest(server_engine, REMOTE_SCHEMA),
+                     columns=STAGING_TABLE_COLUMNS, dtype=staging_dtype_map),
+    ]
+    if EXPORT_DIR:
+        sinks.append(FileSink("EXPORT FILE", EXPORT_DIR))
+    return sinks
+
+
 def push_data_from_local_to_server(csv_output_dir: str):
     """
     Doc CSV tu local, Backup vao Local DB, Push (Append) vao Server Staging
@@ -55,102 +75,42 @@ def push_data_from_local_to_server(csv_output_dir: str):
     
     os.makedirs(LOCAL_ARCHIVE_DIR, exist_ok=True)
     
-    search_path = os.path.join(csv_output_dir, "*_jobs_*.csv")
-    csv_files = glob.glob(search_path)
+    csv_files = find_dataset_files(csv_output_dir) # [THAY DOI] CSV + Parquet
 
     if not csv_files:
-        print(f"Khong tim thay file CSV nao (khop voi {search_path}).")
+        print(f"Khong tim thay file du lieu nao (khop voi {', '.join(DATASET_PATTERNS)}).")
         return 0
 
     print(f"Tim thay {len(csv_files)} file CSV can load.")
     print(f"-> Backup (Local):  '{LOCAL_BACKUP_TABLE}'")
     print(f"-> Staging (Server): '{REMOTE_SCHEMA}.{REMOTE_STAGING_TABLE}'")
     
+    # [THAY DOI] Fan-out (pipeline/fanout.py): moi file doc 1 lan theo chunk, day dong thoi vao Backup Local,
+    # Staging Server (va ban sao file neu dat PUSH_EXPORT_DIR). Moi sink 1 hang doi + thread + thu lai rieng,
+    # manifest rieng -> sink cham/loi khong chan sink khac, lan sau chi nap lai sink con thieu.
+    sinks = build_sinks()
+    results = fan_out_load(csv_files, sinks)
+
     total_rows_loaded = 0
-    all_dfs = [] 
-    
-    full_dtype_map_sqlserver = {col: sqlalchemy.types.NVARCHAR() for col in ALL_TEXT_COLS}
-    
-    for file_path in csv_files:
+    staging_rows_loaded = 0
+    for file_path, sink_rows in results.items():
         file_name = os.path.basename(file_path)
-        archive_path = os.path.join(LOCAL_ARCHIVE_DIR, file_name)
-        
-        print("-" * 20)
-        print(f"Dang xu ly file: {file_name}")
+        total_rows_loaded += sink_rows.get(LOCAL_SINK) or 0
+        staging_rows_loaded += sink_rows.get(STAGING_SINK) or 0
 
-        # --- Buoc 1: Doc file CSV ---
-        try:
-            df = pd.read_csv(file_path, encoding='utf-8-sig', dtype=str) 
-            if df.empty:
-                print(f"File {file_name} rong, bo qua.")
-                os.rename(file_path, archive_path)
-                continue
-        except Exception as e:
-            print(f"LOI khi doc file {file_name}: {e}. Bo qua file nay.")
-            continue 
+        failed = [name for name, rows in sink_rows.items() if rows is None]
+        if failed:
+            print(f"File {file_name} SE DUOC GIU LAI de kiem tra (loi o: {', '.join(failed)}; lan sau chi nap sink nay).")
+            continue
 
-        # --- Buoc 2: Nap (Load) vao BACKUP (Local MySQL) ---
+        # Di chuyen file (chi khi moi sink da co file nay)
         try:
-            df.to_sql(
-                name=LOCAL_BACKUP_TABLE,
-                con=local_engine,
-                schema=LOCAL_SCHEMA,
-                if_exists='append', 
-                index=False
-            )
-            rows = len(df)
-            total_rows_loaded += rows
-            print(f"Thanh cong (BACKUP LOCAL): Da nap {rows} dong vao bang '{LOCAL_BACKUP_TABLE}'.")
-            
-            # --- Buoc 3: Gom vao list va Di chuyen file ---
-            all_dfs.append(df)
-            
-            try:
-                os.rename(file_path, archive_path)
-                print(f"Don dep: Da chuyen file {file_name} vao thu muc luu tru.")
-            except Exception as e:
-                print(f"LOI DON DEP: {e}")
-
+            os.rename(file_path, os.path.join(LOCAL_ARCHIVE_DIR, file_name))
+            print(f"Don dep: Da chuyen file {file_name} vao thu muc luu tru.")
         except Exception as e:
-            print(f"LOI NAP DATABASE (BACKUP LOCAL) cho file {file_name}: {e}")
-            print(f"File {file_name} SE DUOC GIU LAI de kiem tra.")
-            
-    # --- Buoc 4: Nap (Load) vao STAGING (Server Ảo) ---
-    if not all_dfs:
-        print("\nKhong co du lieu nao duoc gom de nap vao Staging.")
-        return total_rows_loaded
-
-    try:
-        print("\nDang gom tat ca du lieu de chuan bi nap Staging...")
-        df_all_new_data = pd.concat(all_dfs, ignore_index=True)
-        
-        # LỌC DataFrame chỉ giữ lại các cột mà Staging có
-        print(f"Loc DataFrame de khop voi bang {REMOTE_STAGING_TABLE}...")
-        
-        valid_staging_cols = [col for col in STAGING_TABLE_COLUMNS if col in df_all_new_data.columns]
-        df_for_staging = df_all_new_data[valid_staging_cols]
-        
-        # Lọc lại dtype_map cho Staging
-        staging_dtype_map = {k: v for k, v in full_dtype_map_sqlserver.items() if k in valid_staging_cols}
-
-        # <<< THAY ĐỔI: Đã xóa 'TRUNCATE' và 'with engine.begin()' >>>
-        
-        # APPEND (Nạp) dữ liệu đã lọc vào Server
-        print(f"Dang ghi {len(df_for_staging)} dong vao STAGING tren SERVER (Append)...")
-        df_for_staging.to_sql(
-            name=REMOTE_STAGING_TABLE,
-            con=server_engine, # Dùng 'server_engine'
-            schema=REMOTE_SCHEMA,
-            if_exists='append', # <<< DÙNG 'append' THEO YÊU CẦU >>>
-            index=False,
-            dtype=staging_dtype_map # Dùng map đã lọc
-        )
-        
-        print("-> Ghi STAGING len SERVER thanh cong.")
-        
-    except Exception as e:
-        print(f"LOI NAP DATABASE (STAGING SERVER): {e}")
+            print(f"LOI DON DEP: {e}")
 
+    print(f"-> Ghi STAGING len SERVER: {staging_rows_loaded} dong.")
     return total_rows_loaded
 
 # =================================================================
@@ -10,26 +10,8 @@ IF ERRORLEVEL 1 (
     GOTO :EOF
 )
 echo.
-echo === DANG CHAY CAREERLINK SCRAPER (Tat ca danh muc) ===
-python scrapers\CareerlinkM.py 
-
-
-echo === DANG CHAY CAREERVIET SCRAPER ===
-python scrapers\CareerViet.py
-
-
-echo.
-echo === DANG CHAY TOPCV SCRAPER ===
-python scrapers\TopCV.py
-
-echo  === DANG CHAY CAREERVIET SCRAPER ===
-python scrapers\CareerVietC.py
-ECHO Tam nghi 5 phut (300 giay) truoc khi chay scraper tiep theo...
-
-
-echo.
-echo === DANG CHAY CAREERLINK SCRAPER (Tat ca danh muc) ===
-python scrapers\Careerlink.py 
+echo === DANG CHAY CAREERLINK + CAREERVIET + TOPCV + VIETNAMWORKS (song song, bucket chung theo host) ===
+python scrapers\category_runner.py CareerLink CareerViet TopCV VietnamWorks
 
 echo.
 echo  === DANG NAP DU LIEU VAO DATABASE (LOADER) ===
@@ -1,13 +1,8 @@
-import selenium
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time, random, csv, os, re, sys, logging, math 
+import time, csv, os, re, sys, logging, math 
 from datetime import datetime
 
 
@@ -15,6 +10,17 @@ from datetime import datetime
 project_root_for_import = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root_for_import)
 
+from scrapers.driver_factory import create_chrome_driver
+from scrapers.throttle import HostRateLimiter
+from scrapers.http_fetch import HttpFetcher, extract_fields, missing_required, row_from_fields
+from scrapers.html_store import HtmlStore
+from scrapers.seen_store import SeenStore
+from scrapers.output_writer import SerializedWriter
+from scrapers.dedup import DailyBloomFilter, card_keys, job_key
+from scrapers.high_water import HighWaterMark
+from scrapers.browser_extract import extract_fields_in_browser, harvest_listing, wait_for_fields, wait_for_listing
+from scrapers.site_specs import CAREERVIET_DETAIL_SPEC, CAREERVIET_LISTING_SPEC, CAREERVIET_REQUIRED_FIELDS
+
 
 class CareerVietScraper:
     JOB_LIMIT = 10
@@ -26,10 +32,11 @@ class CareerVietScraper:
         self.SOURCE_WEB = "CareerViet"
 
         # Cau hinh chung
-        self.PAUSE_BETWEEN_PAGES_MIN = 3
-        self.PAUSE_BETWEEN_PAGES_MAX = 6
-        self.PAUSE_BETWEEN_JOBS_MIN = 4
-        self.PAUSE_BETWEEN_JOBS_MAX = 8
+        # [THAY DOI] Khoang nghi giua trang/job do token bucket theo host quyet dinh (xem scrapers/throttle.py).
+        # Chay qua scrapers/category_runner.py: limiter nay duoc thay bang bucket dung chung cua host.
+        self.rate_limiter = HostRateLimiter()
+        self.FETCH_MODE = "http" # "http": tai bang HTTP truoc, Selenium du phong | "selenium": chi dung Chrome
+        self.SAVE_RAW_HTML = True # [THEM MOI] Luu HTML trang chi tiet vao kho raw_html/ (parse lai: python scrapers/html_store.py parse)
         
         # [THEM MOI] So luong job tren mot trang (de tinh max_page)
         self.JOBS_PER_PAGE = 50
@@ -41,8 +48,6 @@ class CareerVietScraper:
         self.csv_output_dir = os.path.join(project_root, "dataset")
         os.makedirs(self.csv_output_dir, exist_ok=True)
         
-        self.seen_links_file = os.path.join(self.scraper_dir, f"seen_links_{self.category_name}.txt") 
-        self.seen_links = set() 
         
         self.CSV_HEADER = [
             "CongViec", "ViTri", "YeuCauKinhNghiem", "MucLuong",
@@ -57,6 +62,11 @@ class CareerVietScraper:
         self._setup_logging() 
         
         self.driver = None
+        self.html_store = HtmlStore(logger=self.logger) if self.SAVE_RAW_HTML else None
+        # [THAY DOI] Lich su link da cao nam trong SeenStore dung chung (thay cho seen_links_<danh muc>.txt)
+        self.seen_store = SeenStore(logger=self.logger)
+        # [THEM MOI] Bloom filter dung chung: tin da cao hom nay (bat ky danh muc/nguon nao) -> bo qua
+        self.today_filter = DailyBloomFilter(logger=self.logger)
 
     def _setup_logging(self): 
         base_logger = logging.getLogger(self.SOURCE_WEB)
@@ -76,110 +86,27 @@ class CareerVietScraper:
         
         self.logger = logging.getLogger(f"{self.SOURCE_WEB}.{self.category_name}")
 
-    def _load_seen_links(self):
-        """Tai lich su cac link da cao tu file."""
-        try:
-            if os.path.exists(self.seen_links_file):
-                with open(self.seen_links_file, 'r', encoding='utf-8') as f:
-                    self.seen_links = {line.strip() for line in f if line.strip()}
-                self.logger.info(f"Da tai {len(self.seen_links)} links tu lich su: {os.path.basename(self.seen_links_file)}")
-            else:
-                self.logger.info("Khong tim thay file lich su. Day la lan chay dau tien.")
-        except Exception as e:
-            self.logger.error(f"Loi khi tai file lich su {self.seen_links_file}: {e}")
-
-    def _save_seen_links(self):
-        """Luu lich su cac link da cao (bao gom ca link moi) ra file."""
-        try:
-            with open(self.seen_links_file, 'w', encoding='utf-8') as f:
-                for link in self.seen_links:
-                    f.write(f"{link}\n")
-            self.logger.info(f"Da luu {len(self.seen_links)} links vao lich su: {os.path.basename(self.seen_links_file)}")
-        except Exception as e:
-            self.logger.error(f"Loi khi luu file lich su {self.seen_links_file}: {e}")
-
     def _create_driver(self):
-        """Khoi tao Chrome WebDriver."""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless=new")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("start-maximized")
+        """[THAY DOI] Khoi tao Chrome qua nha may chung (eager load, chan anh/CSS/font/quang cao, cache chromedriver)."""
         try:
-            self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+            self.driver = create_chrome_driver(logger=self.logger)
         except Exception as e:
             self.logger.error(f"Loi khi khoi tao WebDriver: {e}")
             raise 
 
-    def _human_like_scroll(self):
-        """Cuon trang giong nguoi."""
-        try:
-            height = self.driver.execute_script("return document.body.scrollHeight")
-            pos = 0
-            while pos < height:
-                step = random.randint(300, 700)
-                pos = min(pos + step, height)
-                self.driver.execute_script(f"window.scrollTo(0, {pos});")
-                time.sleep(random.uniform(0.2, 0.7))
-                height = self.driver.execute_script("return document.body.scrollHeight")
-        except Exception:
-            pass
-
-    def _safe_text(self, by, selector):
-        """Lay text an toan, tu dong loc 'Key: Value' -> 'Value'."""
-        try:
-            raw_text = self.driver.find_element(by, selector).text.strip()
-            if ":" in raw_text:
-                return raw_text.split(":")[-1].strip()
-            return raw_text
-        except:
-            return ""
-            
-    def _get_full_section_text(self, title_text):
-        """Lay toan bo text cua mot muc (Mo ta, Yeu cau)."""
-        try:
-            parent_div = self.driver.find_element(By.XPATH, f"//h2[contains(text(), '{title_text}')]/parent::div[contains(@class, 'detail-row')]")
-            raw_text = parent_div.text.strip()
-            return raw_text.replace(title_text, "").strip()
-        except:
-            return ""
-
-    def _get_company_info(self):
-        company_name, company_link, company_size = "", "", ""
+    def _open_company_tab(self):
+        """[THAY DOI] Chi click tab 'Tong quan' (tab-2) de JS nap thong tin cong ty; field duoc lay cung spec."""
         try:
             tab_overview_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//a[@data-href='#tab-2']"))
             )
             self.driver.execute_script("arguments[0].click();", tab_overview_button)
-            self.logger.debug("Da click tab 'Tong quan', doi vai giay cho JS...")
-            time.sleep(random.uniform(1.0, 1.5)) 
-            WebDriverWait(self.driver, 10).until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, "div.info"))
-                )
-            time.sleep(random.uniform(0.5, 1.0))
+            # [THAY DOI] Doi ten cong ty trong tab-2 duoc JS nap xong, thay cho sleep co dinh
+            wait_for_fields(self.driver, CAREERVIET_DETAIL_SPEC, ["CongTy"], timeout=10)
+            return True
         except Exception as e_tab:
             self.logger.warning(f"Khong the click hoac tim thay tab 'Tong quan' (tab-2). Loi: {e_tab}")
-            return company_name, company_link, company_size
-        
-        try:
-            company_elem = self.driver.find_element(By.CSS_SELECTOR, "#tab-2 div.img div.title-company a.name")
-            company_name = company_elem.get_attribute("title").strip()
-            company_link = company_elem.get_attribute("href")
-        except Exception as e:
-            self.logger.warning(f"Khong lay duoc ten/link cong ty (trong tab 2): {e}")
-        
-        try:
-            company_size_element = self.driver.find_element(
-                By.XPATH,
-                "//li[contains(., 'Quy mô công ty')]"
-            )
-            company_size_text = company_size_element.text  
-            company_size = company_size_text.split(':')[-1].strip()
-        except Exception:
-            company_size = None
-            
-        return company_name, company_link, company_size
+            return False
 
     def _build_page_url(self, page):
         """Tao URL phan trang cho CareerViet."""
@@ -201,6 +128,7 @@ class CareerVietScraper:
         try:
             # Tai trang 1 (la self.base_url)
             self.logger.info(f"Dang tai trang 1 ({self.base_url}) de xac dinh so trang toi da (max_page)...")
+            self.rate_limiter.wait(self.base_url)
             self.driver.get(self.base_url)
             
             # Doi cho tieu de (chua tong so job) xuat hien
@@ -234,6 +162,49 @@ class CareerVietScraper:
             self.logger.error(f"Loi khong xac dinh khi tim max page: {e}. Dat max_page = 1.")
             return 1
             
+    def _scrape_job_detail(self, link, company_name_card, company_link_card):
+        """[THEM MOI] Cao chi tiet 1 job bang Selenium, tra ve 1 dong CSV (21 cot)."""
+        self.rate_limiter.wait(link)
+        self.driver.get(link)
+        # [THAY DOI] Chi ten cong viec la bat buoc; muc khac (vd mo ta) khong co sau khi DOM yen la tin binh thuong
+        absent = wait_for_fields(self.driver, CAREERVIET_DETAIL_SPEC, CAREERVIET_REQUIRED_FIELDS, timeout=20)
+        if absent:
+            self.logger.info(f"Tin {link} khong co muc {absent}. Van luu.")
+
+        # [THAY DOI] Mo tab cong ty roi lay tat ca field trong 1 lan execute_script
+        self._open_company_tab()
+        fields = extract_fields_in_browser(self.driver, CAREERVIET_DETAIL_SPEC)
+        if self.html_store:
+            self.html_store.save(self.SOURCE_WEB, None, link, self.driver.page_source, extra={"CongTy": company_name_card, "LinkCongTy": company_link_card})
+        return self._build_row(fields, link, company_name_card, company_link_card)
+
+    def _scrape_job_detail_http(self, fetcher, link, company_name_card, company_link_card):
+        """[THEM MOI] Cao chi tiet bang HTTP + lxml. Tra ve None neu thieu field bat buoc (de chuyen sang Selenium)."""
+        self.rate_limiter.wait(link)
+        document = fetcher.fetch_document(link)
+        if document is None:
+            return None
+
+        fields = extract_fields(document, CAREERVIET_DETAIL_SPEC)
+        missing = missing_required(fields, CAREERVIET_REQUIRED_FIELDS)
+        if missing:
+            self.logger.info(f"[HTTP] Thieu {missing} cho link: {link}. Chuyen sang Selenium.")
+            return None
+
+        if self.html_store:
+            self.html_store.save(self.SOURCE_WEB, None, link, fetcher.last_html, extra={"CongTy": company_name_card, "LinkCongTy": company_link_card})
+        return self._build_row(fields, link, company_name_card, company_link_card)
+
+    def _build_row(self, fields, link, company_name_card, company_link_card):
+        """Hop nhat voi thong tin tu Card, bo sung cot co dinh va sap xep theo CSV_HEADER (21 cot)."""
+        # Uu tien ten/link cong ty tu Card, nhung lay Size tu Tab2
+        fields["CongTy"] = company_name_card or fields["CongTy"]
+        fields["LinkCongTy"] = company_link_card or fields["LinkCongTy"]
+        fields["LinkBaiTuyenDung"] = link
+        fields["Nguon"] = self.SOURCE_WEB
+        fields["NgayCaoDuLieu"] = datetime.now().strftime('%Y-%m-%d')
+        return row_from_fields(fields, self.CSV_HEADER)
+
     # ==================================================
     # HAM RUN CHINH (Tu dong quet)
     # ==================================================
@@ -246,9 +217,14 @@ class CareerVietScraper:
         if not self.driver:
             return
 
-        # B1: Tai lich su
-        self.logger.info("Dang tai lich su links...")
-        self._load_seen_links()
+        # B1: Nap lich su cu (chi 1 lan) vao kho dung chung
+        self.seen_store.import_legacy(self.SOURCE_WEB)
+        self.logger.info(f"Lich su co {self.seen_store.count(self.SOURCE_WEB)} links da cao.")
+        queued_links = set() # Link da dua vao hang cho trong phien nay
+        capture_keys = {} # link -> khoa Bloom (job_key + posting_key) ghi lai khi cao xong
+        # [THEM MOI] Moc quet tang dan: dung lat trang khi gap cac tin cu hon moc lan truoc
+        high_water = HighWaterMark(self.seen_store, self.SOURCE_WEB, self.category_name, logger=self.logger)
+        self.logger.info(f"[HWM] {high_water.describe()}")
 
         # ==========================================================
         # [THAY DOI] Logic tim max page
@@ -265,6 +241,8 @@ class CareerVietScraper:
         self.logger.info(f"Bat dau quet tu trang 1 den {max_page_limit}...")
         
         new_jobs_to_crawl = []
+        skipped_today = 0
+        reached_mark = False
         jobs_collected_count = 0 
         stop_collecting = False
         
@@ -287,22 +265,16 @@ class CareerVietScraper:
             try:
                 if page == 1:
                     self.logger.info(f"Dang xu ly trang {page}/{max_page_limit} (da duoc tai de lay max_page)...")
-                    self._human_like_scroll()
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-item"))
-                    )
+                    wait_for_listing(self.driver, CAREERVIET_LISTING_SPEC, timeout=10)
                 else:
                     url = self._build_page_url(page)
                     self.logger.info(f"Dang quet trang {page}/{max_page_limit}...")
+                    self.rate_limiter.wait(url)
                     self.driver.get(url)
-                    time.sleep(random.uniform(2, 4))
-                    self._human_like_scroll()
-                    
-                    WebDriverWait(self.driver, 20).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-item"))
-                    )
+                    wait_for_listing(self.driver, CAREERVIET_LISTING_SPEC, timeout=20)
                 
-                job_cards = self.driver.find_elements(By.CSS_SELECTOR, "div.job-item")
+                # [THAY DOI] Lay href + ten/link cong ty + tom tat cua moi card trong 1 lan execute_script
+                job_cards = harvest_listing(self.driver, CAREERVIET_LISTING_SPEC)
                 
             except Exception as e:
                 self.logger.warning(f"Trang {page} khong load duoc hoac khong tim thay job card. Bo qua trang. Loi: {e}") 
@@ -320,35 +292,24 @@ class CareerVietScraper:
                 if stop_collecting:
                     break 
 
-                try:
+                link_job = card["href"]
+                if high_water.reached(link_job):
+                    reached_mark = True
+                    break # Phan con lai cua danh sach da cu hon moc
+                keys = card_keys(card)
+                if any(key in self.today_filter for key in keys):
+                    skipped_today += 1 # Da cao hom nay (o danh muc khac / cung tin tren trang khac)
+                    continue
+                if link_job not in queued_links and not self.seen_store.contains(self.SOURCE_WEB, link_job):
+                    new_jobs_to_crawl.append((link_job, card["company"], card["company_link"]))
+                    capture_keys[link_job] = keys
+                    queued_links.add(link_job)
                     
-                    link_element = card.find_element(By.CSS_SELECTOR, "a.job_link") 
-                    link_job = link_element.get_attribute("href")
-
+                    jobs_collected_count += 1
+                    new_jobs_found_on_page += 1
                     
-                    if link_job:
-                        if link_job not in self.seen_links:
-                            
-                            company_name_card = ""
-                            company_link_card = ""
-                            try:
-                                company_elem_card = card.find_element(By.CSS_SELECTOR, "a.company-name")
-                                company_name_card = company_elem_card.get_attribute("title").strip() 
-                                company_link_card = company_elem_card.get_attribute("href")
-                            except Exception:
-                                self.logger.debug(f"Khong tim thay ten/link cong ty tren card cho link: {link_job}")
-                            
-                            new_jobs_to_crawl.append((link_job, company_name_card, company_link_card))
-                            
-                            jobs_collected_count += 1
-                            new_jobs_found_on_page += 1
-                            
-                            if jobs_collected_count >= self.JOB_LIMIT:
-                                stop_collecting = True
-                                
-                except Exception as e_link:
-                    self.logger.warning(f"Khong tim thay link trong mot job card. Loi: {e_link}")
-                    continue
+                    if jobs_collected_count >= self.JOB_LIMIT:
+                        stop_collecting = True
             
             if new_jobs_found_on_page > 0:
                 self.logger.info(f"Trang {page} -> Tim thay {new_jobs_found_on_page} job MOI. (Tong so job moi: {jobs_collected_count}/{self.JOB_LIMIT})") 
@@ -358,11 +319,15 @@ class CareerVietScraper:
                 consecutive_pages_with_no_new_jobs += 1 
 
             
-            page += 1 # Chuyen sang trang tiep theo
-            time.sleep(random.uniform(self.PAUSE_BETWEEN_PAGES_MIN, self.PAUSE_BETWEEN_PAGES_MAX))
+            page += 1 # Chuyen sang trang tiep theo (khoang nghi do rate_limiter quyet dinh)
+            if reached_mark:
+                self.logger.info(f"[HWM] Da gap moc lan quet truoc o trang {page-1}. Dung quet trang.")
+                break
         
         self.logger.info(f"Hoan thanh quet trang (da quet den trang {page-1} / gioi han {max_page_limit}).")
 
+        if skipped_today:
+            self.logger.info(f"Bo qua {skipped_today} job da cao hom nay (Bloom filter dung chung).")
         self.logger.info(f"Da thu thap xong. Co {len(new_jobs_to_crawl)} job MOI can cao chi tiet.")
 
         # ===== VONG 2: CAO CHI TIET =====
@@ -376,10 +341,11 @@ class CareerVietScraper:
             writer.writerow(self.CSV_HEADER)
 
         success_count, error_count = 0, 0
+        fetcher = HttpFetcher(logger=self.logger) if self.FETCH_MODE == "http" else None
         
         if new_jobs_to_crawl: # Chi chay neu co job moi
-            with open(output_file, "a", encoding="utf-8-sig", newline="") as f:
-                writer = csv.writer(f)
+            # [THAY DOI] Ghi theo lo + fsync; link chi vao lich su sau khi dong CSV da xuong dia
+            with SerializedWriter(output_file, self.seen_store, self.SOURCE_WEB, logger=self.logger) as writer:
                 
                 for idx, (link, company_name_card, company_link_card) in enumerate(new_jobs_to_crawl, 1):
                     if success_count >= self.JOB_LIMIT:
@@ -387,73 +353,21 @@ class CareerVietScraper:
                         break
                         
                     try:
-                        self.driver.get(link)
-                        time.sleep(random.uniform(2, 5))
-                        self._human_like_scroll()
-                        WebDriverWait(self.driver, 20).until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.detail-row"))) 
-                        
-                        # Khoi tao du 22 bien
-                        title, work_location, experience, salary = "", "", "", ""
-                        work_time, gender, level, work_form = "", "", "", ""
-                        
-                        company_name, company_link, company_size = company_name_card, company_link_card, ""
-                        
-                        recruit_quantity, education = "", ""
-                        requirement, job_description, benefits = "", "", ""
-                        deadline = ""
-                        linh_vuc = "" 
-                        link_job = link
-                        source_web = self.SOURCE_WEB
-                        ngay_cao_hien_tai = datetime.now().strftime('%Y-%m-%d')
-                        
-                        # Cao du lieu
-                        title = self._safe_text(By.CSS_SELECTOR, "h1.title")
-                        linh_vuc = self._safe_text(By.XPATH, "//strong[contains(., 'Ngành nghề')]/following-sibling::p")
-                        work_location = self._safe_text(By.XPATH, "//strong[contains(.,'Địa điểm')]/following-sibling::p/a")
-                        experience = self._safe_text(By.XPATH, "//strong[contains(.,'Kinh nghiệm')]/following-sibling::p")
-                        salary = self._safe_text(By.XPATH, "//strong[contains(.,'Lương')]/following-sibling::p | //li[contains(text(), 'Lương:')]")
-                        level = self._safe_text(By.XPATH, "//strong[contains(.,'Cấp bậc')]/following-sibling::p")
-                        work_form = self._safe_text(By.XPATH, "//strong[contains(.,'Hình thức')]/following-sibling::p")
-                        deadline = self._safe_text(By.XPATH, "//strong[contains(.,'Hết hạn nộp')]/following-sibling::p")
-                        education = self._safe_text(By.XPATH, "//li[contains(text(), 'Bằng cấp:')]")
-            
-                        requirement = self._get_full_section_text("Yêu Cầu Công Việc")
-                        job_description = self._get_full_section_text("Mô tả Công việc")
-                        
-                        try:
-                            benefits_elem = self.driver.find_element(By.XPATH, "//h2[contains(text(), 'Phúc lợi')]/following-sibling::ul[@class='welfare-list']")
-                            benefits = benefits_elem.text.strip()
-                        except Exception:
-                            benefits = ""
+                        job_data = None
+                        if fetcher is not None:
+                            # [THEM MOI] Thu HTTP truoc, thieu field bat buoc moi dung Selenium
+                            job_data = self._scrape_job_detail_http(fetcher, link, company_name_card, company_link_card)
+                        if job_data is None:
+                            job_data = self._scrape_job_detail(link, company_name_card, company_link_card)
+                        title = job_data[0]
 
-                        
-                        
-                        
-                        
-                        name_from_tab2, link_from_tab2, size_from_tab2 = self._get_company_info()
-                        
-                        # Hop nhat du lieu: Uu tien thong tin tu Card, nhung lay Size tu Tab2
-                        company_name = company_name if company_name else name_from_tab2
-                        company_link = company_link if company_link else link_from_tab2
-                        company_size = size_from_tab2 # Luon lay size moi tu tab (neu co)
-                        
                         # Ghi du 22 cot vao CSV
-                        writer.writerow([
-                            title, work_location, experience, salary,
-                            work_time, gender, level, work_form,
-                            company_name, company_link, company_size, recruit_quantity, education,
-                            requirement, job_description, benefits,
-                            deadline, link_job, source_web, ngay_cao_hien_tai,
-                            linh_vuc
-                        ])
+                        writer.submit(job_data, link)
                         
-                        self.seen_links.add(link)
+                        self.today_filter.add_many(capture_keys.get(link) or [job_key(link)])
                         success_count += 1
                         
                         self.logger.info(f"[{success_count}/{len(new_jobs_to_crawl)}] Da cao va luu job: {title[:60]}...") 
-                        
-                        
-                        time.sleep(random.uniform(self.PAUSE_BETWEEN_JOBS_MIN, self.PAUSE_BETWEEN_JOBS_MAX))
                     
                     except Exception as e:
                         error_count += 1
@@ -462,10 +376,18 @@ class CareerVietScraper:
                         
                         continue 
         
-        # Luu lai toan bo lich su (cu + moi) ra file
-        self._save_seen_links()
+        # Ghi not lo link moi con cho vao kho lich su
+        # Chi day moc len khi da lay het phan moi (khong bi cat boi JOB_LIMIT, khong co job loi)
+        if jobs_collected_count < self.JOB_LIMIT and success_count == len(new_jobs_to_crawl):
+            high_water.commit()
+        else:
+            self.logger.info("[HWM] Con job moi chua cao xong -> giu nguyen moc cu.")
+        self.seen_store.flush()
+        self.today_filter.save()
         
         self.driver.quit()
+        if fetcher is not None:
+            fetcher.close()
         
         # ===== XU LY KET THUC =====
         end_time = time.time()
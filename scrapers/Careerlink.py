@@ -1,19 +1,25 @@
-import selenium
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time, random, csv, os, re, sys, logging
+import time, csv, os, re, sys, logging
 from datetime import datetime
 
 # Them project root vao sys.path de chay doc lap
 project_root_for_import = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root_for_import)
 
+from scrapers.driver_factory import create_chrome_driver
+from scrapers.throttle import HostRateLimiter, looks_blocked
+from scrapers.http_fetch import HttpFetcher, extract_fields, missing_required, row_from_fields
+from scrapers.html_store import HtmlStore
+from scrapers.seen_store import SeenStore
+from scrapers.output_writer import SerializedWriter
+from scrapers.dedup import DailyBloomFilter, card_keys, job_key
+from scrapers.high_water import HighWaterMark
+from scrapers.browser_extract import extract_fields_in_browser, harvest_listing, wait_for_fields, wait_for_listing
+from scrapers.site_specs import CAREERLINK_DETAIL_SPEC, CAREERLINK_LISTING_SPEC, CAREERLINK_REQUIRED_FIELDS
+
 
 class CareerLinkScraper:
     def __init__(self, category_name, base_url):
@@ -23,14 +29,12 @@ class CareerLinkScraper:
         self.SOURCE_WEB = "CareerLink"
 
         # Cau hinh chung
-        self.PAUSE_BETWEEN_PAGES_MIN = 3
-        self.PAUSE_BETWEEN_PAGES_MAX = 6
-        self.PAUSE_BETWEEN_JOBS_MIN = 4
-        self.PAUSE_BETWEEN_JOBS_MAX = 8
-        self.JOBS_PER_LONG_BREAK = 50
-        self.LONG_BREAK_DURATION_MIN = 60
-        self.LONG_BREAK_DURATION_MAX = 120
+        # [THAY DOI] Khoang nghi giua trang/job do token bucket theo host quyet dinh (xem scrapers/throttle.py).
+        # Chay qua scrapers/category_runner.py: limiter nay duoc thay bang bucket dung chung cua host.
+        self.rate_limiter = HostRateLimiter()
         self.JOB_LIMIT = 20
+        self.FETCH_MODE = "http" # "http": tai bang HTTP truoc, Selenium du phong | "selenium": chi dung Chrome
+        self.SAVE_RAW_HTML = True # [THEM MOI] Luu HTML trang chi tiet vao kho raw_html/ (parse lai: python scrapers/html_store.py parse)
         
         # Thiet lap duong dan
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -39,9 +43,8 @@ class CareerLinkScraper:
         self.csv_output_dir = os.path.join(project_root, "dataset")
         os.makedirs(self.csv_output_dir, exist_ok=True)
         
-        # Su dung chung file log/history cho CareerLink
+        # Su dung chung file log cho CareerLink (lich su ID nam trong SeenStore dung chung)
         self.log_file = os.path.join(scraper_dir, "CareerLink.log")
-        self.id_history_file = os.path.join(scraper_dir, "CareerLink_id_history.txt")
 
         
         # ==========================================================
@@ -57,6 +60,11 @@ class CareerLinkScraper:
         
         self._setup_logging()
         self.logger = logging.getLogger(f"{self.SOURCE_WEB}.{self.category_name}") 
+        self.html_store = HtmlStore(logger=self.logger) if self.SAVE_RAW_HTML else None
+        # [THEM MOI] Lich su job da cao (SQLite dung chung, an toan khi nhieu danh muc chay cung luc)
+        self.seen_store = SeenStore(logger=self.logger)
+        # [THEM MOI] Bloom filter dung chung: tin da cao hom nay (bat ky danh muc/nguon nao) -> bo qua
+        self.today_filter = DailyBloomFilter(logger=self.logger)
 
     def _setup_logging(self): 
         
@@ -77,48 +85,16 @@ class CareerLinkScraper:
             base_logger.addHandler(console_handler)
 
     def _create_driver(self):
-        chrome_options = Options()
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--disable-infobars")
-        chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--headless=new")
-        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+        """[THAY DOI] Tao Chrome qua nha may chung (eager load, chan anh/CSS/font/quang cao, cache chromedriver)."""
+        return create_chrome_driver(logger=self.logger)
 
     
-    def _get_existing_ids(self):
-        """Doc va tra ve set ID da cao tu file history."""
-        if not os.path.exists(self.id_history_file): return set()
-        try:
-            with open(self.id_history_file, 'r', encoding='utf-8') as f:
-                return {line.strip() for line in f if line.strip()}
-        except Exception as e:
-            self.logger.error(f"Loi khi doc file lich su ID {self.id_history_file}: {e}") 
-            return set()
-
     def _extract_job_id_from_link(self, link):
         """Trich xuat ID tu link job CareerLink."""
         if not link: return None
         match = re.search(r'/(\d+)(?=\?|$)', link) 
         return match.group(1) if match else None
 
-    def _human_like_scroll(self, driver):
-        scroll_height = driver.execute_script("return document.body.scrollHeight")
-        current_position = 0
-        step = random.randint(300, 600)
-        while current_position < scroll_height:
-            driver.execute_script(f"window.scrollTo(0, {current_position + step});")
-            current_position += step
-            time.sleep(random.uniform(0.3, 0.8))
-
-    def _safe_text(self, driver, by, selector):
-        """Lay text an toan, tra ve "" neu loi."""
-        try:
-            return driver.find_element(by, selector).text.strip()
-        except:
-            return ""
-
     # ==================================================
     # [THEM MOI] HAM TIM MAX PAGE
     # ==================================================
@@ -129,6 +105,7 @@ class CareerLinkScraper:
         try:
             # Tai trang 1 (la self.base_url)
             self.logger.info(f"Dang tai trang 1 ({self.base_url}) de xac dinh so trang toi da (max_page)...")
+            self.rate_limiter.wait(self.base_url)
             driver.get(self.base_url)
             
             # Doi cho thanh pagination xuat hien
@@ -171,6 +148,57 @@ class CareerLinkScraper:
             self.logger.error(f"Loi khong xac dinh khi tim max page: {e}. Dat max_page = 1.")
             return 1
     
+    def _scrape_job_detail(self, driver, link, job_id):
+        """[THEM MOI] Cao chi tiet 1 job bang Selenium, tra ve 1 dong CSV (21 cot)."""
+        throttle = self.rate_limiter.adaptive(link, logger=self.logger)
+        self.rate_limiter.wait(link)
+        started = time.monotonic()
+        try:
+            driver.get(link)
+            # [THAY DOI] Chi ten cong viec la bat buoc; muc khac (vd mo ta) khong co sau khi DOM yen la tin binh thuong
+            absent = wait_for_fields(driver, CAREERLINK_DETAIL_SPEC, CAREERLINK_REQUIRED_FIELDS, timeout=20)
+        except TimeoutException:
+            throttle.record_failure("trang chan" if looks_blocked(driver.title) else f"timeout job ID {job_id}")
+            raise
+        throttle.record_success(time.monotonic() - started)
+        if absent:
+            self.logger.info(f"Job ID {job_id} khong co muc {absent}. Van luu.")
+
+        # [THAY DOI] Lay tat ca field trong 1 lan execute_script (thay cho ~16 lenh find_element)
+        fields = extract_fields_in_browser(driver, CAREERLINK_DETAIL_SPEC)
+        if self.html_store:
+            self.html_store.save(self.SOURCE_WEB, job_id, link, driver.page_source)
+        return self._build_row(fields, link)
+
+    def _scrape_job_detail_http(self, fetcher, link, job_id):
+        """[THEM MOI] Cao chi tiet bang HTTP + lxml. Tra ve None neu thieu field bat buoc (de chuyen sang Selenium)."""
+        throttle = self.rate_limiter.adaptive(link, logger=self.logger)
+        self.rate_limiter.wait(link)
+        document = fetcher.fetch_document(link)
+        if document is not None and looks_blocked(document.findtext(".//title")):
+            throttle.record_failure(f"trang chan (job ID {job_id})")
+            return None
+        throttle.record_status(fetcher.last_status, fetcher.last_latency)
+        if document is None:
+            return None
+
+        fields = extract_fields(document, CAREERLINK_DETAIL_SPEC)
+        missing = missing_required(fields, CAREERLINK_REQUIRED_FIELDS)
+        if missing:
+            self.logger.info(f"[HTTP] Job ID {job_id} thieu {missing}. Chuyen sang Selenium.")
+            return None
+
+        if self.html_store:
+            self.html_store.save(self.SOURCE_WEB, job_id, link, fetcher.last_html)
+        return self._build_row(fields, link)
+
+    def _build_row(self, fields, link):
+        """Bo sung cac cot co dinh va sap xep theo CSV_HEADER (21 cot)."""
+        fields["LinkBaiTuyenDung"] = link
+        fields["Nguon"] = self.SOURCE_WEB
+        fields["NgayCaoDuLieu"] = datetime.now().strftime('%Y-%m-%d')
+        return row_from_fields(fields, self.CSV_HEADER)
+
     def run(self):
         
         start_time = time.time()
@@ -185,8 +213,13 @@ class CareerLinkScraper:
             writer.writerow(self.CSV_HEADER)
 
         driver = self._create_driver()
-        existing_ids = self._get_existing_ids()
-        self.logger.info(f"Da tim thay {len(existing_ids)} ID jobs trong lich su chung cua CareerLink.") 
+        self.seen_store.import_legacy(self.SOURCE_WEB)
+        self.logger.info(f"Da tim thay {self.seen_store.count(self.SOURCE_WEB)} ID jobs trong lich su chung cua CareerLink.") 
+        queued_ids = set() # ID da dua vao hang cho trong phien nay
+        capture_keys = {} # link -> khoa Bloom (job_key + posting_key) ghi lai khi cao xong
+        # [THEM MOI] Moc quet tang dan: dung lat trang khi gap cac tin cu hon moc lan truoc
+        high_water = HighWaterMark(self.seen_store, self.SOURCE_WEB, self.category_name, logger=self.logger)
+        self.logger.info(f"[HWM] {high_water.describe()}")
 
         # ==========================================================
         # [THEM MOI] Logic tim max page
@@ -201,6 +234,8 @@ class CareerLinkScraper:
         
         
         new_jobs_to_crawl = []
+        skipped_today = 0
+        reached_mark = False
         
         
         page = 1
@@ -224,22 +259,21 @@ class CareerLinkScraper:
                 if page == 1:
                     self.logger.info(f"Dang xu ly trang {page}/{max_page_limit} (da duoc tai de lay max_page)...")
                     # Trang 1 da duoc tai, chi can scroll/wait
-                    self._human_like_scroll(driver)
-                    WebDriverWait(driver, 10).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.job-link.clickable-outside")))
+                    wait_for_listing(driver, CAREERLINK_LISTING_SPEC, timeout=10)
                 else:
                     url = f"{self.base_url}?page={page}"
                     self.logger.info(f"Dang quet trang {page}/{max_page_limit}...")
+                    self.rate_limiter.wait(url)
                     driver.get(url)
-                    time.sleep(random.uniform(2, 4))
-                    self._human_like_scroll(driver)
-                    WebDriverWait(driver, 20).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.job-link.clickable-outside")))
+                    wait_for_listing(driver, CAREERLINK_LISTING_SPEC, timeout=20)
             
             except Exception as e:
                 self.logger.warning(f"Trang {page} khong load duoc. Bo qua trang. Loi: {e}") 
                 page += 1
                 continue # [THAY DOI] Tiep tuc vong while
 
-            job_cards = driver.find_elements(By.CSS_SELECTOR, "a.job-link.clickable-outside")
+            # [THAY DOI] Lay href + job id + tom tat cua moi card trong 1 lan execute_script
+            job_cards = harvest_listing(driver, CAREERLINK_LISTING_SPEC, self._extract_job_id_from_link)
             if not job_cards:
                 self.logger.info(f"Trang {page} khong co job nao. Chuyen trang tiep theo.") 
                 page += 1
@@ -253,16 +287,20 @@ class CareerLinkScraper:
                     stop_collecting = True
                     break # Dung vong 'card'
 
-                try:
-                    link_job = card.get_attribute("href")
-                    job_id = self._extract_job_id_from_link(link_job)
-                    if job_id and job_id not in existing_ids:
-                        new_jobs_to_crawl.append((link_job, job_id))
-                        existing_ids.add(job_id) # Them vao set de khong bi trung trong phien nay
-                        new_jobs_found_on_page += 1
-                        jobs_collected_count += 1 # Tang bo dem tong
-                except:
+                link_job, job_id = card["href"], card["job_id"]
+                if high_water.reached(link_job, job_id):
+                    reached_mark = True
+                    break # Phan con lai cua danh sach da cu hon moc
+                keys = card_keys(card)
+                if any(key in self.today_filter for key in keys):
+                    skipped_today += 1 # Da cao hom nay (o danh muc khac / cung tin tren trang khac)
                     continue
+                if job_id and job_id not in queued_ids and not self.seen_store.contains(self.SOURCE_WEB, job_id):
+                    new_jobs_to_crawl.append((link_job, job_id))
+                    capture_keys[link_job] = keys
+                    queued_ids.add(job_id) # Them vao set de khong bi trung trong phien nay
+                    new_jobs_found_on_page += 1
+                    jobs_collected_count += 1 # Tang bo dem tong
             
             # [THAY DOI] Logic kiem tra trang rong
             if new_jobs_found_on_page > 0:
@@ -272,11 +310,10 @@ class CareerLinkScraper:
                 self.logger.info(f"Trang {page} khong co job nao moi.") 
                 consecutive_pages_with_no_new_jobs += 1 # Tang
 
-            pause_time = random.uniform(self.PAUSE_BETWEEN_PAGES_MIN, self.PAUSE_BETWEEN_PAGES_MAX)
-            self.logger.info(f"--- Nghi {round(pause_time, 1)} giay truoc khi sang trang tiep theo ---") 
-            time.sleep(pause_time)
-            
             page += 1 # Tang trang de quet tiep
+            if reached_mark:
+                self.logger.info(f"[HWM] Da gap moc lan quet truoc o trang {page-1}. Dung quet trang.")
+                break
             
         # ==========================================================
         # HET VONG 1
@@ -284,9 +321,15 @@ class CareerLinkScraper:
         
         self.logger.info(f"Hoan thanh quet trang (da quet den trang {page-1} / gioi han {max_page_limit}).")
 
+        if skipped_today:
+            self.logger.info(f"Bo qua {skipped_today} job da cao hom nay (Bloom filter dung chung).")
         self.logger.info(f"Da thu thap xong. Co {len(new_jobs_to_crawl)} job moi can cao chi tiet.") 
         
         success_count, error_count = 0, 0
+        fetcher = HttpFetcher(logger=self.logger) if self.FETCH_MODE == "http" else None
+        # [THAY DOI] Mo file CSV 1 lan cho ca phien: ghi theo lo + fsync, ID chi vao lich su sau khi dong da xuong dia
+        output_writer = SerializedWriter(output_file, self.seen_store, self.SOURCE_WEB, logger=self.logger)
+        output_writer.start()
         
         if not new_jobs_to_crawl:
             self.logger.info("Khong co job moi nao de cao. Ket thuc.") 
@@ -295,124 +338,17 @@ class CareerLinkScraper:
         # (LOGIC VONG 2 GIU NGUYEN - KHONG THAY DOI)
             for idx, (link, job_id) in enumerate(new_jobs_to_crawl, 1):
                 try:
-                    driver.get(link)
-                    time.sleep(random.uniform(2, 5))
-                    self._human_like_scroll(driver)
-                    WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-detail")))
-                    
-                    
-                    # ==========================================================
-                    # SUA 2: Khoi tao du 22 bien (them cac cot thieu)
-                    # ==========================================================
-                    title, work_location, salary, experience, deadline = "", "", "", "", ""
-                    job_description, skills, benefits = "", "", ""
-                    company_name, company_link, company_size = "", "", ""
-                    level, education, gender, work_form = "", "", "", ""
-                    
-                    # Them cac cot thieu de khop DB
-                   
-                    work_time = ""
-                    recruit_quantity = "" 
-                    linh_vuc = "" # Khoi tao bien linh_vuc
-                    
-                    # Cao tung bien
-                    try:
-                        title = self._safe_text(driver, By.CSS_SELECTOR, "h1.job-title.mb-0")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'title' (ID: {job_id}): {e}")
-                    
-                    try:
-                        work_location = self._safe_text(driver, By.XPATH, '//div[@id="job-location"]//a')
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'work_location' (ID: {job_id}): {e}")
-
-                    try:
-                        salary = self._safe_text(driver, By.XPATH, '//div[@id="job-salary"]/span[contains(@class, "text-primary")]')
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'salary' (ID: {job_id}): {e}")
-
-                    try:
-                        experience = self._safe_text(driver, By.XPATH, '//div[i[contains(@class, "cli-suitcase-simple")]]/span')
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'experience' (ID: {job_id}): {e}")
-
-                    try:
-                        deadline = self._safe_text(driver, By.XPATH, "//div[@id='job-date']//div[contains(@class,'day-expired')]//b")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'deadline' (ID: {job_id}): {e}")
-
-                    try:
-                        job_description_elem = driver.find_element(By.XPATH, '//div[@id="section-job-description"]//div[@class="rich-text-content"]')
-                        job_description = job_description_elem.text.strip()
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'job_description' (ID: {job_id}): {e}")
-
-                    try:
-                        skills = self._safe_text(driver, By.XPATH, '//div[@id="section-job-skills"]')
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'skills' (ID: {job_id}): {e}")
-
-                    try:
-                        benefits_elem = driver.find_element(By.XPATH, '//div[@id="section-job-benefits"]')
-                        benefits = benefits_elem.text.strip()
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'benefits' (ID: {job_id}): {e}")
-                    
-                    try:
-                        company_elem = driver.find_element(By.CSS_SELECTOR, "h5.company-name-title a")
-                        company_name = company_elem.get_attribute("title").strip()
-                        company_link = company_elem.get_attribute("href")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'company_name/link' (ID: {job_id}): {e}")
-                    
-                    try:
-                        company_size = self._safe_text(driver, By.XPATH, "//i[contains(@class,'cli-users')]/following-sibling::span")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'company_size' (ID: {job_id}): {e}")
-
-                    try:
-                        level = self._safe_text(driver, By.XPATH, "//div[contains(text(),'Cấp bậc')]/following-sibling::div")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'level' (ID: {job_id}): {e}")
-
-                    try:
-                        education = self._safe_text(driver, By.XPATH, "//div[contains(text(),'Học vấn')]/following-sibling::div")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'education' (ID: {job_id}): {e}")
-
-                    try:
-                        gender = self._safe_text(driver, By.XPATH, "//div[contains(text(),'Giới tính')]/following-sibling::div")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'gender' (ID: {job_id}): {e}")
-                    try:
-                        linh_vuc = self._safe_text(driver, By.XPATH, "//div[contains(text(),'Ngành nghề')]/following-sibling::div")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'linh_vuc' (ID: {job_id}): {e}")
-
-                    try:
-                        work_form = self._safe_text(driver, By.XPATH, "//div[contains(text(),'Loại công việc')]/following-sibling::div")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'work_form' (ID: {job_id}): {e}")
-                    
-                    
-                    ngay_cao_hien_tai = datetime.now().strftime('%Y-%m-%d')
-                    
-                    # Ghi vao CSV
-                    with open(output_file, "a", encoding="utf-8-sig", newline="") as f:
-                        writer = csv.writer(f)
-                        writer.writerow([
-                            title, work_location, experience, salary,
-                            work_time, gender, level, work_form,
-                            company_name, company_link, company_size, recruit_quantity, education,
-                            skills,
-                            job_description, benefits,
-                            deadline, link, self.SOURCE_WEB, ngay_cao_hien_tai,
-                            linh_vuc
-                        ])
-                    
-                    # Ghi vao history ID
-                    with open(self.id_history_file, "a", encoding="utf-8") as f:
-                        f.write(job_id + "\n")
+                    job_data = None
+                    if fetcher is not None:
+                        # [THEM MOI] Thu HTTP truoc, thieu field bat buoc moi dung Selenium
+                        job_data = self._scrape_job_detail_http(fetcher, link, job_id)
+                    if job_data is None:
+                        job_data = self._scrape_job_detail(driver, link, job_id)
+                    title = job_data[0]
+
+                    # Ghi CSV + lich su ID (cung checkpoint cua output_writer)
+                    output_writer.submit(job_data, job_id)
+                    self.today_filter.add_many(capture_keys.get(link) or [job_key(link)])
 
                     success_count += 1
                     self.logger.info(f"[{success_count}/{len(new_jobs_to_crawl)}] Da cao va luu job ID {job_id}: {title[:60]}...") 
@@ -421,14 +357,7 @@ class CareerLinkScraper:
                     if success_count >= self.JOB_LIMIT:
                         self.logger.info(f"Da dat gioi han {self.JOB_LIMIT} job thanh cong. Dung cao chi tiet.") 
                         break # Dung vong 'for idx, (link, job_id)'
-
-                    # Tam nghi
-                    if success_count % self.JOBS_PER_LONG_BREAK == 0 and success_count < len(new_jobs_to_crawl) and success_count < self.JOB_LIMIT:
-                        sleep_time = random.uniform(self.LONG_BREAK_DURATION_MIN, self.LONG_BREAK_DURATION_MAX)
-                        self.logger.info(f"Nghi dai sau {success_count} job... Se tiep tuc sau {round(sleep_time/60, 1)} phut.") 
-                        time.sleep(sleep_time)
-                    else:
-                        time.sleep(random.uniform(self.PAUSE_BETWEEN_JOBS_MIN, self.PAUSE_BETWEEN_JOBS_MAX))
+                    # [THAY DOI] Bo nghi dai 60-120s moi 50 job: toc do do AIMD (rate_limiter.adaptive) dieu tiet
                 
                 except Exception as e:
                     error_count += 1
@@ -442,7 +371,18 @@ class CareerLinkScraper:
                         time.sleep(5)
                         driver = self._create_driver()
 
+        output_writer.close()
+        output_file = output_writer.output_file # Doi sang .parquet neu SCRAPER_OUTPUT_FORMAT=parquet
         driver.quit()
+        if fetcher is not None:
+            fetcher.close()
+        # Chi day moc len khi da lay het phan moi (khong bi cat boi JOB_LIMIT, khong co job loi)
+        if jobs_collected_count < self.JOB_LIMIT and success_count == len(new_jobs_to_crawl):
+            high_water.commit()
+        else:
+            self.logger.info("[HWM] Con job moi chua cao xong -> giu nguyen moc cu.")
+        self.seen_store.flush()
+        self.today_filter.save()
         
     
         end_time = time.time()
@@ -1,15 +1,8 @@
 # scrapers/JobsGo_scraper.py
 
-import selenium
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time, random, csv, os, sys, re
+import time, csv, os, sys, re
 from datetime import datetime 
 import logging 
 
@@ -17,17 +10,40 @@ import logging
 project_root_for_import = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root_for_import)
 
+from scrapers.driver_factory import create_chrome_driver
+from scrapers.throttle import HostRateLimiter, looks_blocked
+from scrapers.seen_store import SeenStore
+from scrapers.output_writer import SerializedWriter
+from scrapers.driver_supervisor import DriverSupervisor
+from scrapers.browser_extract import wait_for_xpaths
+from scrapers.dedup import DailyBloomFilter, job_key
+from scrapers.frontier import CrawlFrontier
+
+# [THAY DOI] Selector cu "div.card job-card rounded-3 h-100 p-3" khong hop le (CSS hieu la the con) -> dung XPath theo class
+JOBSGO_CARD_XPATH = "//div[contains(concat(' ', normalize-space(@class), ' '), ' job-card ')]"
+JOBSGO_DETAIL_BODY_XPATH = "//div[contains(concat(' ', normalize-space(@class), ' '), ' job-detail__body ')]"
+JOBSGO_PAGE_LINK_XPATH = "//*[contains(@class, 'pagination')]//a[contains(@href, 'page=')]"
+
 class JobsGoScraper:
     def __init__(self):
         """Khoi tao scraper JobsGo."""
         # Cau hinh pipeline
-        self.START_PAGE = 1
-        self.PAGES_TO_ADD_PER_RUN = 1 
-        self.JOBS_PER_BREAK = 50
-        self.BREAK_DURATION_MIN = 120
-        self.BREAK_DURATION_MAX = 300
-        self.BATCH_SIZE_RESTART_DRIVER = 20
+        # [THAY DOI] Bo START_PAGE / PAGES_TO_ADD_PER_RUN (quet lai trang 1..N, N tang moi lan chay):
+        # moi lan chi quet dau danh sach sort=created + 1 cua so bu co gioi han (xem CrawlFrontier)
+        self.LISTING_URL = "https://jobsgo.vn/viec-lam-cong-nghe-thong-tin.html?category=cong-nghe-thong-tin&sort=created&page={page}"
+        self.HEAD_PAGES = 2 # So trang dau luon quet
+        self.MAX_HEAD_PAGES = 10 # Keo dai dau danh sach toi da toi trang nay khi van con job moi
+        self.BACKFILL_PAGES = 3 # So trang bu phia sau moi lan chay
+        self.BACKFILL_REVISIT_DAYS = 7 # Bu het danh sach -> sau bay nhieu ngay moi bu lai tu dau
+        # [THAY DOI] Bo nghi dai co dinh (JOBS_PER_BREAK / BREAK_DURATION_*):
+        # toc do duoc dieu tiet AIMD theo do tre va loi (xem AdaptiveThrottle trong scrapers/throttle.py)
+        # [THAY DOI] Bo khoi dong lai driver sau moi 20 job (BATCH_SIZE_RESTART_DRIVER):
+        # DriverSupervisor chi tai tao khi cay tien trinh Chrome vuot nguong RAM/handle hoac bi crash
+        self.MAX_DRIVER_RSS_MB = 1500
+        self.MAX_DRIVER_HANDLES = 5000
         self.SOURCE_WEB = "JobsGo"
+        # [THEM MOI] Gioi han toc do theo host (token bucket).
+        self.rate_limiter = HostRateLimiter()
         
         # Thiet lap duong dan
         project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -37,8 +53,7 @@ class JobsGoScraper:
         os.makedirs(self.csv_output_dir, exist_ok=True)
 
         self.log_file = os.path.join(scraper_dir, "JobsGo.log")
-        self.id_history_file = os.path.join(scraper_dir, "JobsGo_id_history.txt")
-        self.max_page_file = os.path.join(scraper_dir, "JobsGo_max_page.txt")
+        self.max_page_file = os.path.join(scraper_dir, "JobsGo_max_page.txt") # Chi con dung de khoi tao bien quet lan dau
 
         # ==========================================================
         # SUA 1: Header CSV (Them GioiTinh, LinhVuc cho du 22 cot)
@@ -53,6 +68,10 @@ class JobsGoScraper:
         
         self._setup_logging()
         self.logger = logging.getLogger(self.SOURCE_WEB)
+        # [THEM MOI] Lich su job da cao (SQLite dung chung, thay cho JobsGo_id_history.txt)
+        self.seen_store = SeenStore(logger=self.logger)
+        # [THEM MOI] Bloom filter dung chung: tin da cao hom nay (bat ky danh muc/nguon nao) -> bo qua
+        self.today_filter = DailyBloomFilter(logger=self.logger)
 
     def _setup_logging(self): 
         """Cau hinh logging."""
@@ -75,29 +94,16 @@ class JobsGoScraper:
         logger.addHandler(console_handler)
 
     def _create_driver(self):
-        """Tao Chrome WebDriver."""
-        chrome_options = Options()
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--disable-infobars")
-        chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--headless=new")
-        return webdriver.Chrome(options=chrome_options)
-
-    def _get_existing_ids(self, file_path):
-        """Doc va tra ve set ID da cao tu file history."""
-        if not os.path.exists(file_path):
-            return set()
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return {line.strip() for line in f if line.strip()}
-        except Exception as e:
-            self.logger.error(f"Loi khi doc file lich su ID {file_path}: {e}")
-            return set()
+        """[THAY DOI] Tao Chrome qua nha may chung (eager load, chan anh/CSS/font/quang cao, cache chromedriver)."""
+        return create_chrome_driver(logger=self.logger)
+
+    def _extract_job_id_from_link(self, link):
+        """Trich xuat ID tu link job JobsGo (vd: .../viec-lam/ten-job-12345.html)."""
+        if not link:
+            return None
+        match = re.search(r'-(\d+)\.html', link)
+        return match.group(1) if match else None
 
-    
-        
     def _get_element_text(self, driver, by, value):
         """Lay text cua element an toan."""
         try:
@@ -114,6 +120,81 @@ class JobsGoScraper:
         except NoSuchElementException:
             return ""
 
+    def _page_title_blocked(self, driver):
+        """[THEM MOI] Kiem tra trang chan qua title; driver loi -> coi nhu khong chan."""
+        try:
+            return looks_blocked(driver.title)
+        except Exception:
+            return False
+
+    def _is_past_last_page(self, driver, page):
+        """
+        [THEM MOI] Bang chung duong tinh het danh sach: trang load xong, khong co card, co thanh phan trang
+        nhung khong co link toi trang >= `page`. Khong doc duoc (driver loi, chua co phan trang) -> False.
+        """
+        try:
+            if driver.execute_script("return document.readyState") != "complete":
+                return False
+            if driver.find_elements(By.XPATH, JOBSGO_CARD_XPATH):
+                return False
+            links = [a.get_attribute("href") or "" for a in driver.find_elements(By.XPATH, JOBSGO_PAGE_LINK_XPATH)]
+        except Exception:
+            return False
+        linked_pages = [int(m.group(1)) for m in (re.search(r"[?&]page=(\d+)", link) for link in links) if m]
+        return bool(linked_pages) and max(linked_pages) < page
+
+    def _scan_listing_page(self, driver, page, queued_ids):
+        """
+        [THEM MOI] Doc 1 trang danh sach. Tra ve (trang_thai, job moi [(link, job_id)], so card, so job bo qua hom nay),
+        trang_thai: 'ok' / 'timeout' (khong doc duoc) / 'empty' (da qua trang cuoi, xem _is_past_last_page).
+        """
+        url = self.LISTING_URL.format(page=page)
+        self.logger.info(f"Dang quet trang {page}: {url}")
+        throttle = self.rate_limiter.adaptive(url, logger=self.logger)
+        try:
+            self.rate_limiter.wait(url)
+            started = time.monotonic()
+            driver.get(url)
+            # [THAY DOI] Doi job card xuat hien + DOM yen, thay cho sleep 2-4s co dinh
+            wait_for_xpaths(driver, [JOBSGO_CARD_XPATH], timeout=20)
+            throttle.record_success(time.monotonic() - started)
+        except TimeoutException:
+            if self._page_title_blocked(driver):
+                throttle.record_failure("trang chan")
+                self.logger.warning(f"Trang {page} bi chan. Bo qua.")
+                return "timeout", [], 0, 0
+            if self._is_past_last_page(driver, page):
+                return "empty", [], 0, 0 # Trang load xong, khong co card va phan trang khong toi trang nay -> het danh sach
+            throttle.record_failure(f"timeout trang {page}")
+            self.logger.warning(f"Trang {page} load qua lau. Bo qua.")
+            return "timeout", [], 0, 0
+
+        job_cards = driver.find_elements(By.XPATH, JOBSGO_CARD_XPATH)
+        if not job_cards:
+            return ("empty" if self._is_past_last_page(driver, page) else "timeout"), [], 0, 0
+
+        new_jobs, skipped_today = [], 0
+        for card in job_cards:
+            try:
+                link_element = card.find_element(By.CSS_SELECTOR, "a")
+                link = link_element.get_attribute("href")
+                job_id = self._extract_job_id_from_link(link)
+
+                if job_key(link) in self.today_filter:
+                    skipped_today += 1 # Da cao hom nay (o danh muc/nguon khac)
+                    continue
+                if job_id and job_id not in queued_ids and not self.seen_store.contains(self.SOURCE_WEB, job_id):
+                    new_jobs.append((link, job_id))
+                    queued_ids.add(job_id)
+            except Exception:
+                continue
+
+        if new_jobs:
+            self.logger.info(f"Trang {page} -> Tim thay {len(new_jobs)} job MOI.")
+        else:
+            self.logger.info(f"Trang {page} khong co job nao moi.")
+        return "ok", new_jobs, len(job_cards), skipped_today
+
     def run(self):
         """Phuong thuc chinh de chay toan bo qua trinh cao du lieu."""
         start_time = time.time()
@@ -127,81 +208,85 @@ class JobsGoScraper:
             writer = csv.writer(f)
             writer.writerow(self.CSV_HEADER)
             
-        try:
-            if not os.path.exists(self.max_page_file):
-                max_page_to_crawl = self.PAGES_TO_ADD_PER_RUN
-                with open(self.max_page_file, 'w') as f: f.write(str(max_page_to_crawl))
-                self.logger.info(f"File max_page.txt khong ton tai. Tao moi va dat trang toi da la {max_page_to_crawl}.")
-            else:
-                with open(self.max_page_file, 'r') as f:
-                    content = f.readline().strip()
-                    if content and content.isdigit():
-                        max_page_to_crawl = int(content)
-                    else:
-                        max_page_to_crawl = self.PAGES_TO_ADD_PER_RUN
-                        self.logger.warning(f"Noi dung file max_page.txt khong hop le. Dat lai trang toi da la {max_page_to_crawl}.")
-        except Exception as e:
-            max_page_to_crawl = self.PAGES_TO_ADD_PER_RUN
-            self.logger.error(f"Loi khi doc file max_page.txt: {e}. Dat lai trang toi da la {max_page_to_crawl}.")
-
-        self.logger.info(f"Lan nay se quet tu trang {self.START_PAGE} -> {max_page_to_crawl}.")
-        
         driver = self._create_driver()
-        existing_ids = self._get_existing_ids(self.id_history_file)
-        self.logger.info(f"Da tim thay {len(existing_ids)} ID jobs trong lich su.")
+        self.seen_store.import_legacy(self.SOURCE_WEB)
+        self.logger.info(f"Da tim thay {self.seen_store.count(self.SOURCE_WEB)} ID jobs trong lich su.")
+        queued_ids = set() # ID da dua vao hang cho trong phien nay
+
+        # [THAY DOI] Bien quet thay cho JobsGo_max_page.txt
+        frontier = CrawlFrontier(
+            self.seen_store, self.SOURCE_WEB, "IT",
+            head_pages=self.HEAD_PAGES, max_head_pages=self.MAX_HEAD_PAGES,
+            backfill_pages=self.BACKFILL_PAGES, revisit_days=self.BACKFILL_REVISIT_DAYS, logger=self.logger,
+        )
+        frontier.seed_from_max_page(self.max_page_file)
+        self.logger.info(f"[Frontier] {frontier.describe()}")
 
         new_jobs_to_crawl = []
-        
-        
-        
-        
-        for page in range(self.START_PAGE, max_page_to_crawl + 1):
-            url = f"https://jobsgo.vn/viec-lam-cong-nghe-thong-tin.html?category=cong-nghe-thong-tin&sort=created&page={page}"
-            
-            self.logger.info(f"Dang quet trang {page}: {url}")
-            try:
-                driver.get(url)
-                WebDriverWait(driver, 20).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.card job-card rounded-3 h-100 p-3")))
-                time.sleep(random.uniform(2, 4))
-            except TimeoutException:
-                self.logger.warning(f"Trang {page} khong ton tai hoac load qua lau. Bo qua.")
-                continue
-            
-            job_cards = driver.find_elements(By.CSS_SELECTOR, "div.card job-card rounded-3 h-100 p-3")
-            if not job_cards:
-                self.logger.warning(f"Trang {page} khong co job nao. Tiep tuc quet trang tiep theo.")
-                continue
-
-            new_jobs_found_on_page = 0
-            for card in job_cards:
-                try:
-                    link_element = card.find_element(By.CSS_SELECTOR, "a")
-                    link = link_element.get_attribute("href")
-                    
-                    
-                    
-                    if job_id :
-                        new_jobs_to_crawl.append((link, job_id)) 
-                        new_jobs_found_on_page += 1
-                except Exception:
-                    continue
-            
-            if new_jobs_found_on_page > 0:
-                self.logger.info(f"Trang {page} -> Tim thay {new_jobs_found_on_page} job MOI.")
-            else:
-                self.logger.info(f"Trang {page} khong co job nao moi.")
-
+        skipped_today = 0
+
+        # 1. Dau danh sach: tin moi nhat
+        page, page_size, new_head_jobs = 1, 0, 0
+        while True:
+            status, new_jobs, cards, skipped = self._scan_listing_page(driver, page, queued_ids)
+            if status == "empty":
+                self.logger.warning(f"Trang {page} khong co job nao.")
+                page -= 1 # Dau danh sach dung o trang truoc
+                break
+            frontier.record_page(page, "head", [job_id for _, job_id in new_jobs], complete=(status == "ok"))
+            new_jobs_to_crawl.extend(new_jobs)
+            skipped_today += skipped
+            new_head_jobs += len(new_jobs)
+            page_size = max(page_size, cards)
+            if not frontier.keep_scanning_head(page, len(new_jobs)):
+                break
+            page += 1
+        head_end = page
+
+        # 2. Cua so bu phia sau
+        backfill = frontier.backfill_range(head_end, new_head_jobs, page_size)
+        if backfill:
+            self.logger.info(f"[Frontier] Bu trang {backfill.start} -> {backfill.stop - 1}.")
+        for page in backfill:
+            status, new_jobs, cards, skipped = self._scan_listing_page(driver, page, queued_ids)
+            if status == "empty":
+                frontier.mark_exhausted(page)
+                break
+            frontier.record_page(page, "backfill", [job_id for _, job_id in new_jobs], complete=(status == "ok"))
+            new_jobs_to_crawl.extend(new_jobs)
+            skipped_today += skipped
+
+        if skipped_today:
+            self.logger.info(f"Bo qua {skipped_today} job da cao hom nay (Bloom filter dung chung).")
         self.logger.info(f"Da thu thap xong. Co {len(new_jobs_to_crawl)} job moi can cao chi tiet.")
 
         success_count, error_count = 0, 0
+        crawled_ids = set()
+        # [THAY DOI] Mo file CSV 1 lan cho ca phien: ghi theo lo + fsync, ID chi vao lich su sau khi dong da xuong dia
+        output_writer = SerializedWriter(output_file, self.seen_store, self.SOURCE_WEB, logger=self.logger)
+        output_writer.start()
         if not new_jobs_to_crawl:
             self.logger.info("Khong co job moi nao de cao. Ket thuc.")
         else:
+            supervisor = DriverSupervisor(
+                self._create_driver,
+                logger=self.logger,
+                max_rss_mb=self.MAX_DRIVER_RSS_MB,
+                max_handles=self.MAX_DRIVER_HANDLES,
+            )
             for idx, (link, job_id) in enumerate(new_jobs_to_crawl, 1):
+                task_error = None
                 try:
-                    driver.get(link)
-                    WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-detail__body")))
-                    time.sleep(random.uniform(2, 5))
+                    throttle = self.rate_limiter.adaptive(link, logger=self.logger)
+                    self.rate_limiter.wait(link)
+                    started = time.monotonic()
+                    try:
+                        driver.get(link)
+                        wait_for_xpaths(driver, [JOBSGO_DETAIL_BODY_XPATH], timeout=15)
+                    except TimeoutException:
+                        throttle.record_failure("trang chan" if looks_blocked(driver.title) else f"timeout job ID {job_id}")
+                        raise
+                    throttle.record_success(time.monotonic() - started)
                     
                     
                     title, salary, experience, level, recruit_quantity, work_form, education = "", "", "", "", "", "", ""
@@ -315,44 +400,44 @@ class JobsGoScraper:
                         linh_vuc
                     ]
                     
-                    # Ghi vao CSV
-                    with open(output_file, "a", encoding="utf-8-sig", newline="") as f:
-                        writer = csv.writer(f)
-                        writer.writerow(job_data)
-
-                    # Ghi vao lich su ID
-                    with open(self.id_history_file, "a", encoding="utf-8") as f:
-                        f.write(job_id + "\n")
+                    # Ghi CSV + lich su ID (cung checkpoint cua output_writer)
+                    output_writer.submit(job_data, job_id)
+                    self.today_filter.add(job_key(link))
                     
+                    crawled_ids.add(job_id)
                     success_count += 1
                     self.logger.info(f"[{success_count}/{len(new_jobs_to_crawl)}] Da cao va luu job ID {job_id}: {title}")
-                    
-                    # Tam nghi
-                    if success_count % self.JOBS_PER_BREAK == 0 and idx < len(new_jobs_to_crawl):
-                        sleep_time = random.uniform(self.BREAK_DURATION_MIN, self.BREAK_DURATION_MAX)
-                        self.logger.info(f"--- Tam nghi {sleep_time/60:.2f} phut ---")
-                        time.sleep(sleep_time)
-
-                    # Khoi dong lai driver
-                    if success_count % self.BATCH_SIZE_RESTART_DRIVER == 0 and idx < len(new_jobs_to_crawl):
-                        self.logger.info("--- Khoi dong lai driver de giai phong bo nho ---")
-                        driver.quit()
-                        time.sleep(5)
-                        driver = self._create_driver()
 
                 except Exception as e:
+                    task_error = e
                     error_count += 1
                     self.logger.error(f"Loi NGHIEM TRONG khi xu ly link {idx}/{len(new_jobs_to_crawl)} (ID: {job_id}): {link} | {e}")
-            
-        driver.quit()
 
-        # 1. Cap nhat max_page
-        new_max_page = max_page_to_crawl + self.PAGES_TO_ADD_PER_RUN
+                # [THAY DOI] Chi tai tao driver khi vuot nguong RAM/handle hoac Chrome bi crash
+                if idx < len(new_jobs_to_crawl):
+                    try:
+                        driver = supervisor.maybe_recycle(driver, label=self.SOURCE_WEB, exc=task_error)
+                    except Exception as e_restart:
+                        self.logger.error(f"Khong the khoi dong lai driver: {e_restart}. Dung cao chi tiet.")
+                        driver = None
+                        break
+            supervisor.report()
+            
+        output_writer.close()
+        output_file = output_writer.output_file # Doi sang .parquet neu SCRAPER_OUTPUT_FORMAT=parquet
+        if driver is not None:
+            driver.quit()
+        self.seen_store.flush()
+        self.today_filter.save()
+
+        # 1. Cap nhat bien quet: trang co job loi/chua cao khong tinh la da quet het
+        for _, job_id in new_jobs_to_crawl:
+            if job_id not in crawled_ids:
+                frontier.record_failure(job_id)
         try:
-            with open(self.max_page_file, "w") as f: f.write(str(new_max_page))
-            self.logger.info(f"Da cap nhat max_page.txt cho lan chay tiep theo: {new_max_page}")
+            frontier.commit()
         except Exception as e:
-            self.logger.error(f"Khong the cap nhat file max_page.txt: {e}")
+            self.logger.error(f"Khong the cap nhat bien quet: {e}")
 
         # 2. Tinh thoi gian chay
         end_time = time.time()
@@ -1,15 +1,10 @@
 # scrapers/topcv_scraper.py
 
-import selenium
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time, random, csv, os, sys, re
+import time, csv, os, sys, re, threading
 from datetime import datetime 
 import logging 
 
@@ -17,16 +12,36 @@ import logging
 project_root_for_import = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root_for_import)
 
+from scrapers.driver_pool import DriverPool
+from scrapers.driver_supervisor import DriverSupervisor
+from scrapers.driver_factory import create_chrome_driver
+from scrapers.throttle import HostRateLimiter, looks_blocked
+from scrapers.output_writer import SerializedWriter
+from scrapers.http_fetch import HttpFetcher, extract_fields, missing_required, row_from_fields
+from scrapers.html_store import HtmlStore
+from scrapers.seen_store import SeenStore
+from scrapers.dedup import DailyBloomFilter, card_keys, job_key
+from scrapers.high_water import HighWaterMark, posted_time
+from scrapers.browser_extract import extract_fields_in_browser, harvest_listing, wait_for_fields, wait_for_listing
+from scrapers.site_specs import TOPCV_DETAIL_SPEC, TOPCV_LISTING_SPEC, TOPCV_REQUIRED_FIELDS
+
 class TopCVScraper:
     def __init__(self):
         """Khoi tao scraper TopCV."""
        
         self.JOB_LIMIT = 100
         
-        self.JOBS_PER_BREAK = 50
-        self.BREAK_DURATION_MIN = 120
-        self.BREAK_DURATION_MAX = 300
-        self.BATCH_SIZE_RESTART_DRIVER = 20
+        # [THAY DOI] Bo nghi dai co dinh (JOBS_PER_BREAK / BREAK_DURATION_*):
+        # toc do duoc dieu tiet AIMD theo do tre va loi (xem AdaptiveThrottle trong scrapers/throttle.py)
+        # [THAY DOI] Bo khoi dong lai driver sau moi 20 job (BATCH_SIZE_RESTART_DRIVER):
+        # DriverSupervisor chi tai tao khi cay tien trinh Chrome vuot nguong RAM/handle hoac bi crash
+        self.MAX_DRIVER_RSS_MB = 1500
+        self.MAX_DRIVER_HANDLES = 5000
+        self.NUM_DRIVERS = 3 # So Chrome driver chay song song o vong cao chi tiet
+        self.FETCH_MODE = "http" # "http": tai bang HTTP truoc, Selenium du phong | "selenium": chi dung Chrome
+        self.SAVE_RAW_HTML = True # [THEM MOI] Luu HTML trang chi tiet vao kho raw_html/ (parse lai: python scrapers/html_store.py parse)
+        # [THEM MOI] Gioi han toc do theo host (token bucket).
+        self.rate_limiter = HostRateLimiter()
         self.SOURCE_WEB = "TopCV"
         
         # Thiet lap duong dan
@@ -37,7 +52,6 @@ class TopCVScraper:
         os.makedirs(self.csv_output_dir, exist_ok=True)
 
         self.log_file = os.path.join(scraper_dir, "TopCV.log")
-        self.id_history_file = os.path.join(scraper_dir, "TopCV_id_history.txt")
     
         self.CSV_HEADER = [
             "CongViec", "ViTri", "YeuCauKinhNghiem", "MucLuong",
@@ -49,6 +63,11 @@ class TopCVScraper:
         
         self._setup_logging()
         self.logger = logging.getLogger(self.SOURCE_WEB)
+        self.html_store = HtmlStore(logger=self.logger) if self.SAVE_RAW_HTML else None
+        # [THEM MOI] Lich su job da cao (SQLite dung chung, thay cho TopCV_id_history.txt)
+        self.seen_store = SeenStore(logger=self.logger)
+        # [THEM MOI] Bloom filter dung chung: tin da cao hom nay (bat ky danh muc/nguon nao) -> bo qua
+        self.today_filter = DailyBloomFilter(logger=self.logger)
 
     def _setup_logging(self): 
         """Cau hinh logging."""
@@ -71,28 +90,9 @@ class TopCVScraper:
         logger.addHandler(console_handler)
 
     def _create_driver(self):
-        """Tao Chrome WebDriver."""
-        chrome_options = Options()
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--disable-infobars")
-        chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--headless=new")
-        return webdriver.Chrome(options=chrome_options)
-
-    def _get_existing_ids(self, file_path):
-        """Doc va tra ve set ID da cao tu file history."""
-        if not os.path.exists(file_path):
-            return set()
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return {line.strip() for line in f if line.strip()}
-        except Exception as e:
-            self.logger.error(f"Loi khi doc file lich su ID {file_path}: {e}")
-            return set()
+        """[THAY DOI] Tao Chrome qua nha may chung (eager load, chan anh/CSS/font/quang cao, cache chromedriver)."""
+        return create_chrome_driver(logger=self.logger)
 
-    # ... (Sau phuong thuc _get_section_details) ...
     def _get_max_page(self, driver):
             """
             [THEM MOI - DA CAP NHAT] Tim trang cuoi cung tu text phan trang.
@@ -101,6 +101,7 @@ class TopCVScraper:
                 # Tai trang 1 (trang mac dinh) de tim max page
                 url = "https://www.topcv.vn/tim-viec-lam-cong-nghe-thong-tin-cr257?sort=newp&page=1&category_family=r257"
                 self.logger.info("Dang tai trang 1 de xac dinh so trang toi da (max_page)...")
+                self.rate_limiter.wait(url)
                 driver.get(url)
                 
                 # Doi cho text phan trang xuat hien (dua theo snippet ban cung cap)
@@ -137,21 +138,56 @@ class TopCVScraper:
         match = re.search(r'/(\d+)\.html', link)
         return match.group(1) if match else None
         
-    def _get_element_text(self, driver, by, value):
-        """Lay text cua element an toan."""
+    def _scrape_job_detail(self, driver, link, job_id):
+        """[THEM MOI] Cao chi tiet 1 job tren driver duoc cap, tra ve 1 dong CSV (21 cot)."""
+        throttle = self.rate_limiter.adaptive(link, logger=self.logger)
+        self.rate_limiter.wait(link)
+        started = time.monotonic()
         try:
-            return driver.find_element(by, value).text.strip()
-        except NoSuchElementException:
-            return ""
+            driver.get(link)
+            # [THAY DOI] Chi ten cong viec la bat buoc; muc khac (vd mo ta) khong co sau khi DOM yen la tin binh thuong
+            absent = wait_for_fields(driver, TOPCV_DETAIL_SPEC, TOPCV_REQUIRED_FIELDS, timeout=15)
+        except TimeoutException:
+            throttle.record_failure("trang chan" if looks_blocked(driver.title) else f"timeout job ID {job_id}")
+            raise
+        throttle.record_success(time.monotonic() - started)
+        if absent:
+            self.logger.info(f"Job ID {job_id} khong co muc {absent}. Van luu.")
+
+        # [THAY DOI] Lay tat ca field trong 1 lan execute_script (thay cho ~18 lenh find_element)
+        fields = extract_fields_in_browser(driver, TOPCV_DETAIL_SPEC)
+        if self.html_store:
+            self.html_store.save(self.SOURCE_WEB, job_id, link, driver.page_source)
+        return self._build_row(fields, link)
+
+    def _scrape_job_detail_http(self, fetcher, link, job_id):
+        """[THEM MOI] Cao chi tiet bang HTTP + lxml. Tra ve None neu thieu field bat buoc (de chuyen sang Selenium)."""
+        throttle = self.rate_limiter.adaptive(link, logger=self.logger)
+        self.rate_limiter.wait(link)
+        document = fetcher.fetch_document(link)
+        if document is not None and looks_blocked(document.findtext(".//title")):
+            throttle.record_failure(f"trang chan (job ID {job_id})")
+            return None
+        throttle.record_status(fetcher.last_status, fetcher.last_latency)
+        if document is None:
+            return None
 
-    def _get_section_details(self, driver, section_title):
-        """Lay noi dung chi tiet cua mot muc (Mo ta, Yeu cau, Quyen loi)."""
-        try:
-            section_elements = driver.find_elements(By.XPATH, f"//h3[contains(text(),'{section_title}')]/following-sibling::div[@class='job-description__item--content']//*")
-            texts = [el.text.strip() for el in section_elements if el.text.strip()]
-            return ". ".join(texts)
-        except NoSuchElementException:
-            return ""
+        fields = extract_fields(document, TOPCV_DETAIL_SPEC)
+        missing = missing_required(fields, TOPCV_REQUIRED_FIELDS)
+        if missing:
+            self.logger.info(f"[HTTP] Job ID {job_id} thieu {missing}. Chuyen sang Selenium.")
+            return None
+
+        if self.html_store:
+            self.html_store.save(self.SOURCE_WEB, job_id, link, fetcher.last_html)
+        return self._build_row(fields, link)
+
+    def _build_row(self, fields, link):
+        """Bo sung cac cot co dinh va sap xep theo CSV_HEADER (21 cot)."""
+        fields["LinkBaiTuyenDung"] = link
+        fields["Nguon"] = self.SOURCE_WEB
+        fields["NgayCaoDuLieu"] = datetime.now().strftime('%Y-%m-%d')
+        return row_from_fields(fields, self.CSV_HEADER)
 
     def run(self):
         """Phuong thuc chinh de chay toan bo qua trinh cao du lieu."""
@@ -167,8 +203,13 @@ class TopCVScraper:
             writer.writerow(self.CSV_HEADER)
             
         driver = self._create_driver()
-        existing_ids = self._get_existing_ids(self.id_history_file)
-        self.logger.info(f"Da tim thay {len(existing_ids)} ID jobs trong lich su.")
+        self.seen_store.import_legacy(self.SOURCE_WEB)
+        self.logger.info(f"Da tim thay {self.seen_store.count(self.SOURCE_WEB)} ID jobs trong lich su.")
+        queued_ids = set() # ID da dua vao hang cho trong phien nay
+        capture_keys = {} # link -> khoa Bloom (job_key + posting_key) ghi lai khi cao xong
+        # [THEM MOI] Moc quet tang dan: dung lat trang khi gap cac tin cu hon moc lan truoc
+        high_water = HighWaterMark(self.seen_store, self.SOURCE_WEB, "IT", logger=self.logger)
+        self.logger.info(f"[HWM] {high_water.describe()}")
 
         # ==========================================================
         # [THEM MOI] Logic tim max page
@@ -182,6 +223,8 @@ class TopCVScraper:
             return None # Thoat som neu khong lay duoc max_page
 
         new_jobs_to_crawl = []
+        skipped_today = 0
+        reached_mark = False
         
         # ==========================================================
         # [THAY DOI] Vong 1: Thu thap Link (Tu dong quet)
@@ -210,17 +253,22 @@ class TopCVScraper:
             else:
                 url = f"https://www.topcv.vn/tim-viec-lam-cong-nghe-thong-tin-cr257?sort=newp&page={page}&category_family=r257"
                 self.logger.info(f"Dang quet trang {page}/{max_page_limit}...")
+                throttle = self.rate_limiter.adaptive(url, logger=self.logger)
                 try:
+                    self.rate_limiter.wait(url)
+                    started = time.monotonic()
                     driver.get(url)
-                    WebDriverWait(driver, 20).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.job-item-search-result")))
-                    time.sleep(random.uniform(2, 4))
+                    wait_for_listing(driver, TOPCV_LISTING_SPEC, timeout=20)
+                    throttle.record_success(time.monotonic() - started)
                 except TimeoutException:
+                    throttle.record_failure("trang chan" if looks_blocked(driver.title) else f"timeout trang {page}")
                     self.logger.warning(f"Trang {page} khong ton tai hoac load qua lau. Bo qua trang nay.")
                     page += 1
                     continue # Tiep tuc vong while
 
             
-            job_cards = driver.find_elements(By.CSS_SELECTOR, "div.job-item-search-result")
+            # [THAY DOI] Lay href + job id + tom tat cua moi card trong 1 lan execute_script
+            job_cards = harvest_listing(driver, TOPCV_LISTING_SPEC, self._extract_job_id_from_link)
             if not job_cards:
                 self.logger.warning(f"Trang {page} khong co job nao. Chuyen trang tiep theo.")
                 page += 1
@@ -232,22 +280,25 @@ class TopCVScraper:
                 if stop_collecting:
                     break # Dung vong 'card'
 
-                try:
-                    link_element = card.find_element(By.CSS_SELECTOR, "h3.title a")
-                    link = link_element.get_attribute("href")
-                    job_id = self._extract_job_id_from_link(link)
-                    
-                    if job_id and (job_id not in existing_ids):
-                        new_jobs_to_crawl.append((link, job_id)) 
-                        existing_ids.add(job_id)
-                        new_jobs_found_on_page += 1
-                        jobs_collected_count += 1 # Tang bo dem tong
-                        
-                        if jobs_collected_count >= self.JOB_LIMIT:
-                            stop_collecting = True
-                            break # Dung vong 'card'
-                except Exception:
+                link, job_id = card["href"], card["job_id"]
+                # [THAY DOI] Danh sach sort=newp (ngay dang), khong theo id: moc so theo thoi gian tren card
+                if high_water.reached(link, job_id, order_value=posted_time(card.get("updated"))):
+                    reached_mark = True
+                    break # Phan con lai cua danh sach da cu hon moc
+                keys = card_keys(card)
+                if any(key in self.today_filter for key in keys):
+                    skipped_today += 1 # Da cao hom nay (o danh muc khac / cung tin tren trang khac)
                     continue
+                if job_id and job_id not in queued_ids and not self.seen_store.contains(self.SOURCE_WEB, job_id):
+                    new_jobs_to_crawl.append((link, job_id)) 
+                    capture_keys[link] = keys
+                    queued_ids.add(job_id)
+                    new_jobs_found_on_page += 1
+                    jobs_collected_count += 1 # Tang bo dem tong
+                    
+                    if jobs_collected_count >= self.JOB_LIMIT:
+                        stop_collecting = True
+                        break # Dung vong 'card'
             
             if new_jobs_found_on_page > 0:
                 self.logger.info(f"Trang {page} -> Tim thay {new_jobs_found_on_page} job MOI. (Tong so job moi: {jobs_collected_count}/{self.JOB_LIMIT})")
@@ -256,11 +307,15 @@ class TopCVScraper:
                 self.logger.info(f"Trang {page} khong co job nao moi.")
                 consecutive_pages_with_no_new_jobs += 1 # Tang
             
-            page += 1 # Chuyen sang trang tiep theo
-            time.sleep(random.uniform(2, 5)) # Them mot khoang nghi nho giua cac trang
+            page += 1 # Chuyen sang trang tiep theo (khoang nghi do rate_limiter quyet dinh)
+            if reached_mark:
+                self.logger.info(f"[HWM] Da gap moc lan quet truoc o trang {page-1}. Dung quet trang.")
+                break
 
         self.logger.info(f"Hoan thanh quet trang (da quet den trang {page-1} / gioi han {max_page_limit}).")
 
+        if skipped_today:
+            self.logger.info(f"Bo qua {skipped_today} job da cao hom nay (Bloom filter dung chung).")
         self.logger.info(f"Da thu thap xong. Co {len(new_jobs_to_crawl)} job moi can cao chi tiet.")
 
         success_count, error_count = 0, 0
@@ -268,159 +323,84 @@ class TopCVScraper:
             self.logger.info("Khong co job moi nao de cao. Ket thuc.")
         else:
             # ==========================================================
-            # Vong 2: Cao chi tiet
+            # Vong 2: Cao chi tiet (Pool N driver song song)
             # ==========================================================
-            for idx, (link, job_id) in enumerate(new_jobs_to_crawl, 1):
-                try:
-                    driver.get(link)
-                    WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.job-detail__body")))
-                    time.sleep(random.uniform(2, 5))
-                    
-                    
-                    title, salary, experience, level, recruit_quantity, work_form, education = "", "", "", "", "", "", ""
-                    deadline_raw, work_location, work_time = "", "", ""
-                    company_name, company_link, company_size = "", "", ""
-                    job_description, requirement, benefits = "", "", ""
-                    gioi_tinh = "" 
-                    linh_vuc = ""
-
-                    # --- Bat dau cao chi tiet (Da khoi phuc dau tieng Viet) ---
-                    try:
-                        title = self._get_element_text(driver, By.CSS_SELECTOR, "h1.job-detail__info--title")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'title' (ID: {job_id}): {e}")
-
-                    try:
-                        salary = self._get_element_text(driver, By.XPATH, "//div[div[contains(text(), 'Mức lương')]]/div[contains(@class, 'value')]")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'salary' (ID: {job_id}): {e}")
-
-                    try:
-                        experience = self._get_element_text(driver, By.XPATH, "//div[div[contains(text(), 'Kinh nghiệm')]]/div[contains(@class, 'value')]")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'experience' (ID: {job_id}): {e}")
-                    
-                    try:
-                        level = self._get_element_text(driver, By.XPATH, "//div[div[contains(text(), 'Cấp bậc')]]/div[contains(@class, 'value')]")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'level' (ID: {job_id}): {e}")
-
-                    try:
-                        recruit_quantity = self._get_element_text(driver, By.XPATH, "//div[div[contains(text(), 'Số lượng tuyển')]]/div[contains(@class, 'value')]")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'recruit_quantity' (ID: {job_id}): {e}")
-
-                    try:
-                        work_form = self._get_element_text(driver, By.XPATH, "//div[div[contains(text(), 'Hình thức làm việc')]]/div[contains(@class, 'value')]")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'work_form' (ID: {job_id}): {e}")
-
-                    try:
-                        education = self._get_element_text(driver, By.XPATH, "//div[div[contains(text(), 'Học vấn')]]/div[contains(@class, 'value')]")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'education' (ID: {job_id}): {e}")
-
-                    try:
-                        deadline_raw = self._get_element_text(driver, By.CSS_SELECTOR, "div.job-detail__info--deadline")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'deadline_raw' (ID: {job_id}): {e}")
-
-                    
-                    try:
-                        work_location = self._get_element_text(driver, By.XPATH, "//div[contains(text(), 'Địa điểm') and contains(@class, 'job-detail__info--section-content-title')]/following-sibling::div")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'work_location' (ID: {job_id}): {e}")
-
-                    try:
-                        work_time = self._get_element_text(driver, By.XPATH,"//h3[contains(text(),'Thời gian làm việc')]/following-sibling::div")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'work_time' (ID: {job_id}): {e}")
-                    
-                    try:
-                        company_name = self._get_element_text(driver, By.CSS_SELECTOR, "a.name")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'company_name' (ID: {job_id}): {e}")
-
-                    try:
-                        if company_name: # Chi thu tim link neu co ten cong ty
-                            company_link = driver.find_element(By.CSS_SELECTOR, ".job-detail__box--right.job-detail__company a").get_attribute("href")
-                    except Exception as e: 
-                        self.logger.warning(f"Loi nho khi cao 'company_link' (ID: {job_id}): {e}")
-                        company_link = "" 
-
-                    try:
-                        company_size = self._get_element_text(driver, By.XPATH, "//div[contains(@class, 'company-scale')]//div[@class='company-value']")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'company_size' (ID: {job_id}): {e}")
-                    try:
-                        linh_vuc = self._get_element_text(driver, By.XPATH, "//div[@class='company-title' and contains(normalize-space(), 'Lĩnh vực:')]/following-sibling::div[@class='company-value']")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'company_field' (ID: {job_id}): {e}")
-                    try:
-                        job_description = self._get_section_details(driver, "Mô tả công việc")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'job_description' (ID: {job_id}): {e}")
-
-                    try:
-                        requirement = self._get_section_details(driver, "Yêu cầu ứng viên")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'requirement' (ID: {job_id}): {e}")
-
-                    try:
-                        benefits = self._get_section_details(driver, "Quyền lợi")
-                    except Exception as e:
-                        self.logger.warning(f"Loi nho khi cao 'benefits' (ID: {job_id}): {e}")
-                    
-                    ngay_cao_hien_tai = datetime.now().strftime('%Y-%m-%d')
-                    
-                    
-                    # ==========================================================
-                    # Ghi du 22 cot vao CSV theo dung thu tu
-                    # ==========================================================
-                    job_data = [
-                        title, work_location, experience, salary,
-                        work_time, gioi_tinh, level, work_form,
-                        company_name, company_link, company_size, recruit_quantity, education,
-                        requirement, job_description, benefits,
-                        deadline_raw.replace('Hạn nộp hồ sơ: ', ''), link, self.SOURCE_WEB, ngay_cao_hien_tai,
-                        linh_vuc
-                    ]
-                    
-                    # Ghi vao CSV
-                    with open(output_file, "a", encoding="utf-8-sig", newline="") as f:
-                        writer = csv.writer(f)
-                        writer.writerow(job_data)
-
-                    # Ghi vao lich su ID
-                    with open(self.id_history_file, "a", encoding="utf-8") as f:
-                        f.write(job_id + "\n")
-                    
-                    success_count += 1
-                    self.logger.info(f"[{success_count}/{len(new_jobs_to_crawl)}] Da cao va luu job ID {job_id}: {title}")
-                    
-                    # [THEM MOI] Kiem tra gioi han 300 job
-                    if success_count >= self.JOB_LIMIT:
+            # Driver cua vong 1 khong con dung nua, pool tu tao driver rieng
+            driver.quit()
+            driver = None
+
+            total_jobs = len(new_jobs_to_crawl)
+            counter_lock = threading.Lock()
+            supervisor = DriverSupervisor(
+                self._create_driver,
+                logger=self.logger,
+                max_rss_mb=self.MAX_DRIVER_RSS_MB,
+                max_handles=self.MAX_DRIVER_HANDLES,
+            )
+            pool = DriverPool(
+                self._create_driver,
+                size=self.NUM_DRIVERS,
+                logger=self.logger,
+                supervisor=supervisor,
+            )
+
+            with SerializedWriter(output_file, self.seen_store, self.SOURCE_WEB, logger=self.logger) as writer:
+
+                def on_result(item, job_data):
+                    nonlocal success_count
+                    link, job_id = item
+                    writer.submit(job_data, job_id)
+                    self.today_filter.add_many(capture_keys.get(link) or [job_key(link)])
+                    with counter_lock:
+                        success_count += 1
+                        current = success_count
+                    self.logger.info(f"[{current}/{total_jobs}] Da cao va luu job ID {job_id}: {job_data[0]}")
+
+                    if current >= self.JOB_LIMIT:
                         self.logger.info(f"Da dat gioi han {self.JOB_LIMIT} job thanh cong. Dung cao chi tiet.")
-                        break # Dung vong 'for idx, (link, job_id)'
-
-                    # Tam nghi
-                    if success_count % self.JOBS_PER_BREAK == 0 and idx < len(new_jobs_to_crawl):
-                        sleep_time = random.uniform(self.BREAK_DURATION_MIN, self.BREAK_DURATION_MAX)
-                        self.logger.info(f"--- Tam nghi {sleep_time/60:.2f} phut ---")
-                        time.sleep(sleep_time)
-
-                    # Khoi dong lai driver
-                    if success_count % self.BATCH_SIZE_RESTART_DRIVER == 0 and idx < len(new_jobs_to_crawl):
-                        self.logger.info("--- Khoi dong lai driver de giai phong bo nho ---")
-                        driver.quit()
-                        time.sleep(5)
-                        driver = self._create_driver()
-
-                except Exception as e:
-                    error_count += 1
-                    self.logger.error(f"Loi NGHIEM TRONG khi xu ly link {idx}/{len(new_jobs_to_crawl)} (ID: {job_id}): {link} | {e}")
-            
-        driver.quit()
+                        pool.stop()
+
+                def on_error(item, e):
+                    nonlocal error_count
+                    link, job_id = item
+                    with counter_lock:
+                        error_count += 1
+                    self.logger.error(f"Loi NGHIEM TRONG khi xu ly link (ID: {job_id}): {link} | {e}")
+
+                # [THEM MOI] Che do HTTP: thu tai bang HTTP truoc, job nao thieu field bat buoc moi dua vao pool Selenium
+                jobs_for_driver = new_jobs_to_crawl
+                if self.FETCH_MODE == "http":
+                    jobs_for_driver = []
+                    with HttpFetcher(logger=self.logger) as fetcher:
+                        for link, job_id in new_jobs_to_crawl:
+                            if success_count >= self.JOB_LIMIT:
+                                break
+                            job_data = self._scrape_job_detail_http(fetcher, link, job_id)
+                            if job_data is None:
+                                jobs_for_driver.append((link, job_id))
+                            else:
+                                on_result((link, job_id), job_data)
+                    self.logger.info(f"[HTTP] Xong {success_count} job bang HTTP, {len(jobs_for_driver)} job can Selenium.")
+
+                if jobs_for_driver and success_count < self.JOB_LIMIT:
+                    pool.run(
+                        jobs_for_driver,
+                        lambda drv, item: self._scrape_job_detail(drv, *item),
+                        on_result=on_result,
+                        on_error=on_error,
+                    )
+                    supervisor.report()
+            output_file = writer.output_file # Doi sang .parquet neu SCRAPER_OUTPUT_FORMAT=parquet
+
+        if driver is not None:
+            driver.quit()
+        # Chi day moc len khi da lay het phan moi (khong bi cat boi JOB_LIMIT, khong co job loi)
+        if jobs_collected_count < self.JOB_LIMIT and success_count == len(new_jobs_to_crawl):
+            high_water.commit()
+        else:
+            self.logger.info("[HWM] Con job moi chua cao xong -> giu nguyen moc cu.")
+        self.seen_store.flush()
+        self.today_filter.save()
 
         # [XOA] Logic cap nhat max_page da bi xoa
         
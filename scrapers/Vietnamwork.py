@@ -1,156 +1,332 @@
 import requests
 import json
 import time
-from datetime import date
-from bs4 import BeautifulSoup # Vẫn cần để dọn dẹp HTML từ API chi tiết
+import csv
+import os
+import sys
+import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# --- 1. ĐỊNH NGHĨA CÁC API ---
+# Them project root vao sys.path de chay doc lap
+project_root_for_import = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root_for_import)
+
+from scrapers.site_specs import CSV_HEADER
+from scrapers.seen_store import SeenStore
+from scrapers.output_writer import SerializedWriter
+from scrapers.throttle import HostRateLimiter
+from scrapers.high_water import HighWaterMark
+from scrapers.html_text import html_to_text, html_to_text_many
 
-# API 1: Lấy DANH SÁCH Job ID nổi bật (GET)
-API_LIST_URL = "https://ms.vietnamworks.com/outstanding-jobs/v2/jobs/filter-outstanding"
+SOURCE_WEB = "VietnamWorks"
+logger = logging.getLogger(SOURCE_WEB)
+
+# --- 1. ĐỊNH NGHĨA CÁC API ---
 
-# API 2: Lấy CHI TIẾT Job từ ID (POST)
+# [THAY DOI] Bỏ API "outstanding" (chỉ trả về vài tin nổi bật): danh sách lẫn chi tiết đều lấy từ API job-search
+# API job-search: tìm kiếm phân trang / lấy CHI TIẾT Job từ ID (POST)
 API_DETAIL_URL = "https://ms.vietnamworks.com/job-search/v1.0/search"
 
+# [THEM MOI] Số job hỏi chi tiết trong 1 lần gọi API (thay cho 1 request / 1 job)
+DETAIL_BATCH_SIZE = 50
+
+# [THEM MOI] Cấu hình crawler trang tìm kiếm (thay cho API "outstanding" chỉ lấy vài tin nổi bật)
+SEARCH_CATEGORY = "IT"
+# Bộ lọc ngành nghề CNTT của trang tìm kiếm (lấy từ F12: parentId 5 = "Công nghệ thông tin", -1 = mọi ngành con)
+SEARCH_FILTER = [{"field": "jobFunction", "value": json.dumps([{"parentId": 5, "childrenIds": [-1]}])}]
+SEARCH_ORDER = [{"field": "approvedOn", "value": "desc"}] # Mới duyệt trước -> dừng được ở mốc lần trước
+SEARCH_HITS_PER_PAGE = 50
+SEARCH_CONCURRENCY = 4 # Số trang gọi song song tối đa
+SEARCH_MAX_PAGES = 200
+API_MAX_RATE = 4.0 # Trần tốc độ (request/giây) AIMD được phép tăng tới cho API
+
+# Headers chúng ta đã tìm thấy ở F12
+API_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "*/*",
+    "Origin": "https://www.vietnamworks.com",
+    "Referer": "https://www.vietnamworks.com/",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
+    "X-Source": "Job-Details"
+}
+
+
+def create_session(pool_size=10, retries=2):
+    """[THEM MOI] 1 requests.Session keep-alive cho cả phiên (không mở TCP/TLS mới cho mỗi job)."""
+    session = requests.Session()
+    session.headers.update(API_HEADERS)
+    # API search chỉ đọc dữ liệu -> retry được cả POST
+    retry = Retry(total=retries, backoff_factor=1, status_forcelist=(500, 502, 504), allowed_methods=("GET", "POST"))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
 # --- 2. HÀM GỌI API CHI TIẾT (Hàm quan trọng nhất) ---
 
-def get_job_details_api(job_id_can_cao):
+def _search(session, rate_limiter, payload):
+    """Gọi API job-search (đã qua rate limiter + AIMD). Trả về list 'data' hoặc None nếu lỗi."""
+    throttle = rate_limiter.adaptive(API_DETAIL_URL, logger=logger, max_rate=API_MAX_RATE)
+    rate_limiter.wait(API_DETAIL_URL)
+    started = time.monotonic()
+    try:
+        response = session.post(API_DETAIL_URL, json=payload, timeout=30)
+    except requests.exceptions.RequestException as e:
+        throttle.record_status(None, time.monotonic() - started)
+        logger.warning(f"[API] Loi khi goi API job-search: {e}")
+        return None
+    throttle.record_status(response.status_code, time.monotonic() - started)
+    if response.status_code != 200:
+        logger.warning(f"[API] job-search tra ve ma {response.status_code}.")
+        return None
+    try:
+        return response.json().get("data") or []
+    except json.JSONDecodeError:
+        logger.warning("[API] Khong the parse JSON cua job-search.")
+        return None
+
+
+def _detail_payload(job_ids):
+    return {
+        "filter": [{"field": "jobId", "value": ",".join(job_ids)}],
+        "hitsPerPage": len(job_ids),
+        "page": 0,
+        "retrieveFields": ["*"]  # Yêu cầu trả về TẤT CẢ thông tin
+    }
+
+
+def _get_one_job_detail(job_id, session, rate_limiter):
+    """Hỏi chi tiết 1 job; chỉ nhận kết quả đúng jobId (API bỏ qua filter thì trả về tin khác)."""
+    for job in _search(session, rate_limiter, _detail_payload([job_id])) or []:
+        if str(job.get("jobId") or "") == job_id:
+            return job
+    logger.warning(f"[API] API chi tiet khong tra ve dung ID: {job_id}")
+    return None
+
+
+def get_job_details_api(job_ids, session, rate_limiter, batch_size=DETAIL_BATCH_SIZE):
     """
-    Sử dụng API POST (job-search) để lấy chi tiết 1 job từ jobId.
+    [THAY DOI] Lấy chi tiết NHIỀU job mỗi lần gọi API (filter jobId nhiều giá trị, nối bằng dấu phẩy).
+    Chỉ nhận các job có jobId nằm trong lô đã hỏi; ID còn thiếu được hỏi lại riêng lẻ.
+    Định dạng filter nhiều giá trị chưa được API xác nhận: nếu lô trả về toàn tin KHÔNG được hỏi
+    (API bỏ qua filter) thì tắt gom lô cho phần còn lại, hỏi từng ID.
+    Trả về dict {jobId (str): dict chi tiết}.
     """
-    
-    # Headers chúng ta đã tìm thấy ở F12
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "*/*",
-        "Origin": "https://www.vietnamworks.com",
-        "Referer": "https://www.vietnamworks.com/",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
-        "X-Source": "Job-Details" 
-    }
-    
-    # Payload yêu cầu chi tiết và lấy tất cả các trường
+    job_ids = [str(job_id) for job_id in job_ids]
+    details = {}
+    batching = batch_size > 1
+    for start in range(0, len(job_ids), batch_size):
+        batch = job_ids[start:start + batch_size]
+        if batching and len(batch) > 1:
+            wanted = set(batch)
+            unexpected = 0
+            for job in _search(session, rate_limiter, _detail_payload(batch)) or []:
+                job_id = str(job.get("jobId") or "")
+                if job_id in wanted:
+                    details[job_id] = job
+                elif job_id:
+                    unexpected += 1
+            if unexpected:
+                logger.warning(f"[API] Lo {len(batch)} ID tra ve {unexpected} job KHONG duoc hoi -> da bo qua.")
+                if not any(job_id in details for job_id in batch):
+                    logger.warning("[API] API khong ho tro filter jobId nhieu gia tri -> hoi tung ID.")
+                    batching = False
+
+        missing = [job_id for job_id in batch if job_id not in details]
+        if missing and len(missing) < len(batch):
+            logger.info(f"[API] Lo {len(batch)} ID thieu {len(missing)} ID -> hoi lai tung ID.")
+        for job_id in missing:
+            job = _get_one_job_detail(job_id, session, rate_limiter)
+            if job is not None:
+                details[job_id] = job
+    return details
+
+# --- 3. CRAWLER TRANG TÌM KIẾM (PHÂN TRANG, SONG SONG) ---
+
+def _search_page(session, rate_limiter, page, hits_per_page):
     payload = {
-        "filter": [
-            # Chuyển ID (dạng string) thành số nguyên nếu cần, 
-            # nhưng API này có vẻ chấp nhận cả string
-            {"field": "jobId", "value": job_id_can_cao} 
-        ],
-        "hitsPerPage": 1,
-        "page": 0,
-        "retrieveFields": ["*"]  # Yêu cầu trả về TẤT CẢ thông tin
+        "query": "",
+        "filter": SEARCH_FILTER,
+        "ranges": [],
+        "order": SEARCH_ORDER,
+        "hitsPerPage": hits_per_page,
+        "page": page,
+        "retrieveFields": ["*"]
     }
+    return _search(session, rate_limiter, payload)
 
-    try:
-        # Gửi yêu cầu POST
-        response = requests.post(API_DETAIL_URL, headers=headers, json=payload)
-        response.raise_for_status() 
-        data = response.json()
-        
-        # Bóc tách dữ liệu (lấy phần tử đầu tiên trong list 'data')
-        if data.get('data') and len(data['data']) > 0:
-            job_details = data['data'][0]
-            return job_details # Trả về 1 dict đầy đủ
+
+def crawl_search(session, rate_limiter, seen_store, concurrency=SEARCH_CONCURRENCY,
+                 hits_per_page=SEARCH_HITS_PER_PAGE, max_pages=SEARCH_MAX_PAGES):
+    """
+    [THEM MOI] Quét API job-search theo trang (mới duyệt trước), tối đa `concurrency` trang cùng lúc.
+    Xử lý kết quả đúng thứ tự trang: bỏ jobId đã có trong lịch sử chung, dừng khi gặp mốc lần quét trước
+    (HighWaterMark) hoặc hết trang. Trả về (dict {jobId: chi tiết} theo thứ tự, HighWaterMark, da_quet_het).
+    """
+    high_water = HighWaterMark(seen_store, SOURCE_WEB, SEARCH_CATEGORY, logger=logger)
+    logger.info(f"[HWM] {high_water.describe()}")
+    found = {}
+    skipped_seen = 0
+    page = 0
+    complete = False # True khi đã đi hết phần mới (gặp mốc/hết trang), không bị lỗi/cắt giữa chừng
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while page < max_pages:
+            wave = list(range(page, min(page + concurrency, max_pages)))
+            results = list(pool.map(lambda p: _search_page(session, rate_limiter, p, hits_per_page), wave))
+            stop = False
+            for current_page, jobs in zip(wave, results):
+                if jobs is None:
+                    logger.warning(f"Trang {current_page} loi -> dung quet (giu nguyen moc cu).")
+                    stop = True
+                    break
+                if not jobs:
+                    logger.info(f"Trang {current_page} rong -> het danh sach.")
+                    stop = complete = True
+                    break
+                new_on_page = 0
+                for job in jobs:
+                    job_id = str(job.get("jobId") or "")
+                    if not job_id:
+                        continue
+                    # [THAY DOI] Kết quả sắp theo approvedOn -> mốc so theo approvedOn; jobId chỉ dùng cho lịch sử (seen_store)
+                    if high_water.reached(job.get("jobUrl", ""), job_id, order_value=job.get("approvedOn")):
+                        logger.info(f"[HWM] Da gap moc lan quet truoc o trang {current_page}. Dung quet.")
+                        stop = complete = True
+                        break
+                    if job_id in found:
+                        continue
+                    if seen_store.contains(SOURCE_WEB, job_id):
+                        skipped_seen += 1
+                        continue
+                    found[job_id] = job
+                    new_on_page += 1
+                logger.info(f"Trang {current_page} -> {new_on_page} job MOI.")
+                if stop:
+                    break
+                if len(jobs) < hits_per_page:
+                    logger.info(f"Trang {current_page} la trang cuoi.")
+                    stop = complete = True
+                    break
+            if stop:
+                break
+            page += concurrency
         else:
-            print(f"   [Lỗi] API chi tiết trả về rỗng cho ID: {job_id_can_cao}")
-            return None
+            logger.warning(f"Da cham gioi han {max_pages} trang.")
 
-    except requests.exceptions.RequestException as e:
-        print(f"   [Lỗi] Khi gọi API chi tiết cho ID {job_id_can_cao}: {e}")
-        return None
-    except json.JSONDecodeError:
-        print(f"   [Lỗi] Không thể parse JSON chi tiết cho ID {job_id_can_cao}")
+    if skipped_seen:
+        logger.info(f"Bo qua {skipped_seen} job da co trong lich su.")
+    return found, high_water, complete
+
+# --- 4. CHUYỂN CHI TIẾT API -> DÒNG CSV 21 CỘT ---
+
+def _join(items, key):
+    return ", ".join(item.get(key, "") for item in items or [] if item and item.get(key))
+
+
+def job_to_row(details, ngay_cao_du_lieu, mo_ta=None, yeu_cau=None):
+    """Bóc tách chi tiết 1 job (dict API) theo đúng thứ tự CSV_HEADER chung. `mo_ta`/`yeu_cau`: text đã làm sạch sẵn (nếu có)."""
+    years = details.get("yearsOfExperience")
+    yeu_cau = yeu_cau if yeu_cau is not None else html_to_text(details.get("jobRequirement", ""))
+    # [THAY DOI] Kỹ năng không phải "Lĩnh vực" (ngành nghề như các nguồn khác) -> ghép vào cuối YeuCauUngVien
+    ky_nang = _join(details.get("skills"), "skillName")
+    if ky_nang:
+        yeu_cau = f"{yeu_cau}\nKỹ năng: {ky_nang}" if yeu_cau else f"Kỹ năng: {ky_nang}"
+    fields = {
+        "CongViec": details.get("jobTitle", ""),
+        "ViTri": _join(details.get("workingLocations") or details.get("locations"), "locationNameVI")
+                 or _join(details.get("locations"), "cityNameVI"),
+        "YeuCauKinhNghiem": f"{years} năm" if years not in (None, "", 0) else "",
+        "MucLuong": details.get("prettySalary", ""),
+        "CapBac": details.get("jobLevelVI") or details.get("jobLevel", ""),
+        "CongTy": details.get("companyName", ""),
+        "LinkCongTy": details.get("companyUrl") or details.get("companyProfileUrl", ""),
+        "QuyMoCongTy": details.get("companySize", ""),
+        "SoLuongTuyen": details.get("numberOfRecruits", ""),
+        "YeuCauUngVien": yeu_cau,
+        "MoTaCongViec": mo_ta if mo_ta is not None else html_to_text(details.get("jobDescription", "")),
+        "QuyenLoi": "; ".join(b.get("benefitValue", "") for b in details.get("benefits") or [] if b and b.get("benefitValue")),
+        "HanNopHoSo": (details.get("expiredOn") or "")[:10],
+        "LinkBaiTuyenDung": details.get("jobUrl", ""),
+        "Nguon": SOURCE_WEB,
+        "NgayCaoDuLieu": ngay_cao_du_lieu,
+        # [THAY DOI] Lĩnh vực = ngành của tin (industriesV3), cùng nghĩa với cột LinhVuc của TopCV/CareerLink/CareerViet
+        "LinhVuc": _join(details.get("industriesV3"), "industryV3NameVI") or _join(details.get("industriesV3"), "industryV3Name"),
+    }
+    return [fields.get(col, "") for col in CSV_HEADER]
+
+
+def write_jobs_csv(details_by_id, seen_store, output_dir=None):
+    """[THEM MOI] Ghi các job vào dataset/VietnamWorks_jobs_<thoi gian>.csv (21 cột) + lịch sử ID. Trả về tên file hoặc None."""
+    if not details_by_id:
         return None
+    output_dir = output_dir or os.path.join(project_root_for_import, "dataset")
+    os.makedirs(output_dir, exist_ok=True)
+    now_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    output_file = os.path.join(output_dir, f"{SOURCE_WEB}_jobs_{now_str}.csv")
+    ngay_cao_du_lieu = datetime.now().strftime('%Y-%m-%d')
 
-# --- 3. HÀM CHẠY CHÍNH ---
+    with open(output_file, "w", encoding="utf-8-sig", newline="") as f:
+        csv.writer(f).writerow(CSV_HEADER)
+    # [THAY DOI] Làm sạch HTML cả lô 1 lần (lxml, lô lớn chạy process pool) thay cho BeautifulSoup từng job
+    items = list(details_by_id.items())
+    texts = html_to_text_many(
+        [details.get("jobDescription", "") for _, details in items] + [details.get("jobRequirement", "") for _, details in items]
+    )
+    with SerializedWriter(output_file, seen_store, SOURCE_WEB, logger=logger) as writer:
+        for idx, (job_id, details) in enumerate(items):
+            try:
+                writer.submit(job_to_row(details, ngay_cao_du_lieu, texts[idx], texts[len(items) + idx]), job_id)
+            except Exception as e:
+                logger.error(f"Loi khi xu ly ID {job_id}: {e}")
+    logger.info(f"Da ghi {writer.rows_written} job vao {os.path.basename(writer.output_file)}.")
+    return os.path.basename(writer.output_file)
 
-def main():
-    ngay_cao_du_lieu = date.today().strftime("%d/%m/%Y")
-    all_full_data = [] # Nơi lưu trữ tất cả dữ liệu đầy đủ
-    
-    # --- BƯỚC 1: LẤY DANH SÁCH ID TỪ API (GET) ---
-    try:
-        response_list = requests.get(API_LIST_URL)
-        response_list.raise_for_status()
-        json_data_list = response_list.json()
-        job_list_summary = json_data_list.get('data', [])
-        
-        if not job_list_summary:
-            print("Lỗi: API danh sách không trả về tin nào.")
-            return
-
-    except Exception as e:
-        print(f"Lỗi khi gọi API danh sách (Bước 1): {e}")
+# --- 5. HÀM CHẠY CHÍNH ---
+
+def _setup_logging():
+    """[THEM MOI] Log ra console khi chay doc lap hoac trong tien trinh con cua scrapers/category_runner.py."""
+    if logger.handlers:
         return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def main(rate_limiter=None):
+    """[THAY DOI] `rate_limiter`: bo gioi han toc do dung chung (category_runner truyen bucket chung theo host)."""
+    _setup_logging()
+    start_time = time.time()
+    rate_limiter = rate_limiter or HostRateLimiter()
+    seen_store = SeenStore(logger=logger)
+    logger.info(f"Lich su co {seen_store.count(SOURCE_WEB)} ID jobs VietnamWorks da cao.")
+
+    with create_session(pool_size=SEARCH_CONCURRENCY) as session:
+        # --- BƯỚC 1: QUÉT TRANG TÌM KIẾM (đã kèm chi tiết nhờ retrieveFields = *) ---
+        details_by_id, high_water, complete = crawl_search(session, rate_limiter, seen_store)
+        logger.info(f"Co {len(details_by_id)} job MOI.")
+
+        # --- BƯỚC 2: Job nào kết quả tìm kiếm thiếu mô tả -> hỏi chi tiết theo lô (POST) ---
+        thieu_chi_tiet = [job_id for job_id, job in details_by_id.items() if not job.get("jobDescription")]
+        if thieu_chi_tiet:
+            logger.info(f"{len(thieu_chi_tiet)} job thieu mo ta -> lay chi tiet theo lo.")
+            details_by_id.update(get_job_details_api(thieu_chi_tiet, session, rate_limiter))
 
-    print(f"--- Bắt đầu cào {len(job_list_summary[:5])} tin (Quy trình 2-API) ---")
-    print(f"Ngày cào: {ngay_cao_du_lieu}\n")
-
-    # --- BƯỚC 2: LẶP QUA DANH SÁCH VÀ LẤY CHI TIẾT TỪNG TIN (POST) ---
-    for i, job_summary in enumerate(job_list_summary[:5]):
-        
-        # Lấy ID từ API danh sách
-        job_id = job_summary.get('id')
-        if not job_id:
-            print(f"--- Bỏ qua tin số {i+1} (Không có ID) ---")
-            continue
-        
-        print(f"==================== Đang lấy tin SỐ {i+1} (ID: {job_id}) ====================")
-
-        try:
-            # GỌI API CHI TIẾT (Hàm chúng ta vừa định nghĩa)
-            details = get_job_details_api(job_id)
-            
-            if not details:
-                print(f"Không tìm thấy chi tiết cho ID: {job_id}\n")
-                continue
-
-            # --- Bóc tách dữ liệu ĐẦY ĐỦ từ API chi tiết (POST) ---
-            tieu_de = details.get('jobTitle', 'N/A')
-            cong_ty = details.get('companyName', 'N/A')
-            luong = details.get('prettySalary', 'N/A')
-            link_job = details.get('jobUrl', 'N/A')
-
-            # Xử lý skills (là list of dicts, ví dụ: [{'skillName': 'SQL'},...])
-            ky_nang_list = details.get('skills', [])
-            ky_nang_sach = ", ".join([s.get('skillName', '') for s in ky_nang_list if s]) if ky_nang_list else "N/A"
-            
-            # Xử lý locations (là list of dicts)
-            dia_diem_list = details.get('locations', [])
-            dia_diem_sach = ", ".join([loc.get('locationNameVI', '') for loc in dia_diem_list if loc]) if dia_diem_list else "N/A"
-
-            # --- DÙNG BEAUTIFULSOUP ĐỂ LÀM SẠCH HTML ---
-            html_mo_ta = details.get('jobDescription', '')
-            html_yeu_cau = details.get('jobRequirement', '')
-            
-            mo_ta_sach = BeautifulSoup(html_mo_ta, "html.parser").get_text(separator=" ", strip=True)
-            yeu_cau_sach = BeautifulSoup(html_yeu_cau, "html.parser").get_text(separator=" ", strip=True)
-
-            # --- In kết quả đầy đủ ---
-            print(f"Tiêu đề: {tieu_de}")
-            print(f"Công ty: {cong_ty}")
-            print(f"Lương: {luong}")
-            print(f"Địa điểm: {dia_diem_sach}")
-            print(f"Kỹ năng: {ky_nang_sach}")
-            print(f"Link: {link_job}")
-            
-            print("\n--- Mô tả công việc (Đầy đủ) ---")
-            print(mo_ta_sach if mo_ta_sach else "(Không có mô tả)")
-            
-            print("\n--- Yêu cầu công việc (Đầy đủ) ---")
-            print(yeu_cau_sach if yeu_cau_sach else "(Không có yêu cầu)")
-            print(f"===========================================================\n")
-
-            # Thêm độ trễ 1 giây để tránh bị block IP
-            time.sleep(1) 
-
-        except Exception as e:
-            print(f"Lỗi khi xử lý ID {job_id}: {e}\n")
-
-    print("--- Hoàn thành ---")
+    output_name = write_jobs_csv(details_by_id, seen_store)
+    # Chỉ đẩy mốc lên khi đã đi hết phần mới và ghi file xong
+    if complete and (output_name or not details_by_id):
+        high_water.commit()
+    else:
+        logger.info("[HWM] Lan quet chua tron ven -> giu nguyen moc cu.")
+    seen_store.close()
+    logger.info(f"Hoan thanh trong {round((time.time() - start_time) / 60, 2)} phut - Da luu {len(details_by_id)} job MOI.")
+    return output_name
 
 
 # --- CHẠY CHƯƠNG TRÌNH ---
 if __name__ == "__main__":
-    
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,200 @@
+# scrapers/browser_extract.py
+
+# ==========================================================
+# [THEM MOI] Trich xuat tat ca field cua 1 trang chi tiet trong 1 lan execute_script.
+# Dung chung spec {cot_csv: (xpath, mode)} voi che do HTTP (scrapers/site_specs.py),
+# nen 2 duong cao (HTTP / Selenium) cho ra text cung dinh dang.
+# ==========================================================
+
+from selenium.common.exceptions import TimeoutException
+
+from scrapers.dedup import canonical_url
+
+# [THEM MOI] Field xac nhan trang chi tiet da nap (ten cong viec); cac muc khac co the khong co tren tin dang
+DETAIL_READY_FIELDS = ("CongViec",)
+
+
+_EXTRACT_JS = """
+const spec = arguments[0];
+const out = {};
+const clean = t => (t || '').replace(/\\s+/g, ' ').trim();
+const block = n => (n.innerText || n.textContent || '').split('\\n').map(clean).filter(Boolean).join('\\n');
+for (const [col, rule] of Object.entries(spec)) {
+    const xpath = rule[0], mode = rule[1];
+    const nodes = [];
+    try {
+        const res = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (let i = 0; i < res.snapshotLength; i++) nodes.push(res.snapshotItem(i));
+    } catch (e) {}
+    let value = '';
+    if (nodes.length) {
+        const first = nodes[0];
+        if (mode === 'section') {
+            value = nodes.map(block).filter(Boolean).join('\\n');
+        } else if (mode === 'href') {
+            value = first.href || first.getAttribute('href') || '';
+        } else if (mode === 'title') {
+            value = (first.getAttribute('title') || '').trim();
+        } else {
+            value = clean(first.innerText || first.textContent);
+            if (mode === 'value' && value.includes(':')) value = value.split(':').pop().trim();
+        }
+    }
+    out[col] = value;
+}
+return out;
+"""
+
+
+def extract_fields_in_browser(driver, spec):
+    """
+    Chay spec ngay trong trinh duyet, tra ve dict {cot_csv: text}.
+    Chi ton 1 round trip WebDriver thay vi 1 find_element cho moi field.
+    """
+    result = driver.execute_script(_EXTRACT_JS, {col: list(rule) for col, rule in spec.items()})
+    return {col: (result or {}).get(col) or "" for col in spec}
+
+
+# ==========================================================
+# [THEM MOI] Thu thap tat ca job card cua 1 trang danh sach trong 1 lan execute_script.
+# Spec danh sach: {"card": xpath_card, "fields": {ten: (xpath_tuong_doi_voi_card, mode)}}
+# (xem *_LISTING_SPEC trong scrapers/site_specs.py).
+# ==========================================================
+
+_HARVEST_JS = """
+const spec = arguments[0];
+const clean = t => (t || '').replace(/\\s+/g, ' ').trim();
+const nodesOf = (xpath, ctx) => {
+    const nodes = [];
+    try {
+        const res = document.evaluate(xpath, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (let i = 0; i < res.snapshotLength; i++) nodes.push(res.snapshotItem(i));
+    } catch (e) {}
+    return nodes;
+};
+return nodesOf(spec.card, document).map(card => {
+    const item = {};
+    for (const [name, rule] of Object.entries(spec.fields)) {
+        const node = nodesOf(rule[0], card)[0];
+        let value = '';
+        if (node) {
+            if (rule[1] === 'href') value = node.href || node.getAttribute('href') || '';
+            else if (rule[1] === 'title') value = (node.getAttribute('title') || '').trim();
+            else value = clean(node.innerText || node.textContent);
+        }
+        item[name] = value;
+    }
+    return item;
+});
+"""
+
+
+def harvest_listing(driver, listing_spec, id_from_link=None):
+    """
+    Tra ve list dict cho moi job card tren trang hien tai: cac field trong spec
+    (href, title, company, salary, location...) va `job_id` (neu co `id_from_link`).
+    Card khong co href bi bo qua.
+    """
+    payload = {
+        "card": listing_spec["card"],
+        "fields": {name: list(rule) for name, rule in listing_spec["fields"].items()},
+    }
+    cards = driver.execute_script(_HARVEST_JS, payload) or []
+    items = []
+    for card in cards:
+        item = {name: (card or {}).get(name) or "" for name in listing_spec["fields"]}
+        if not item.get("href"):
+            continue
+        item["href"] = canonical_url(item["href"]) # Bo tham so theo doi de so khop lich su/Bloom filter
+        item["job_id"] = id_from_link(item["href"]) if id_from_link else None
+        items.append(item)
+    return items
+
+
+# ==========================================================
+# [THEM MOI] Doi trang "san sang" thay cho sleep co dinh + cuon trang tung buoc.
+# Trong 1 lan execute_async_script: MutationObserver + so tai nguyen mang (performance entries)
+# xac dinh DOM/mang da yen; tra ve ngay khi moi XPath can thiet co noi dung va on dinh.
+# Chi cuon trang khi DOM da yen ma field van chua co (noi dung lazy-load).
+# ==========================================================
+
+_READY_JS = """
+const xpaths = arguments[0], optional = arguments[1], timeoutMs = arguments[2], quietMs = arguments[3];
+const maxOptionalScrolls = arguments[4];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+let lastChange = start, lastSig = null, scrolls = 0;
+const observer = new MutationObserver(() => { lastChange = performance.now(); });
+observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+const snapshot = x => {
+    try { return document.evaluate(x, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null); }
+    catch (e) { return null; }
+};
+const finish = (ready, missing) => {
+    observer.disconnect();
+    done({ready: ready, missing: missing, scrolls: scrolls, elapsed: Math.round(performance.now() - start)});
+};
+const check = (list, state) => {
+    const missing = [];
+    list.forEach((x, i) => {
+        const res = snapshot(x);
+        const first = res && res.snapshotLength ? res.snapshotItem(0) : null;
+        const text = first ? (first.textContent || '').trim() : '';
+        if (!first || !(text || (first.getAttribute && first.getAttribute('href')))) missing.push(i);
+        state.sig += (res ? res.snapshotLength : 0) + ':' + text.length + '|';
+    });
+    return missing;
+};
+const tick = () => {
+    const now = performance.now();
+    const state = {sig: ''};
+    const missingRequired = check(xpaths, state);
+    const missingOptional = check(optional, state);
+    const sig = state.sig + performance.getEntriesByType('resource').length;
+    if (sig !== lastSig) { lastSig = sig; lastChange = now; }
+    const quiet = now - lastChange >= quietMs;
+    const present = missingRequired.length === 0;
+    if (present && quiet && (missingOptional.length === 0 || scrolls >= maxOptionalScrolls)) return finish(true, missingOptional);
+    if (now - start >= timeoutMs) return finish(present, missingOptional);
+    if (quiet) { window.scrollBy(0, window.innerHeight); scrolls++; lastChange = now; }
+    setTimeout(tick, 100);
+};
+tick();
+"""
+
+
+def wait_for_xpaths(driver, xpaths, timeout=15, quiet_ms=300, optional=(), max_optional_scrolls=3):
+    """
+    Cho den khi moi XPath trong `xpaths` co node co noi dung va DOM/mang yen `quiet_ms` ms.
+    [THEM MOI] `optional`: XPath cung doi (ke ca cuon de lazy-load), nhung neu DOM da yen va da cuon
+    `max_optional_scrolls` lan ma van khong co thi coi la trang khong co muc do (khong phai timeout).
+    Tra ve dict, `missing` = chi so cac XPath optional khong co.
+    Nem TimeoutException (giong WebDriverWait) neu het `timeout` giay ma `xpaths` van chua san sang.
+    """
+    driver.set_script_timeout(timeout + 5)
+    result = driver.execute_async_script(
+        _READY_JS, list(xpaths), list(optional), int(timeout * 1000), int(quiet_ms), int(max_optional_scrolls)
+    )
+    if not result or not result.get("ready"):
+        raise TimeoutException(f"Trang chua san sang sau {timeout}s: {list(xpaths)}")
+    return result
+
+
+def wait_for_fields(driver, spec, fields, timeout=15, quiet_ms=300, ready_fields=DETAIL_READY_FIELDS):
+    """
+    [THAY DOI] Doi cac cot trong `fields`. Neu `fields` co cot thuoc `ready_fields` (ten cong viec) thi chi cac cot do
+    la bat buoc; cac cot con lai (vd MoTaCongViec) thieu sau khi DOM yen la ket qua binh thuong (tin khong co muc do),
+    khong nem TimeoutException. Tra ve list ten cot khong co tren trang.
+    """
+    required = [col for col in fields if col in ready_fields] or list(fields)
+    optional = [col for col in fields if col not in required]
+    result = wait_for_xpaths(
+        driver, [spec[col][0] for col in required], timeout=timeout, quiet_ms=quiet_ms,
+        optional=[spec[col][0] for col in optional],
+    )
+    return [optional[idx] for idx in result.get("missing") or []]
+
+
+def wait_for_listing(driver, listing_spec, timeout=20, quiet_ms=300):
+    """Doi danh sach job card (listing_spec["card"]) xuat hien va het thay doi."""
+    return wait_for_xpaths(driver, [listing_spec["card"]], timeout=timeout, quiet_ms=quiet_ms)
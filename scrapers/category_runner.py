@@ -0,0 +1,155 @@
+# scrapers/category_runner.py
+
+import argparse
+import importlib
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Them project root vao sys.path de chay doc lap
+project_root_for_import = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root_for_import)
+
+from scrapers.throttle import HostRateLimiter, SharedTokenBucket, host_of
+
+
+# ==========================================================
+# [THEM MOI] Chay moi nguon / danh muc (category, url) song song tren process pool:
+# - Moi danh muc (hoac nguon khong chia danh muc: TopCV, JobsGo, VietnamWorks) 1 tien trinh rieng
+#   (Chrome + Selenium rieng), tong thoi gian ~ nguon cham nhat thay vi tong cac nguon.
+# - Kho job da cao (SeenStore, SQLite WAL) la file dung chung giua cac tien trinh.
+# - Bloom filter trong ngay (scrapers/dedup.py) dong bo qua file co khoa, vai giay 1 lan trong luc cao.
+# - Moi host chi co toi da N danh muc chay cung luc (semaphore theo host, dung chung qua Manager).
+# - Moi host 1 token bucket DUNG CHUNG qua Manager (SharedTokenBucket): tong toc do toi host van dung
+#   DEFAULT_HOST_RATES du bao nhieu danh muc chay, AIMD giam toc o 1 danh muc thi ca host cham lai.
+# ==========================================================
+
+# Danh muc mac dinh theo nguon: (target, [(ten danh muc, url trang 1), ...]).
+# target 'module:Class' (Class(ten danh muc, url) hoac Class() neu ten danh muc la None, roi .run())
+# hoac 'module:ham' (ham(rate_limiter=...)). Url dung de chon host (semaphore + bucket).
+CATEGORY_SETS = {
+    "CareerLink": ("scrapers.Careerlink:CareerLinkScraper", [
+        ("IT_Software", "https://www.careerlink.vn/viec-lam/cntt-phan-mem/19"),
+        ("IT_Hardware_Network", "https://www.careerlink.vn/viec-lam/cntt-phan-cung-mang/130"),
+    ]),
+    "CareerViet": ("scrapers.CareerViet:CareerVietScraper", [
+        ("IT_Software", "https://careerviet.vn/viec-lam/cntt-phan-mem-c1-sortdv-vi.html"),
+        ("IT_Hardware_Network", "https://careerviet.vn/viec-lam/cntt-phan-cung-mang-c63-sortdv-vi.html"),
+    ]),
+    "TopCV": ("scrapers.TopCV:TopCVScraper", [(None, "https://www.topcv.vn/")]),
+    "JobsGo": ("scrapers.JobsGo:JobsGoScraper", [(None, "https://jobsgo.vn/")]),
+    "VietnamWorks": ("scrapers.Vietnamwork:main", [(None, "https://ms.vietnamworks.com/")]),
+}
+
+# So danh muc toi da chay cung luc tren 1 host (chong lan thoi gian render/boc tach, khong tang toc do request:
+# cac danh muc chia nhau token bucket chung cua host).
+DEFAULT_HOST_CONCURRENCY = {
+    "www.careerlink.vn": 2,
+    "careerviet.vn": 2,
+}
+DEFAULT_CONCURRENCY = 2
+
+
+def _run_category(target, category_name, base_url, host_slot, host_buckets):
+    """Chay trong tien trinh con: giu 1 cho cua host roi chay scraper / ham cua nguon voi cac bucket chung theo host."""
+    module_name, attr_name = target.split(":")
+    entry = getattr(importlib.import_module(module_name), attr_name)
+    rate_limiter = HostRateLimiter(buckets=host_buckets)
+    started = time.monotonic()
+    with host_slot:
+        if not isinstance(entry, type):
+            result = entry(rate_limiter=rate_limiter)
+        else:
+            scraper = entry() if category_name is None else entry(category_name, base_url)
+            scraper.rate_limiter = rate_limiter
+            result = scraper.run()
+    return result, time.monotonic() - started
+
+
+def _job_name(target, category_name):
+    """Ten hien thi: '<Class>.<danh muc>', hoac ten module (vd 'TopCV') neu nguon khong chia danh muc."""
+    module_name, attr_name = target.split(":")
+    if category_name is None:
+        return module_name.rsplit(".", 1)[-1]
+    return f"{attr_name}.{category_name}"
+
+
+def run_categories(jobs, max_workers=None, host_concurrency=None, logger=None):
+    """
+    Chay cac danh muc / nguon song song. `jobs` = [(target, ten danh muc hoac None, url), ...] (xem CATEGORY_SETS).
+    Moi host trong DEFAULT_HOST_RATES va trong `jobs` co 1 SharedTokenBucket, truyen cho moi tien trinh.
+    Tra ve dict {'<Class>.<danh muc>' / '<module>': ket qua} (None neu loi).
+    """
+    logger = logger or logging.getLogger("CategoryRunner")
+    host_concurrency = dict(DEFAULT_HOST_CONCURRENCY if host_concurrency is None else host_concurrency)
+    if not jobs:
+        return {}
+
+    results = {}
+    started = time.monotonic()
+    with multiprocessing.Manager() as manager:
+        rates = HostRateLimiter()
+        host_slots, host_buckets = {}, {}
+        for host in list(rates.rates) + [host_of(base_url) for _, _, base_url in jobs]:
+            if host not in host_buckets:
+                host_buckets[host] = SharedTokenBucket.create(manager, rates.rate_for(host))
+        for _, _, base_url in jobs:
+            host = host_of(base_url)
+            if host not in host_slots:
+                host_slots[host] = manager.BoundedSemaphore(host_concurrency.get(host, DEFAULT_CONCURRENCY))
+
+        with ProcessPoolExecutor(max_workers=max_workers or len(jobs)) as pool:
+            futures = {}
+            for target, category_name, base_url in jobs:
+                name = _job_name(target, category_name)
+                host = host_of(base_url)
+                future = pool.submit(_run_category, target, category_name, base_url, host_slots[host], host_buckets)
+                futures[future] = name
+                logger.info(f"[{name}] Da dua vao hang cho ({host_of(base_url)}).")
+
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    result, elapsed = future.result()
+                    results[name] = result
+                    logger.info(f"[{name}] Hoan tat sau {elapsed / 60:.2f} phut. Ket qua: {result}")
+                except Exception as e:
+                    results[name] = None
+                    logger.error(f"[{name}] LOI NGHIEM TRONG: {e}")
+
+    logger.info(f"Da chay {len(jobs)} danh muc / nguon trong {(time.monotonic() - started) / 60:.2f} phut.")
+    return results
+
+
+# ==================================================
+# KHOI CODE DE CHAY DOC LAP
+# ==================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Chay song song cac nguon / danh muc (CareerLink, CareerViet, TopCV, JobsGo, VietnamWorks).")
+    parser.add_argument("sources", nargs="*", default=list(CATEGORY_SETS), help=f"Nguon can chay (mac dinh: {', '.join(CATEGORY_SETS)})")
+    parser.add_argument("--workers", type=int, default=None, help="So tien trinh toi da (mac dinh: so danh muc)")
+    args = parser.parse_args()
+
+    runner_logger = logging.getLogger("CategoryRunner")
+    runner_logger.setLevel(logging.INFO)
+    runner_handler = logging.StreamHandler(sys.stdout)
+    runner_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    runner_logger.addHandler(runner_handler)
+
+    unknown = [source for source in args.sources if source not in CATEGORY_SETS]
+    if unknown:
+        parser.error(f"Nguon khong hop le: {', '.join(unknown)}")
+
+    jobs_to_run = [
+        (target, category_name, base_url)
+        for source in args.sources
+        for target, categories in [CATEGORY_SETS[source]]
+        for category_name, base_url in categories
+    ]
+
+    print(f"--- [BAT DAU] Chay song song {len(jobs_to_run)} danh muc / nguon ({', '.join(args.sources)}) ---")
+    run_categories(jobs_to_run, max_workers=args.workers, logger=runner_logger)
+    print("--- [HOAN TAT] Category runner ---")
@@ -0,0 +1,97 @@
+# scrapers/columnar.py
+
+import csv
+import logging
+import os
+from datetime import date
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError: # pyarrow khong bat buoc: thieu thi giu nguyen file CSV
+    pa = None
+    pq = None
+
+from scrapers.site_specs import CSV_HEADER
+
+
+# ==========================================================
+# [THEM MOI] Dau ra dang cot (Parquet) cho file du lieu cua scraper:
+# - Cot van ban la string (giong dtype=str cua loader, o rong -> NULL), Nguon ma hoa tu dien (it gia tri lap lai).
+# - [THAY DOI] NgayCaoDuLieu luu kieu date32 (ngay YYYY-MM-DD); loader (pipeline/ingest.py) doc lai thanh chuoi ISO.
+# - Nen zstd. Scraper van ghi CSV trong luc cao (an toan khi crash), chuyen sang Parquet khi dong file.
+# ==========================================================
+
+DICTIONARY_COLUMNS = ("Nguon",)
+DATE_COLUMNS = ("NgayCaoDuLieu",)
+PARQUET_COMPRESSION = "zstd"
+
+
+def parquet_schema(columns=None):
+    """Schema Parquet theo CSV_HEADER (hoac header cua file, vd JobsGo co them ChuyenMon)."""
+    columns = list(columns or CSV_HEADER)
+    fields = []
+    for col in columns:
+        if col in DATE_COLUMNS:
+            col_type = pa.date32()
+        elif col in DICTIONARY_COLUMNS:
+            col_type = pa.dictionary(pa.int32(), pa.string())
+        else:
+            col_type = pa.string()
+        fields.append(pa.field(col, col_type))
+    return pa.schema(fields)
+
+
+def _column_array(field, values):
+    """Gia tri string cua 1 cot -> mang Arrow dung kieu cua schema. Ngay sai dinh dang -> ValueError (giu CSV)."""
+    if field.name in DATE_COLUMNS:
+        return pa.array([None if v is None else date.fromisoformat(v.strip()) for v in values], type=pa.date32())
+    if field.name in DICTIONARY_COLUMNS:
+        return pa.array(values, type=pa.string()).dictionary_encode()
+    return pa.array(values, type=pa.string())
+
+
+def parquet_path_for(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def csv_to_parquet(csv_path, remove_csv=True, logger=None):
+    """
+    Chuyen 1 file CSV du lieu (utf-8-sig) sang Parquet canh no. Tra ve duong dan Parquet,
+    hoac None neu khong chuyen duoc (thieu pyarrow / loi) -> giu nguyen CSV cho loader doc.
+    """
+    logger = logger or logging.getLogger(__name__)
+    if pa is None:
+        logger.warning("[Parquet] Chua cai pyarrow. Giu nguyen file CSV.")
+        return None
+    try:
+        with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return None
+            columns = [[] for _ in header]
+            for row in reader:
+                for idx in range(len(header)):
+                    # O rong -> NULL, giong duong doc CSV cua loader (pipeline/ingest.py) -> cung 1 lan cao nap ra nhu nhau
+                    columns[idx].append(row[idx] if idx < len(row) and row[idx] != "" else None)
+
+        schema = parquet_schema(header)
+        arrays = [_column_array(field, values) for field, values in zip(schema, columns)]
+        table = pa.Table.from_arrays(arrays, schema=schema)
+
+        parquet_path = parquet_path_for(csv_path)
+        tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+        pq.write_table(table, tmp_path, compression=PARQUET_COMPRESSION)
+        os.replace(tmp_path, parquet_path) # File chi xuat hien khi da ghi xong -> loader khong doc nham file do dang
+    except Exception as e:
+        logger.error(f"[Parquet] Khong the chuyen {os.path.basename(csv_path)} sang Parquet: {e}. Giu nguyen CSV.")
+        return None
+
+    if remove_csv:
+        try:
+            os.remove(csv_path)
+        except OSError as e:
+            logger.warning(f"[Parquet] Khong xoa duoc {os.path.basename(csv_path)}: {e}")
+    logger.info(f"[Parquet] Da ghi {table.num_rows} dong vao {os.path.basename(parquet_path)}.")
+    return parquet_path
@@ -0,0 +1,268 @@
+# scrapers/dedup.py
+
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+try:
+    import fcntl # Khoa file tren Linux/macOS
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt # Khoa file tren Windows
+except ImportError:
+    msvcrt = None
+
+
+# ==========================================================
+# [THEM MOI] Chuan hoa URL: cung 1 tin tuyen dung -> cung 1 chuoi,
+# du den tu danh muc khac nhau hay co tham so theo doi (utm_*, ta_source...).
+# ==========================================================
+
+TRACKING_PARAMS = {
+    "ref", "source", "src", "from", "gclid", "fbclid", "zarsrc", "ta_source", "u_sr_id",
+    "sr_id", "position", "tracking", "jr_i", "utm", "_ga",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# Mau job id theo host (nhom 1 la id)
+JOB_ID_PATTERNS = {
+    "www.topcv.vn": re.compile(r"/(\d+)\.html"),
+    "www.careerlink.vn": re.compile(r"/(\d+)(?=[/?#]|$)"),
+    "careerviet.vn": re.compile(r"\.([0-9a-fA-F]{6,})\.html"),
+    "jobsgo.vn": re.compile(r"-(\d+)\.html"),
+    "www.vietnamworks.com": re.compile(r"-(\d+)-jv"),
+}
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonical_url(url):
+    """
+    Bo tham so theo doi + fragment, ha chu scheme/host, bo dau '/' cuoi va sap xep query.
+    Tra ve nguyen gia tri neu khong phai URL.
+    """
+    if not url or "://" not in url:
+        return url
+    parts = urlsplit(url.strip())
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def job_key(url):
+    """
+    Khoa duy nhat cua 1 tin: '<host>/<job id>' neu nhan ra mau id cua host,
+    nguoc lai la URL da chuan hoa. Dung cho bo loc trung lap giua cac nguon/danh muc.
+    """
+    url = canonical_url(url)
+    if not url or "://" not in url:
+        return url
+    host = urlsplit(url).netloc
+    pattern = JOB_ID_PATTERNS.get(host)
+    match = pattern.search(url) if pattern else None
+    if match:
+        return f"{host}/{match.group(1).upper().lstrip('0') or '0'}"
+    return url
+
+
+# [THEM MOI] Khoa theo NOI DUNG cho cung 1 tin dang tren nhieu trang (job_key chi nhan ra trong 1 host):
+# ten cong viec + ten cong ty (bo dau, chu thuong, bo loai hinh doanh nghiep, sap xep tu). Chi dung duoc khi card
+# danh sach co ca 2 truong (TopCV, CareerLink, CareerViet; JobsGo chua lay tom tat card).
+_LEGAL_WORDS = re.compile(
+    r"\b(cong ty|cty|tnhh|co phan|cp|mtv|jsc|co ltd|ltd|llc|inc|corp|corporation|company|limited|group|tap doan)\b"
+)
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def _fold_text(text):
+    text = unicodedata.normalize("NFD", (text or "").replace("đ", "d").replace("Đ", "D"))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return " ".join(_NON_ALNUM.sub(" ", text).split())
+
+
+def posting_key(title, company):
+    """Khoa 'posting/<cong ty>/<ten viec>' da chuan hoa, hoac None neu thieu 1 trong 2."""
+    title = _fold_text(title)
+    company = " ".join(sorted(_LEGAL_WORDS.sub(" ", _fold_text(company)).split())) # Khong phu thuoc thu tu tu
+    if not title or not company:
+        return None
+    return f"posting/{company}/{title}"
+
+
+def card_keys(card):
+    """Cac khoa de kiem tra/ghi vao Bloom filter cho 1 card danh sach: job_key(href) + posting_key (neu co)."""
+    keys = [job_key(card["href"])]
+    key = posting_key(card.get("title"), card.get("company"))
+    if key:
+        keys.append(key)
+    return keys
+
+
+@contextmanager
+def _file_lock(lock_path, timeout=60):
+    """Khoa doc quyen giua cac tien trinh bang 1 file .lock (fcntl / msvcrt)."""
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            return
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# ==========================================================
+# [THEM MOI] Bloom filter: kiem tra "da cao hom nay chua" voi bo nho co dinh.
+# Co the bao nham "da co" voi xac suat `error_rate`, khong bao gio bao nham "chua co".
+# ==========================================================
+
+class BloomFilter:
+    def __init__(self, capacity=200_000, error_rate=0.001):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        with self._lock:
+            for pos in self._positions(key):
+                self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def merge_bytes(self, data):
+        """OR voi bit cua 1 filter khac cung kich thuoc (vd: filter tren dia do tien trinh khac ghi)."""
+        if len(data) != len(self.bits):
+            return False
+        with self._lock:
+            merged = int.from_bytes(self.bits, "little") | int.from_bytes(data, "little")
+            self.bits = bytearray(merged.to_bytes(len(data), "little"))
+        return True
+
+
+class DailyBloomFilter(BloomFilter):
+    """
+    Bloom filter cua ngay hom nay, luu o scrapers/bloom/<YYYY-mm-dd>.bloom va dung chung
+    cho moi scraper/danh muc (ke ca cac tien trinh cua scrapers/category_runner.py).
+    [THAY DOI] `sync()` (giu khoa file <ngay>.bloom.lock): gop bit tren dia + ghi bit moi cua minh.
+    Tu goi khi kiem tra/them khoa neu lan sync truoc da qua `sync_interval` giay
+    -> danh muc chay song song thay tin cua nhau trong luc cao, khong chi luc bat dau.
+    """
+
+    def __init__(self, directory=None, day=None, logger=None, sync_interval=10, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory or os.path.join(os.path.dirname(os.path.abspath(__file__)), "bloom")
+        self.day = day or datetime.now().strftime("%Y-%m-%d")
+        self.path = os.path.join(self.directory, f"{self.day}.bloom")
+        self.logger = logger or logging.getLogger(__name__)
+        self.sync_interval = sync_interval
+        self._dirty = False
+        self._disk_stamp = None # (mtime_ns, size) lan doc/ghi cuoi -> khong doc lai neu file khong doi
+        self._last_sync = 0.0
+        self._sync_lock = threading.Lock()
+        self.sync()
+
+    def __contains__(self, key):
+        self._maybe_sync()
+        return super().__contains__(key)
+
+    def add(self, key):
+        super().add(key)
+        self._dirty = True
+        self._maybe_sync()
+
+    def add_many(self, keys):
+        for key in keys:
+            BloomFilter.add(self, key)
+        self._dirty = True
+        self._maybe_sync()
+
+    def _maybe_sync(self):
+        if time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self):
+        """Gop bit tren dia (goi khi dang giu khoa file). Bo qua neu file khong doi tu lan truoc."""
+        stamp = self._stamp()
+        if stamp is None or stamp == self._disk_stamp:
+            return
+        with open(self.path, "rb") as f:
+            if not self.merge_bytes(f.read()):
+                self.logger.warning(f"[Bloom] Kich thuoc {os.path.basename(self.path)} khong khop. Bo qua file cu.")
+        self._disk_stamp = stamp
+
+    def _replace(self, tmp_path):
+        # Windows: file dich co the dang bi tien trinh khac (antivirus, indexer) mo -> thu lai vai lan
+        for attempt in range(5):
+            try:
+                os.replace(tmp_path, self.path)
+                return
+            except PermissionError:
+                if attempt == 4:
+                    raise
+                time.sleep(0.2 * (attempt + 1))
+
+    def sync(self):
+        with self._sync_lock:
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with _file_lock(f"{self.path}.lock"):
+                    self.load() # Gop them tin do tien trinh khac vua ghi
+                    if self._dirty:
+                        self._dirty = False
+                        with open(tmp_path, "wb") as f:
+                            f.write(bytes(self.bits))
+                        self._replace(tmp_path)
+                        self._disk_stamp = self._stamp()
+            except OSError as e:
+                self._dirty = True # Lan sync sau ghi lai
+                self.logger.warning(f"[Bloom] Khong dong bo duoc {self.path}: {e}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            self._last_sync = time.monotonic()
+
+    def save(self):
+        """Ghi not bit moi len dia (goi luc ket thuc phien)."""
+        self.sync()
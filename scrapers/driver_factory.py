@@ -0,0 +1,111 @@
+# scrapers/driver_factory.py
+
+import logging
+import os
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import SessionNotCreatedException
+
+
+# ==========================================================
+# [THEM MOI] Nha may tao Chrome driver dung chung cho moi scraper:
+# - page_load_strategy "eager": driver.get() tra ve ngay khi DOM san sang (khong doi anh/font/quang cao).
+# - Chan tai nguyen khong phai tai lieu (anh, CSS, font, media, analytics/quang cao) qua CDP.
+# - Chi tim duong dan chromedriver 1 lan (luu vao file), khong goi ChromeDriverManager().install() moi lan mo.
+# ==========================================================
+
+BLOCKED_URL_PATTERNS = [
+    # Anh / font / CSS / media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp", "*.avif",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*.css",
+    "*.mp4", "*.webm", "*.mp3",
+    # Analytics / quang cao / mang xa hoi
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*facebook.com/tr*", "*connect.facebook.net*", "*hotjar.com*", "*clarity.ms*",
+    "*tiktok.com*", "*criteo.com*", "*adservice.google.com*",
+]
+
+CHROMEDRIVER_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chromedriver_path.txt")
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def _read_cached_path():
+    env_path = os.environ.get("CHROMEDRIVER_PATH")
+    if env_path and os.path.exists(env_path):
+        return env_path
+    try:
+        with open(CHROMEDRIVER_CACHE_FILE, "r", encoding="utf-8") as f:
+            path = f.read().strip()
+        return path if path and os.path.exists(path) else None
+    except OSError:
+        return None
+
+
+def chromedriver_path(logger=None, refresh=False):
+    """
+    Duong dan chromedriver, tim 1 lan cho ca tien trinh (va luu file cho lan chay sau).
+    Tra ve None neu khong tim duoc -> de Selenium Manager tu xu ly.
+    """
+    global _driver_path
+    logger = logger or logging.getLogger(__name__)
+    with _driver_path_lock:
+        if _driver_path and not refresh:
+            return _driver_path
+        path = None if refresh else _read_cached_path()
+        if path is None:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+                path = ChromeDriverManager().install()
+                with open(CHROMEDRIVER_CACHE_FILE, "w", encoding="utf-8") as f:
+                    f.write(path)
+            except Exception as e:
+                logger.warning(f"[Driver] Khong tim duoc chromedriver qua webdriver_manager: {e}. Dung Selenium Manager.")
+                path = None
+        _driver_path = path
+        return path
+
+
+def _chrome_options(page_load_strategy, headless, block_resources):
+    chrome_options = Options()
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--disable-infobars")
+    chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.page_load_strategy = page_load_strategy
+    if block_resources:
+        # Tat anh ngay tu profile (du phong neu CDP khong chan duoc)
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return chrome_options
+
+
+def create_chrome_driver(logger=None, page_load_strategy="eager", block_resources=True, headless=True):
+    """Tao Chrome WebDriver theo cau hinh chung (xem dau file)."""
+    logger = logger or logging.getLogger(__name__)
+    chrome_options = _chrome_options(page_load_strategy, headless, block_resources)
+
+    path = chromedriver_path(logger)
+    try:
+        driver = webdriver.Chrome(service=Service(path) if path else Service(), options=chrome_options)
+    except SessionNotCreatedException:
+        if path is None:
+            raise
+        # chromedriver da luu khong con hop voi ban Chrome (vd Chrome vua cap nhat) -> tim lai 1 lan
+        logger.warning("[Driver] chromedriver da luu khong tuong thich. Tim lai duong dan...")
+        path = chromedriver_path(logger, refresh=True)
+        driver = webdriver.Chrome(service=Service(path) if path else Service(), options=chrome_options)
+
+    if block_resources:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            logger.warning(f"[Driver] Khong bat duoc chan tai nguyen qua CDP: {e}")
+    return driver
@@ -0,0 +1,109 @@
+# scrapers/driver_pool.py
+
+import queue
+import random
+import threading
+import time
+import logging
+
+
+class DriverPool:
+    """
+    [THEM MOI] Pool gioi han N Chrome driver chay song song cho vong cao chi tiet.
+    Moi driver nghi dai sau moi `jobs_per_break` job (neu co). [THAY DOI] Viec tai tao driver
+    do `supervisor` (DriverSupervisor) quyet dinh theo RAM/handle/crash, khong con theo so job co dinh.
+    """
+
+    def __init__(self, create_driver, size, logger=None,
+                 supervisor=None, jobs_per_break=None, break_duration=(0, 0)):
+        self.create_driver = create_driver
+        self.size = max(1, int(size))
+        self.logger = logger or logging.getLogger(__name__)
+        self.supervisor = supervisor
+        self.jobs_per_break = jobs_per_break
+        self.break_duration = break_duration
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Bao cho cac worker dung lay job moi (job dang chay van duoc hoan thanh)."""
+        self._stop_event.set()
+
+    def run(self, items, task, on_result=None, on_error=None):
+        """
+        Chay `task(driver, item)` cho tung item tren N driver.
+        `on_result(item, result)` / `on_error(item, exc)` duoc goi ngay trong thread worker.
+        """
+        work_queue = queue.Queue()
+        for item in items:
+            work_queue.put(item)
+
+        worker_count = min(self.size, work_queue.qsize()) or 1
+        self.logger.info(f"Khoi dong pool {worker_count} driver cho {work_queue.qsize()} job.")
+
+        threads = []
+        for worker_id in range(1, worker_count + 1):
+            t = threading.Thread(
+                target=self._worker,
+                args=(worker_id, work_queue, task, on_result, on_error),
+                name=f"driver-{worker_id}",
+                daemon=True,
+            )
+            t.start()
+            threads.append(t)
+
+        for t in threads:
+            t.join()
+
+    def _worker(self, worker_id, work_queue, task, on_result, on_error):
+        """Vong lap cua mot driver: lay job tu queue cho den khi het hoac bi stop."""
+        try:
+            driver = self.create_driver()
+        except Exception as e:
+            self.logger.error(f"[driver-{worker_id}] Khong the khoi tao driver: {e}")
+            return
+
+        done_count = 0
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    item = work_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                task_error = None
+                try:
+                    result = task(driver, item)
+                    if on_result:
+                        on_result(item, result)
+                except Exception as e:
+                    task_error = e
+                    if on_error:
+                        on_error(item, e)
+                    else:
+                        self.logger.error(f"[driver-{worker_id}] Loi khi xu ly {item}: {e}")
+                finally:
+                    done_count += 1
+
+                if work_queue.empty() or self._stop_event.is_set():
+                    continue
+
+                # Tam nghi (theo tung driver)
+                if self.jobs_per_break and done_count % self.jobs_per_break == 0:
+                    sleep_time = random.uniform(*self.break_duration)
+                    self.logger.info(f"[driver-{worker_id}] --- Tam nghi {sleep_time/60:.2f} phut ---")
+                    time.sleep(sleep_time)
+
+                # [THAY DOI] Chi tai tao driver khi vuot nguong RAM/handle hoac phien Chrome da crash
+                if self.supervisor is not None:
+                    try:
+                        driver = self.supervisor.maybe_recycle(driver, label=f"driver-{worker_id}", exc=task_error)
+                    except Exception as e:
+                        self.logger.error(f"[driver-{worker_id}] Khong the khoi dong lai driver: {e}. Dung worker.")
+                        driver = None
+                        break
+        finally:
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
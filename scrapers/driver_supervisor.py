@@ -0,0 +1,109 @@
+# scrapers/driver_supervisor.py
+
+import logging
+import threading
+
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, WebDriverException
+
+try:
+    import psutil
+except ImportError: # psutil khong bat buoc: thieu thi chi tai tao driver khi bi crash
+    psutil = None
+
+
+# Dau hieu phien Chrome da chet (trong message cua WebDriverException)
+CRASH_MARKERS = (
+    "invalid session id", "session deleted", "chrome not reachable", "disconnected",
+    "tab crashed", "target window already closed", "no such window", "connection refused",
+)
+
+
+def driver_tree_stats(driver):
+    """
+    Tong RSS (MB), so handle/file descriptor va so tien trinh cua chromedriver + toan bo cay Chrome con.
+    Tra ve None neu khong do duoc (khong co psutil, driver khong chay local...).
+    """
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+
+    rss, handles, alive = 0, 0, 0
+    for proc in processes:
+        try:
+            rss += proc.memory_info().rss
+            handles += proc.num_handles() if hasattr(proc, "num_handles") else proc.num_fds()
+            alive += 1
+        except psutil.Error:
+            continue # Tien trinh con vua thoat
+    return {"rss_mb": rss / (1024 * 1024), "handles": handles, "processes": alive}
+
+
+class DriverSupervisor:
+    """
+    [THEM MOI] Giam sat Chrome driver thay cho khoi dong lai co dinh sau N job.
+    Chi tai tao driver khi: RSS cua cay tien trinh > `max_rss_mb`, so handle > `max_handles`,
+    hoac phien Chrome da crash. Dem so lan tai tao theo ly do de bao cao cuoi phien.
+    """
+
+    def __init__(self, create_driver, logger=None, max_rss_mb=1500, max_handles=5000):
+        self.create_driver = create_driver
+        self.logger = logger or logging.getLogger(__name__)
+        self.max_rss_mb = max_rss_mb
+        self.max_handles = max_handles
+        self.recycle_counts = {"memory": 0, "handles": 0, "crash": 0}
+        self._lock = threading.Lock()
+        if psutil is None:
+            self.logger.warning("[Driver] Chua cai psutil: khong do duoc RAM, chi tai tao driver khi bi crash.")
+
+    def is_crash(self, exc):
+        """Loi nay co nghia la phien Chrome da chet (can tao driver moi) khong."""
+        if isinstance(exc, (InvalidSessionIdException, NoSuchWindowException)):
+            return True
+        if isinstance(exc, WebDriverException):
+            message = (exc.msg or str(exc)).lower()
+            return any(marker in message for marker in CRASH_MARKERS)
+        return False
+
+    def check(self, driver):
+        """Tra ve ly do can tai tao ('memory' / 'handles' / 'crash') hoac None neu driver con tot."""
+        process = getattr(getattr(driver, "service", None), "process", None)
+        if process is not None and process.poll() is not None:
+            return "crash"
+        stats = driver_tree_stats(driver)
+        if stats is None:
+            return None
+        if self.max_rss_mb and stats["rss_mb"] > self.max_rss_mb:
+            return "memory"
+        if self.max_handles and stats["handles"] > self.max_handles:
+            return "handles"
+        return None
+
+    def recycle(self, driver, reason, label="driver"):
+        """Dong driver cu (neu con) va tao driver moi. Nem loi neu khong tao duoc."""
+        stats = driver_tree_stats(driver) if reason != "crash" else None
+        detail = f" (RSS {stats['rss_mb']:.0f} MB, {stats['handles']} handle, {stats['processes']} tien trinh)" if stats else ""
+        self.logger.info(f"[{label}] --- Tai tao driver, ly do: {reason}{detail} ---")
+        with self._lock:
+            self.recycle_counts[reason] = self.recycle_counts.get(reason, 0) + 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        return self.create_driver()
+
+    def maybe_recycle(self, driver, label="driver", exc=None):
+        """Goi sau moi job: tra ve driver (cu neu con tot, moi neu da tai tao)."""
+        reason = "crash" if exc is not None and self.is_crash(exc) else self.check(driver)
+        if reason is None:
+            return driver
+        return self.recycle(driver, reason, label)
+
+    def report(self):
+        total = sum(self.recycle_counts.values())
+        counts = ", ".join(f"{reason}: {count}" for reason, count in self.recycle_counts.items())
+        self.logger.info(f"[Driver] Tai tao driver {total} lan ({counts}).")
+        return dict(self.recycle_counts)
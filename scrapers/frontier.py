@@ -0,0 +1,117 @@
+# scrapers/frontier.py
+
+import logging
+import os
+from datetime import datetime, timedelta
+
+
+class CrawlFrontier:
+    """
+    [THEM MOI] Bien quet cho 1 danh sach sap xep moi nhat truoc (vd JobsGo sort=created).
+    Moi lan chay chi quet:
+      - Dau danh sach: `head_pages` trang dau, keo dai them (toi da `max_head_pages`) khi trang van con job moi.
+      - Cua so bu (backfill): `backfill_pages` trang ngay sau trang sau nhat da quet het lan truoc.
+    Tin moi dang len day tin cu xuong duoi -> vi tri bu duoc dich them theo so job moi o dau danh sach.
+    Khi bu toi cuoi danh sach (trang rong), dung bu va chi quay lai tu dau sau `revisit_days` ngay.
+    Trang thai luu trong SeenStore (bang crawl_frontier + drained_pages).
+    """
+
+    def __init__(self, seen_store, source, listing, head_pages=2, max_head_pages=10,
+                 backfill_pages=3, revisit_days=7, logger=None):
+        self.seen_store = seen_store
+        self.source = source
+        self.listing = listing
+        self.head_pages = head_pages
+        self.max_head_pages = max_head_pages
+        self.backfill_pages = backfill_pages
+        self.revisit_days = revisit_days
+        self.logger = logger or logging.getLogger(__name__)
+        self.state = seen_store.get_frontier(source, listing)
+        self._pages = {} # page -> {"kind", "job_ids", "complete"}
+        self._failed_ids = set()
+        self._exhausted_page = None
+
+    def seed_from_max_page(self, max_page_file):
+        """Lan dau: coi cac trang 1..N trong file max_page cu la da quet (khong quet lai tu dau)."""
+        if self.state is not None or not os.path.exists(max_page_file):
+            return
+        try:
+            with open(max_page_file, "r") as f:
+                content = f.readline().strip()
+        except OSError:
+            return
+        if content.isdigit():
+            self.state = {"backfill_page": int(content), "exhausted_at": None, "updated_at": None}
+            self.logger.info(f"[Frontier] Khoi tao tu {os.path.basename(max_page_file)}: da quet den trang {content}.")
+
+    def describe(self):
+        if not self.state:
+            return "chua co bien quet (lan dau)"
+        done = f", da bu het danh sach luc {self.state['exhausted_at']}" if self.state["exhausted_at"] else ""
+        return f"da bu den trang {self.state['backfill_page']}{done}"
+
+    def keep_scanning_head(self, page, new_jobs_on_page):
+        """Sau khi quet trang dau danh sach `page`: co quet tiep trang `page + 1` nhu 1 trang dau khong."""
+        if page < self.head_pages:
+            return True
+        return new_jobs_on_page > 0 and page < self.max_head_pages
+
+    def backfill_range(self, head_end, new_head_jobs, page_size):
+        """
+        Cac trang bu cho lan nay (co the rong).
+        `head_end`: trang cuoi vua quet o dau danh sach; `new_head_jobs`/`page_size` de tinh do dich trang.
+        """
+        if not self.state:
+            start = head_end + 1
+        elif self.state["exhausted_at"]:
+            exhausted_at = datetime.strptime(self.state["exhausted_at"], "%Y-%m-%d %H:%M:%S")
+            if datetime.now() - exhausted_at < timedelta(days=self.revisit_days):
+                return range(0)
+            self.logger.info(f"[Frontier] Da qua {self.revisit_days} ngay tu lan bu het danh sach -> bu lai tu dau.")
+            self.state = {"backfill_page": head_end, "exhausted_at": None, "updated_at": None}
+            start = head_end + 1
+        else:
+            # Lam tron xuong: chap nhan doc lai 1 phan trang hon la bo sot tin
+            shift = new_head_jobs // page_size if page_size else 0
+            start = max(head_end, self.state["backfill_page"] + shift) + 1
+        return range(start, start + self.backfill_pages)
+
+    def record_page(self, page, kind, job_ids, complete=True):
+        """Ghi nhan 1 trang da doc (`kind` = 'head'/'backfill'); `complete=False` neu trang loi/khong doc het."""
+        self._pages[page] = {"kind": kind, "job_ids": list(job_ids), "complete": complete}
+
+    def record_failure(self, job_id):
+        """Job chi tiet bi loi -> trang chua no khong tinh la da quet het."""
+        self._failed_ids.add(job_id)
+
+    def mark_exhausted(self, page):
+        """Trang bu `page` khong con job nao -> da toi cuoi danh sach."""
+        self._exhausted_page = page
+        self.logger.info(f"[Frontier] Trang {page} rong -> da bu het danh sach {self.listing}.")
+
+    def _drained(self, page):
+        info = self._pages.get(page)
+        return bool(info) and info["complete"] and not (set(info["job_ids"]) & self._failed_ids)
+
+    def commit(self):
+        """Luu cac trang da quet het va day vi tri bu toi trang bu lien tiep cuoi cung da quet het."""
+        drained = [(page, info["kind"], len(info["job_ids"])) for page, info in sorted(self._pages.items()) if self._drained(page)]
+        backfill = sorted(page for page, info in self._pages.items() if info["kind"] == "backfill")
+        head = [page for page, info in self._pages.items() if info["kind"] == "head"]
+
+        cursor = self.state["backfill_page"] if self.state else 0
+        if backfill:
+            cursor = max(cursor, backfill[0] - 1)
+            for page in backfill:
+                if not self._drained(page):
+                    break
+                cursor = page
+        elif not self.state and head:
+            cursor = max(head) # Lan dau nhung khong co cua so bu: bat dau bu ngay sau dau danh sach
+
+        exhausted_at = self.state["exhausted_at"] if self.state else None
+        if self._exhausted_page is not None and cursor >= self._exhausted_page - 1:
+            exhausted_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        self.seen_store.set_frontier(self.source, self.listing, cursor, exhausted_at, drained)
+        self.logger.info(f"[Frontier] Da quet het {len(drained)}/{len(self._pages)} trang. Lan sau bu tu trang {cursor + 1}.")
@@ -0,0 +1,144 @@
+# scrapers/high_water.py
+
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+
+from scrapers.dedup import job_key
+
+
+# [THEM MOI] Thoi gian dang/cap nhat tren card ("Cap nhat 3 gio truoc", "15/01/2025") -> moc theo ngay dang
+_RELATIVE_UNITS = {
+    "giây": timedelta(seconds=1), "phút": timedelta(minutes=1), "giờ": timedelta(hours=1),
+    "ngày": timedelta(days=1), "tuần": timedelta(weeks=1), "tháng": timedelta(days=30), "năm": timedelta(days=365),
+}
+_RELATIVE_RE = re.compile(r"(\d+)\s*(" + "|".join(_RELATIVE_UNITS) + r")\s*trước", re.IGNORECASE)
+_DATE_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+
+def posted_time(text, now=None):
+    """
+    Chuoi thoi gian tren card -> chuoi ISO (dung lam `order_value` cua HighWaterMark).
+    Khong doc duoc -> "" (HighWaterMark chi so theo cac tin dau trang lan truoc, khong so id).
+    """
+    text = (text or "").strip().lower()
+    now = now or datetime.now()
+    match = _RELATIVE_RE.search(text)
+    if match:
+        return (now - int(match.group(1)) * _RELATIVE_UNITS[match.group(2)]).isoformat(timespec="seconds")
+    if "vừa" in text or "hôm nay" in text:
+        return now.isoformat(timespec="seconds")
+    if "hôm qua" in text:
+        return (now - timedelta(days=1)).isoformat(timespec="seconds")
+    match = _DATE_RE.search(text)
+    if match:
+        day, month, year = (int(part) for part in match.groups())
+        try:
+            return datetime(year, month, day).isoformat(timespec="seconds")
+        except ValueError:
+            return ""
+    return ""
+
+
+class HighWaterMark:
+    """
+    [THEM MOI] Moc quet tang dan cho 1 nguon/danh muc (danh sach sap xep moi nhat truoc).
+    Luu job id lon nhat + cac tin dau trang cua lan quet truoc (trong SeenStore).
+    Lan sau gap `stop_run` card lien tiep cu hon moc -> dung lat trang
+    (dung 1 chuoi card, khong phai 1 card, de tin ghim/quang cao cu o dau trang khong lam dung som).
+    [THAY DOI] Danh sach khong sap theo id (vd VietnamWorks sap theo approvedOn, TopCV sap theo ngay dang):
+    truyen `order_value` (thoi diem ISO, "" neu card khong co) vao reached() -> moc la gia tri moi nhat do,
+    id khong dung de so sanh; card khong co thoi gian chi la "cu" khi nam trong cac tin dau trang lan truoc.
+    """
+
+    def __init__(self, seen_store, source, category, stop_run=3, keep=20, logger=None):
+        self.seen_store = seen_store
+        self.source = source
+        self.category = category
+        self.stop_run = stop_run
+        self.keep = keep
+        self.logger = logger or logging.getLogger(__name__)
+        self.mark = seen_store.get_mark(source, category)
+        self._older_run = 0
+        self._newest_id = None
+        self._newest_order = None # (datetime, chuoi goc)
+        self._recent_keys = []
+
+    @staticmethod
+    def _as_number(job_id):
+        try:
+            return int(job_id)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _as_time(value):
+        """Chuoi ISO 8601 -> datetime (UTC, khong tz) de so sanh; khong doc duoc -> None."""
+        try:
+            moment = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except (TypeError, ValueError):
+            return None
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment
+
+    def describe(self):
+        if not self.mark:
+            return "chua co moc (quet day du)"
+        if self.mark.get("newest_order"):
+            return f"moc {self.mark['newest_order']} (cap nhat {self.mark['updated_at']})"
+        return f"moc job ID {self.mark['newest_id']} (cap nhat {self.mark['updated_at']})"
+
+    def is_older(self, link, job_id=None, order_value=None):
+        """
+        Card nay da cu hon moc lan truoc chua (id so <= moc, hoac nam trong cac tin dau trang lan truoc).
+        Co `order_value` -> so theo thu tu sap xep (<= moc newest_order), khong so id.
+        """
+        if not self.mark:
+            return False
+        if order_value is not None:
+            moment, newest = self._as_time(order_value), self._as_time(self.mark.get("newest_order"))
+            if moment is not None and newest is not None:
+                return moment <= newest
+            return job_key(link) in self.mark["recent_keys"]
+        number, newest = self._as_number(job_id), self._as_number(self.mark["newest_id"])
+        if number is not None and newest is not None:
+            return number <= newest
+        return job_key(link) in self.mark["recent_keys"]
+
+    def reached(self, link, job_id=None, order_value=None):
+        """Ghi nhan 1 card theo thu tu tren trang; tra ve True khi da gap du `stop_run` card cu lien tiep."""
+        if self.is_older(link, job_id, order_value):
+            self._older_run += 1
+        else:
+            self._older_run = 0
+            number = self._as_number(job_id)
+            if number is not None and (self._newest_id is None or number > self._newest_id):
+                self._newest_id = number
+            moment = self._as_time(order_value) if order_value is not None else None
+            if moment is not None and (self._newest_order is None or moment > self._newest_order[0]):
+                self._newest_order = (moment, str(order_value))
+            if len(self._recent_keys) < self.keep:
+                self._recent_keys.append(job_key(link))
+        return self._older_run >= self.stop_run
+
+    def commit(self):
+        """Luu moc moi. Chi goi khi lan quet da di het phan moi (khong bi cat boi JOB_LIMIT, khong co job loi)."""
+        if self._newest_id is None and not self._recent_keys:
+            return
+        newest = self._newest_id
+        old_newest = self._as_number(self.mark["newest_id"]) if self.mark else None
+        if old_newest is not None and (newest is None or old_newest > newest):
+            newest = old_newest
+        newest_order = self._newest_order
+        old_order = self.mark.get("newest_order") if self.mark else None
+        old_moment = self._as_time(old_order)
+        if old_moment is not None and (newest_order is None or old_moment > newest_order[0]):
+            newest_order = (old_moment, old_order)
+        recent = self._recent_keys or (self.mark["recent_keys"] if self.mark else [])
+        self.seen_store.set_mark(
+            self.source, self.category, None if newest is None else str(newest), recent,
+            newest_order=newest_order[1] if newest_order else None,
+        )
+        order_note = f", {newest_order[1]}" if newest_order else ""
+        self.logger.info(f"[HWM] Cap nhat moc {self.source}/{self.category}: job ID {newest}{order_note}.")
@@ -0,0 +1,202 @@
+# scrapers/html_store.py
+
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+# Them project root vao sys.path de chay doc lap
+project_root_for_import = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(project_root_for_import)
+
+from scrapers.http_fetch import parse_html, extract_fields, missing_required, row_from_fields
+from scrapers.site_specs import CSV_HEADER, DETAIL_SPECS
+
+
+DEFAULT_STORE_DIR = os.path.join(project_root_for_import, "raw_html")
+# [THAY DOI] CSV parse lai ghi RIENG, ten khong khop DATASET_PATTERNS (*_jobs_*) cua loader: neu ghi vao dataset/
+# thi dong parse lai trung khoa manifest (Nguon + Link + NgayCaoDuLieu) voi dong da nap -> bi bo qua am tham.
+DEFAULT_REPARSE_DIR = os.path.join(project_root_for_import, "reparsed")
+
+
+class HtmlStore:
+    """
+    [THEM MOI] Kho luu HTML trang chi tiet (nen gzip, dia chi theo noi dung).
+    - objects/<sha[:2]>/<sha256>.html.gz : noi dung trang, trang giong nhau chi luu 1 lan.
+    - index/<Nguon>.jsonl : moi dong 1 lan tai {job_id, link, fetched_at, sha256, extra}.
+    Lenh `parse` (cuoi file) doc lai kho nay de tao CSV 21 cot ma khong can cao lai.
+    """
+
+    def __init__(self, root=None, logger=None):
+        self.root = root or DEFAULT_STORE_DIR
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.index_dir = os.path.join(self.root, "index")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.index_dir, exist_ok=True)
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.html.gz")
+
+    def _index_path(self, source):
+        return os.path.join(self.index_dir, f"{source}.jsonl")
+
+    def put(self, source, job_id, link, html, extra=None, fetched_at=None):
+        """
+        Luu 1 trang da tai. `extra`: field lay tu ngoai trang chi tiet (vd ten cong ty tren card)
+        se duoc ghi de khi parse lai. Tra ve sha256 cua noi dung.
+        """
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path) # Ghi tam roi doi ten -> khong de lai file nen do dang
+
+        entry = {
+            "job_id": job_id or link,
+            "link": link,
+            "fetched_at": (fetched_at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S"),
+            "sha256": digest,
+            "extra": extra or {},
+        }
+        with self._lock:
+            with open(self._index_path(source), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return digest
+
+    def save(self, source, job_id, link, html, extra=None):
+        """Nhu put() nhung khong bao gio nem loi (luu HTML chi la phu, khong duoc lam hong phien cao)."""
+        if not html:
+            return None
+        try:
+            return self.put(source, job_id, link, html, extra=extra)
+        except Exception as e:
+            self.logger.warning(f"[HtmlStore] Khong the luu HTML cua {link}: {e}")
+            return None
+
+    def read(self, digest):
+        with gzip.open(self._object_path(digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def sources(self):
+        return sorted(name[:-len(".jsonl")] for name in os.listdir(self.index_dir) if name.endswith(".jsonl"))
+
+    def entries(self, source, since=None, latest_only=True):
+        """
+        Doc index cua 1 Nguon. `since`: chuoi 'YYYY-mm-dd' (chi lay lan tai tu ngay nay).
+        latest_only: moi job id chi giu lan tai moi nhat.
+        """
+        path = self._index_path(source)
+        if not os.path.exists(path):
+            return []
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue # Dong cuoi bi ghi do dang khi tien trinh bi ngat
+                if since and entry["fetched_at"] < since:
+                    continue
+                entries.append(entry)
+        if latest_only:
+            latest = {}
+            for entry in entries:
+                latest[entry["job_id"]] = entry # fetched_at tang dan theo thu tu ghi
+            entries = list(latest.values())
+        return entries
+
+
+def _parse_entry(args):
+    """Chay trong tien trinh con: doc 1 trang tu kho -> 1 dong CSV (None neu thieu field bat buoc)."""
+    root, source, entry = args
+    spec, required = DETAIL_SPECS[source]
+    try:
+        html = HtmlStore(root).read(entry["sha256"])
+        fields = extract_fields(parse_html(html, entry["link"]), spec)
+    except Exception:
+        return None
+    for column, value in entry.get("extra", {}).items():
+        if value:
+            fields[column] = value
+    if missing_required(fields, required):
+        return None
+    fields["LinkBaiTuyenDung"] = entry["link"]
+    fields["Nguon"] = source
+    fields["NgayCaoDuLieu"] = entry["fetched_at"][:10]
+    return row_from_fields(fields, CSV_HEADER)
+
+
+def parse_store(store, source, output_dir, since=None, workers=None, logger=None):
+    """
+    Parse lai toan bo trang cua 1 Nguon trong kho bang process pool, ghi ra 1 file CSV 21 cot
+    `<Nguon>_reparsed_<thoi gian>.csv` (khong phai file nap tang dan: dung de so sanh / thay the du lieu da nap).
+    """
+    logger = logger or logging.getLogger(__name__)
+    entries = store.entries(source, since=since)
+    if not entries:
+        logger.info(f"[{source}] Khong co trang nao trong kho.")
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    now_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    output_file = os.path.join(output_dir, f"{source}_reparsed_{now_str}.csv")
+
+    written, skipped = 0, 0
+    tasks = [(store.root, source, entry) for entry in entries]
+    with ProcessPoolExecutor(max_workers=workers) as executor, \
+            open(output_file, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for row in executor.map(_parse_entry, tasks, chunksize=32):
+            if row is None:
+                skipped += 1
+                continue
+            writer.writerow(row)
+            written += 1
+
+    logger.info(f"[{source}] Da parse {written} trang -> {os.path.basename(output_file)} (bo qua {skipped}).")
+    if written == 0:
+        os.remove(output_file)
+        return None
+    return output_file
+
+
+# ==================================================
+# KHOI CODE DE CHAY DOC LAP
+#   python scrapers/html_store.py parse [--source TopCV] [--since 2025-01-01] [--workers 4]
+# ==================================================
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    arg_parser = argparse.ArgumentParser(description="Kho HTML trang chi tiet")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    parse_cmd = commands.add_parser("parse", help="Parse HTML da luu thanh CSV 21 cot trong reparsed/")
+    parse_cmd.add_argument("--source", action="append", help="Nguon can parse (mac dinh: tat ca)")
+    parse_cmd.add_argument("--since", help="Chi parse trang tai tu ngay YYYY-mm-dd")
+    parse_cmd.add_argument("--workers", type=int, default=None, help="So tien trinh (mac dinh: so CPU)")
+    parse_cmd.add_argument("--store", default=DEFAULT_STORE_DIR, help="Thu muc kho HTML")
+    parse_cmd.add_argument("--output", default=DEFAULT_REPARSE_DIR, help="Thu muc ghi CSV (khong phai dataset/)")
+    args = arg_parser.parse_args()
+
+    html_store = HtmlStore(args.store)
+    for source_name in args.source or html_store.sources():
+        if source_name not in DETAIL_SPECS:
+            logging.warning(f"Chua co spec cho nguon '{source_name}'. Bo qua.")
+            continue
+        parse_store(html_store, source_name, args.output, since=args.since, workers=args.workers)
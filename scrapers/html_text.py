@@ -0,0 +1,138 @@
+# scrapers/html_text.py
+
+import logging
+import re
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+try:
+    from lxml import html as lxml_html
+except ImportError: # lxml khong bat buoc: thieu thi dung bo parse thuan Python
+    lxml_html = None
+
+
+# ==========================================================
+# [THEM MOI] Chuyen HTML mo ta/yeu cau (tu API) thanh text thuan:
+# - Moi doan/muc gach dau dong (p, li, br, h1..h6...) 1 dong rieng -> giu ranh gioi cho buoc tach ky nang.
+# - Backend "lxml" (parser C) mac dinh, "python" (html.parser thu vien chuan) du phong.
+# - html_to_text_many: lo lon thi chia cho process pool.
+# ==========================================================
+
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "dl", "dt", "dd", "tr", "table", "thead", "tbody",
+    "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "header", "footer", "blockquote", "pre", "hr",
+}
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+_SPACES = re.compile(r"[ \t\r\f\v\u00a0\u200b]+") # Gom ca &nbsp; va zero-width space
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(raw):
+    """Gop khoang trang trong tung dong, bo dong rong."""
+    lines = (_SPACES.sub(" ", line).strip() for line in raw.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+# ---------- Backend lxml ----------
+def _lxml_walk(element, parts):
+    tag = element.tag if isinstance(element.tag, str) else None # None: comment / processing instruction
+    if tag in SKIP_TAGS:
+        return
+    block = tag in BLOCK_TAGS
+    if block:
+        parts.append("\n")
+    if tag is not None and element.text:
+        parts.append(element.text)
+    for child in element:
+        _lxml_walk(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+    if block:
+        parts.append("\n")
+
+
+def _lxml_to_text(html_text):
+    root = lxml_html.fragment_fromstring(html_text, create_parent="div")
+    parts = []
+    _lxml_walk(root, parts)
+    return _normalize("".join(parts))
+
+
+# ---------- Backend thuan Python ----------
+class _TextCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def _python_to_text(html_text):
+    collector = _TextCollector()
+    collector.feed(html_text)
+    collector.close()
+    return _normalize("".join(collector.parts))
+
+
+BACKENDS = {"python": _python_to_text}
+if lxml_html is not None:
+    BACKENDS["lxml"] = _lxml_to_text
+DEFAULT_BACKEND = "lxml" if lxml_html is not None else "python"
+
+
+def html_to_text(html_text, backend=None):
+    """HTML -> text, moi doan/muc 1 dong. `backend`: 'lxml' / 'python' (mac dinh: lxml neu co)."""
+    if not html_text:
+        return ""
+    if "<" not in html_text and "&" not in html_text:
+        return _normalize(html_text) # Da la text thuan
+    convert = BACKENDS[backend or DEFAULT_BACKEND]
+    try:
+        return convert(html_text)
+    except Exception as e:
+        if convert is _python_to_text:
+            raise
+        logger.warning(f"[HtmlText] Backend {backend or DEFAULT_BACKEND} loi ({e}). Dung html.parser.")
+        return _python_to_text(html_text)
+
+
+def _convert_chunk(args):
+    html_texts, backend = args
+    return [html_to_text(h, backend) for h in html_texts]
+
+
+def html_to_text_many(html_texts, backend=None, workers=None, min_parallel=500, chunk_size=100):
+    """
+    Chuyen ca lo HTML -> text, giu nguyen thu tu.
+    Lo nho (< `min_parallel`) chay tai cho; lo lon chia thanh chunk cho process pool `workers` tien trinh.
+    """
+    html_texts = list(html_texts)
+    if len(html_texts) < min_parallel or workers == 1:
+        return [html_to_text(h, backend) for h in html_texts]
+    chunks = [(html_texts[i:i + chunk_size], backend) for i in range(0, len(html_texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = []
+        for converted in pool.map(_convert_chunk, chunks):
+            results.extend(converted)
+    return results
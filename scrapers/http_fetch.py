@@ -0,0 +1,129 @@
+# scrapers/http_fetch.py
+
+import logging
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import html as lxml_html
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "vi-VN,vi;q=0.9,en;q=0.8",
+}
+
+
+class HttpFetcher:
+    """
+    [THEM MOI] Tai trang chi tiet bang HTTP (khong can Chrome).
+    Dung 1 requests.Session co connection pool (keep-alive) cho ca phien cao.
+    """
+
+    def __init__(self, logger=None, timeout=15, pool_size=10, retries=2):
+        self.logger = logger or logging.getLogger(__name__)
+        self.timeout = timeout
+        # Trang thai request gan nhat (de bo dieu tiet AIMD doc)
+        self.last_status = None
+        self.last_latency = 0.0
+        self.last_html = None # HTML (da giai ma) cua trang tai thanh cong gan nhat, de luu vao HtmlStore
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        retry = Retry(total=retries, backoff_factor=1, status_forcelist=(500, 502, 504), allowed_methods=("GET",))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def fetch_document(self, url):
+        """Tai URL va tra ve cay lxml, hoac None neu loi (de scraper chuyen sang Selenium)."""
+        started = time.monotonic()
+        self.last_html = None
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            self.last_status = None
+            self.last_latency = time.monotonic() - started
+            self.logger.warning(f"[HTTP] Loi khi tai {url}: {e}")
+            return None
+        self.last_status = response.status_code
+        self.last_latency = time.monotonic() - started
+
+        if response.status_code != 200:
+            self.logger.warning(f"[HTTP] {url} tra ve ma {response.status_code}.")
+            return None
+
+        encoding = response.encoding
+        if not encoding or encoding.lower() == "iso-8859-1":
+            encoding = "utf-8"
+        try:
+            self.last_html = response.content.decode(encoding, errors="replace")
+            return parse_html(self.last_html, response.url)
+        except Exception as e:
+            self.logger.warning(f"[HTTP] Khong the parse HTML cua {url}: {e}")
+            return None
+
+
+def parse_html(html, base_url=None):
+    """Parse chuoi HTML thanh cay lxml (link tuong doi -> tuyet doi theo base_url)."""
+    document = lxml_html.document_fromstring(html)
+    if base_url:
+        document.make_links_absolute(base_url)
+    return document
+
+
+def _clean(text):
+    """Gop khoang trang thua tren 1 dong."""
+    return " ".join(text.split()) if text else ""
+
+
+def _block_text(element):
+    """Lay text cua 1 khoi, giu moi doan/dong tren 1 dong rieng."""
+    lines = [_clean(t) for t in element.itertext()]
+    return "\n".join(line for line in lines if line)
+
+
+def extract_fields(document, spec):
+    """
+    Ap dung spec {cot_csv: (xpath, mode)} len cay lxml, tra ve dict {cot_csv: text}.
+    mode: 'text' | 'value' (phan sau dau ':') | 'href' | 'title' | 'section' (noi cac khoi khop).
+    """
+    fields = {}
+    for column, (xpath, mode) in spec.items():
+        try:
+            nodes = document.xpath(xpath)
+        except Exception:
+            nodes = []
+
+        value = ""
+        if nodes:
+            if mode == "section":
+                value = "\n".join(t for t in (_block_text(n) for n in nodes) if t)
+            elif mode in ("href", "title"):
+                value = (nodes[0].get(mode) or "").strip()
+            else:
+                value = _clean(nodes[0].text_content())
+                if mode == "value" and ":" in value:
+                    value = value.split(":")[-1].strip()
+        fields[column] = value
+    return fields
+
+
+def missing_required(fields, required):
+    """Tra ve danh sach cot bat buoc bi rong."""
+    return [col for col in required if not fields.get(col)]
+
+
+def row_from_fields(fields, header):
+    """Sap xep dict field theo dung thu tu CSV_HEADER."""
+    return [fields.get(col, "") for col in header]
@@ -0,0 +1,110 @@
+# scrapers/output_writer.py
+
+import csv
+import os
+import queue
+import threading
+import time
+import logging
+
+from scrapers.columnar import csv_to_parquet
+
+# [THEM MOI] Dinh dang file du lieu cuoi cung: "csv" (mac dinh) hoac "parquet" (dat qua bien moi truong)
+OUTPUT_FORMAT = os.getenv("SCRAPER_OUTPUT_FORMAT", "csv").strip().lower()
+
+
+class SerializedWriter:
+    """
+    [THEM MOI] Mot thread ghi duy nhat cho file CSV va lich su ID (SeenStore).
+    Cac driver chay song song chi `submit()` vao queue, nen thu tu dong CSV
+    va ID da cao luon khop nhau.
+
+    [THAY DOI] File CSV mo 1 lan cho ca phien; dong duoc gom trong bo dem va ghi theo lo
+    (`batch_size` dong hoac sau `flush_interval` giay). Moi checkpoint: ghi lo -> flush + fsync file
+    -> roi moi ghi ID cua lo vao SeenStore. Neu bi crash giua chung, toi da la co dong CSV ma chua co ID
+    (lan sau cao lai, trung lap se bi loc khi nap), khong bao gio co ID ma mat dong.
+
+    [THEM MOI] `output_format="parquet"`: van ghi CSV trong luc cao, khi `close()` moi chuyen sang
+    Parquet (scrapers/columnar.py) va xoa CSV; `output_file` tro sang file Parquet.
+    """
+
+    _STOP = object()
+
+    def __init__(self, output_file, seen_store, source, logger=None, header=None, batch_size=20, flush_interval=30,
+                 output_format=None):
+        self.output_file = output_file
+        self.seen_store = seen_store
+        self.source = source
+        self.logger = logger or logging.getLogger(__name__)
+        self.header = header
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.output_format = (output_format or OUTPUT_FORMAT).lower()
+        self.rows_written = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="csv-writer", daemon=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, row, job_id):
+        """Dua 1 dong CSV + 1 ID vao hang doi ghi."""
+        self._queue.put((row, job_id))
+
+    def close(self):
+        """Doi ghi het hang doi (checkpoint cuoi) roi dong file."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+        if self.output_format == "parquet" and self.rows_written:
+            parquet_file = csv_to_parquet(self.output_file, logger=self.logger)
+            if parquet_file:
+                self.output_file = parquet_file
+
+    def _checkpoint(self, csv_f, writer, pending):
+        """Ghi lo dong dang dem, fsync, roi moi ghi ID cua lo vao lich su."""
+        if not pending:
+            return
+        try:
+            writer.writerows(row for row, _ in pending)
+            csv_f.flush()
+            os.fsync(csv_f.fileno())
+        except Exception as e:
+            self.logger.error(f"Loi khi ghi {len(pending)} dong vao file: {e}. Khong ghi ID cua lo nay vao lich su.")
+            return
+        self.seen_store.add_many(self.source, (job_id for _, job_id in pending))
+        self.seen_store.flush()
+        self.rows_written += len(pending)
+
+    def _loop(self):
+        mode = "w" if self.header is not None else "a"
+        with open(self.output_file, mode, encoding="utf-8-sig", newline="") as csv_f:
+            writer = csv.writer(csv_f)
+            if self.header is not None:
+                writer.writerow(self.header)
+            pending = []
+            last_checkpoint = time.monotonic()
+            while True:
+                timeout = None
+                if pending and self.flush_interval:
+                    timeout = max(0.0, self.flush_interval - (time.monotonic() - last_checkpoint))
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None # Het thoi gian cho -> checkpoint lo dang dem
+
+                if item is self._STOP:
+                    self._checkpoint(csv_f, writer, pending)
+                    break
+                if item is not None:
+                    pending.append(item)
+                if item is None or len(pending) >= self.batch_size:
+                    self._checkpoint(csv_f, writer, pending)
+                    pending = []
+                    last_checkpoint = time.monotonic()
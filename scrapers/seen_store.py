@@ -0,0 +1,224 @@
+# scrapers/seen_store.py
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+
+DEFAULT_SEEN_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seen_jobs.sqlite3")
+
+# [THEM MOI] File lich su cu (txt) cua tung Nguon -> nap 1 lan vao kho SQLite
+LEGACY_HISTORY_FILES = {
+    "TopCV": ["TopCV_id_history.txt"],
+    "CareerLink": ["CareerLink_id_history.txt"],
+    "JobsGo": ["JobsGo_id_history.txt"],
+    "CareerViet": ["seen_links_IT_Software.txt", "seen_links_IT_Hardware_Network.txt"],
+}
+
+
+class SeenStore:
+    """
+    [THEM MOI] Kho job da cao dung chung cho moi scraper (SQLite, che do WAL).
+    Khoa chinh (source, job_id) -> kiem tra ton tai qua index, khong nap ca lich su vao RAM.
+    Ghi duoc gom theo lo (`batch_size`); an toan khi nhieu thread/tien trinh cung ghi
+    (moi thread 1 connection, INSERT OR IGNORE, busy_timeout cho lock).
+    """
+
+    def __init__(self, path=None, logger=None, batch_size=50):
+        self.path = path or DEFAULT_SEEN_DB
+        self.logger = logger or logging.getLogger(__name__)
+        self.batch_size = max(1, int(batch_size))
+        self._local = threading.local()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._init_schema()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen_jobs ("
+                " source TEXT NOT NULL, job_id TEXT NOT NULL, first_seen TEXT NOT NULL,"
+                " PRIMARY KEY (source, job_id)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS imported_files (path TEXT PRIMARY KEY, imported_at TEXT NOT NULL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS high_water_marks ("
+                " source TEXT NOT NULL, category TEXT NOT NULL, newest_id TEXT, recent_keys TEXT NOT NULL,"
+                " updated_at TEXT NOT NULL, newest_order TEXT, PRIMARY KEY (source, category))"
+            )
+            # [THEM MOI] Kho tao truoc khi co cot newest_order (moc theo thu tu sap xep, vd approvedOn)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(high_water_marks)")}
+            if "newest_order" not in columns:
+                conn.execute("ALTER TABLE high_water_marks ADD COLUMN newest_order TEXT")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_frontier ("
+                " source TEXT NOT NULL, listing TEXT NOT NULL, backfill_page INTEGER NOT NULL,"
+                " exhausted_at TEXT, updated_at TEXT NOT NULL, PRIMARY KEY (source, listing))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS drained_pages ("
+                " source TEXT NOT NULL, listing TEXT NOT NULL, page INTEGER NOT NULL, kind TEXT NOT NULL,"
+                " new_jobs INTEGER NOT NULL, drained_at TEXT NOT NULL, PRIMARY KEY (source, listing, page))"
+            )
+
+    # ---------- Doc ----------
+    def contains(self, source, job_id):
+        """Job da co trong lich su chua (ke ca ID dang cho ghi trong lo)."""
+        job_id = str(job_id)
+        with self._lock:
+            if (source, job_id) in self._pending:
+                return True
+        row = self._conn().execute(
+            "SELECT 1 FROM seen_jobs WHERE source = ? AND job_id = ?", (source, job_id)
+        ).fetchone()
+        return row is not None
+
+    def count(self, source=None):
+        if source is None:
+            return self._conn().execute("SELECT COUNT(*) FROM seen_jobs").fetchone()[0]
+        return self._conn().execute("SELECT COUNT(*) FROM seen_jobs WHERE source = ?", (source,)).fetchone()[0]
+
+    # ---------- Ghi ----------
+    def add(self, source, job_id):
+        """Them 1 ID vao lo; tu flush khi du `batch_size`."""
+        with self._lock:
+            self._pending.append((source, str(job_id)))
+            should_flush = len(self._pending) >= self.batch_size
+        if should_flush:
+            self.flush()
+
+    def add_many(self, source, job_ids):
+        for job_id in job_ids:
+            self.add(source, job_id)
+
+    def flush(self):
+        """Ghi lo ID dang cho vao SQLite trong 1 transaction."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            conn = self._conn()
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO seen_jobs (source, job_id, first_seen) VALUES (?, ?, ?)",
+                    [(source, job_id, now) for source, job_id in pending],
+                )
+        except sqlite3.Error as e:
+            with self._lock:
+                self._pending = pending + self._pending # Giu lai de lan flush sau ghi tiep
+            self.logger.error(f"[SeenStore] Loi khi ghi {len(pending)} ID: {e}")
+            return 0
+        return len(pending)
+
+    def close(self):
+        self.flush()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ---------- Moc quet danh sach (high-water mark) ----------
+    def get_mark(self, source, category):
+        """Moc cua lan quet truoc: {'newest_id', 'recent_keys', 'updated_at', 'newest_order'} hoac None."""
+        row = self._conn().execute(
+            "SELECT newest_id, recent_keys, updated_at, newest_order FROM high_water_marks WHERE source = ? AND category = ?",
+            (source, category),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"newest_id": row[0], "recent_keys": json.loads(row[1]), "updated_at": row[2], "newest_order": row[3]}
+
+    def set_mark(self, source, category, newest_id, recent_keys, newest_order=None):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO high_water_marks (source, category, newest_id, recent_keys, updated_at, newest_order)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (source, category, newest_id, json.dumps(list(recent_keys)), datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                 newest_order),
+            )
+
+    # ---------- Bien quet danh sach (crawl frontier) ----------
+    def get_frontier(self, source, listing):
+        """Trang thai bien quet: {'backfill_page', 'exhausted_at', 'updated_at'} hoac None."""
+        row = self._conn().execute(
+            "SELECT backfill_page, exhausted_at, updated_at FROM crawl_frontier WHERE source = ? AND listing = ?",
+            (source, listing),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"backfill_page": row[0], "exhausted_at": row[1], "updated_at": row[2]}
+
+    def set_frontier(self, source, listing, backfill_page, exhausted_at=None, drained=()):
+        """Luu bien quet + cac trang da quet het `drained` = [(page, kind, new_jobs), ...] trong 1 transaction."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO crawl_frontier (source, listing, backfill_page, exhausted_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (source, listing, int(backfill_page), exhausted_at, now),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO drained_pages (source, listing, page, kind, new_jobs, drained_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(source, listing, int(page), kind, int(new_jobs), now) for page, kind, new_jobs in drained],
+            )
+
+    # ---------- Chuyen doi lich su cu ----------
+    def import_legacy(self, source, file_paths=None):
+        """
+        Nap cac file lich su txt cu (1 ID/link moi dong) vao kho, moi file chi nap 1 lan.
+        Mac dinh dung LEGACY_HISTORY_FILES (nam canh file .py cua scraper).
+        """
+        if file_paths is None:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            file_paths = [os.path.join(base_dir, name) for name in LEGACY_HISTORY_FILES.get(source, [])]
+
+        conn = self._conn()
+        imported = 0
+        for file_path in file_paths:
+            if not os.path.exists(file_path):
+                continue
+            key = os.path.abspath(file_path)
+            if conn.execute("SELECT 1 FROM imported_files WHERE path = ?", (key,)).fetchone():
+                continue
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            with open(file_path, "r", encoding="utf-8") as f, conn:
+                batch = []
+                for line in f:
+                    job_id = line.strip()
+                    if not job_id:
+                        continue
+                    batch.append((source, job_id, now))
+                    if len(batch) >= 5000:
+                        conn.executemany("INSERT OR IGNORE INTO seen_jobs VALUES (?, ?, ?)", batch)
+                        imported += len(batch)
+                        batch = []
+                if batch:
+                    conn.executemany("INSERT OR IGNORE INTO seen_jobs VALUES (?, ?, ?)", batch)
+                    imported += len(batch)
+                conn.execute("INSERT OR IGNORE INTO imported_files VALUES (?, ?)", (key, now))
+            self.logger.info(f"[SeenStore] Da nap lich su cu {os.path.basename(file_path)} vao kho ({source}).")
+        return imported
@@ -0,0 +1,136 @@
+# scrapers/site_specs.py
+
+# ==========================================================
+# [THEM MOI] Khai bao selector cho tung trang (dung chung cho che do HTTP).
+# Moi spec: {cot_csv: (xpath, mode)} - xem http_fetch.extract_fields.
+# Cac XPath duoc chuyen tu selector Selenium dang dung trong tung scraper.
+#
+# [THEM MOI] Spec trang danh sach: {"card": xpath, "fields": {ten: (xpath_tuong_doi, mode)}}
+# dung boi browser_extract.harvest_listing. Bat buoc co field "href".
+# ==========================================================
+
+
+# [THEM MOI] Schema 21 cot chung cua moi file CSV trong dataset/ (giong CSV_HEADER cua tung scraper).
+CSV_HEADER = [
+    "CongViec", "ViTri", "YeuCauKinhNghiem", "MucLuong",
+    "ThoiGianLamViec", "GioiTinh", "CapBac", "HinhThucLamViec", "CongTy", "LinkCongTy",
+    "QuyMoCongTy", "SoLuongTuyen", "HocVan",
+    "YeuCauUngVien", "MoTaCongViec", "QuyenLoi", "HanNopHoSo", "LinkBaiTuyenDung", "Nguon", "NgayCaoDuLieu",
+    "LinhVuc"
+]
+
+
+def _has_class(cls):
+    """XPath dieu kien 'co class' tuong duong CSS '.cls'."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+# --- TopCV ---
+TOPCV_DETAIL_SPEC = {
+    "CongViec": (f"//h1[{_has_class('job-detail__info--title')}]", "text"),
+    "ViTri": ("//div[contains(text(), 'Địa điểm') and contains(@class, 'job-detail__info--section-content-title')]/following-sibling::div", "text"),
+    "YeuCauKinhNghiem": ("//div[div[contains(text(), 'Kinh nghiệm')]]/div[contains(@class, 'value')]", "text"),
+    "MucLuong": ("//div[div[contains(text(), 'Mức lương')]]/div[contains(@class, 'value')]", "text"),
+    "ThoiGianLamViec": ("//h3[contains(text(),'Thời gian làm việc')]/following-sibling::div", "text"),
+    "CapBac": ("//div[div[contains(text(), 'Cấp bậc')]]/div[contains(@class, 'value')]", "text"),
+    "HinhThucLamViec": ("//div[div[contains(text(), 'Hình thức làm việc')]]/div[contains(@class, 'value')]", "text"),
+    "CongTy": (f"//a[{_has_class('name')}]", "text"),
+    "LinkCongTy": (f"//*[{_has_class('job-detail__box--right')} and {_has_class('job-detail__company')}]//a", "href"),
+    "QuyMoCongTy": ("//div[contains(@class, 'company-scale')]//div[@class='company-value']", "text"),
+    "SoLuongTuyen": ("//div[div[contains(text(), 'Số lượng tuyển')]]/div[contains(@class, 'value')]", "text"),
+    "HocVan": ("//div[div[contains(text(), 'Học vấn')]]/div[contains(@class, 'value')]", "text"),
+    "YeuCauUngVien": ("//h3[contains(text(),'Yêu cầu ứng viên')]/following-sibling::div[@class='job-description__item--content']", "section"),
+    "MoTaCongViec": ("//h3[contains(text(),'Mô tả công việc')]/following-sibling::div[@class='job-description__item--content']", "section"),
+    "QuyenLoi": ("//h3[contains(text(),'Quyền lợi')]/following-sibling::div[@class='job-description__item--content']", "section"),
+    "HanNopHoSo": (f"//div[{_has_class('job-detail__info--deadline')}]", "value"),
+    "LinhVuc": ("//div[@class='company-title' and contains(normalize-space(), 'Lĩnh vực:')]/following-sibling::div[@class='company-value']", "text"),
+}
+TOPCV_REQUIRED_FIELDS = ["CongViec", "MoTaCongViec"]
+
+TOPCV_LISTING_SPEC = {
+    "card": f"//div[{_has_class('job-item-search-result')}]",
+    "fields": {
+        "href": (f".//h3[{_has_class('title')}]//a", "href"),
+        "title": (f".//h3[{_has_class('title')}]//a", "text"),
+        "company": (f".//a[{_has_class('company')}]", "text"),
+        "salary": (f".//*[{_has_class('title-salary')}]", "text"),
+        "location": (f".//*[{_has_class('address')}]", "text"),
+        "updated": (f".//*[{_has_class('label-update')}]", "text"), # "Cap nhat 3 gio truoc" -> moc HWM theo ngay dang
+    },
+}
+
+
+# --- CareerLink ---
+CAREERLINK_DETAIL_SPEC = {
+    "CongViec": (f"//h1[{_has_class('job-title')}]", "text"),
+    "ViTri": ('//div[@id="job-location"]//a', "text"),
+    "YeuCauKinhNghiem": ('//div[i[contains(@class, "cli-suitcase-simple")]]/span', "text"),
+    "MucLuong": ('//div[@id="job-salary"]/span[contains(@class, "text-primary")]', "text"),
+    "GioiTinh": ("//div[contains(text(),'Giới tính')]/following-sibling::div", "text"),
+    "CapBac": ("//div[contains(text(),'Cấp bậc')]/following-sibling::div", "text"),
+    "HinhThucLamViec": ("//div[contains(text(),'Loại công việc')]/following-sibling::div", "text"),
+    "CongTy": (f"//h5[{_has_class('company-name-title')}]//a", "title"),
+    "LinkCongTy": (f"//h5[{_has_class('company-name-title')}]//a", "href"),
+    "QuyMoCongTy": ("//i[contains(@class,'cli-users')]/following-sibling::span", "text"),
+    "HocVan": ("//div[contains(text(),'Học vấn')]/following-sibling::div", "text"),
+    "YeuCauUngVien": ('//div[@id="section-job-skills"]', "section"),
+    "MoTaCongViec": ('//div[@id="section-job-description"]//div[@class="rich-text-content"]', "section"),
+    "QuyenLoi": ('//div[@id="section-job-benefits"]', "section"),
+    "HanNopHoSo": ("//div[@id='job-date']//div[contains(@class,'day-expired')]//b", "text"),
+    "LinhVuc": ("//div[contains(text(),'Ngành nghề')]/following-sibling::div", "text"),
+}
+CAREERLINK_REQUIRED_FIELDS = ["CongViec", "MoTaCongViec"]
+
+# Card CareerLink chinh la the <a class="job-link clickable-outside">; cac field con lai nam trong khoi job-item bao ngoai.
+_CAREERLINK_CARD_BOX = f"ancestor::*[{_has_class('job-item')}][1]"
+CAREERLINK_LISTING_SPEC = {
+    "card": f"//a[{_has_class('job-link')} and {_has_class('clickable-outside')}]",
+    "fields": {
+        "href": (".", "href"),
+        "title": (".", "title"),
+        "company": (f"{_CAREERLINK_CARD_BOX}//a[{_has_class('job-company')}]", "text"),
+        "salary": (f"{_CAREERLINK_CARD_BOX}//*[{_has_class('job-salary')}]", "text"),
+        "location": (f"{_CAREERLINK_CARD_BOX}//*[{_has_class('job-location')}]", "text"),
+    },
+}
+
+
+# --- CareerViet ---
+CAREERVIET_DETAIL_SPEC = {
+    "CongViec": (f"//h1[{_has_class('title')}]", "value"),
+    "ViTri": ("//strong[contains(.,'Địa điểm')]/following-sibling::p/a", "value"),
+    "YeuCauKinhNghiem": ("//strong[contains(.,'Kinh nghiệm')]/following-sibling::p", "value"),
+    "MucLuong": ("//strong[contains(.,'Lương')]/following-sibling::p | //li[contains(text(), 'Lương:')]", "value"),
+    "CapBac": ("//strong[contains(.,'Cấp bậc')]/following-sibling::p", "value"),
+    "HinhThucLamViec": ("//strong[contains(.,'Hình thức')]/following-sibling::p", "value"),
+    "CongTy": ("//*[@id='tab-2']//div[contains(@class,'img')]//div[contains(@class,'title-company')]//a[contains(@class,'name')]", "title"),
+    "LinkCongTy": ("//*[@id='tab-2']//div[contains(@class,'img')]//div[contains(@class,'title-company')]//a[contains(@class,'name')]", "href"),
+    "QuyMoCongTy": ("//li[contains(., 'Quy mô công ty')]", "value"),
+    "HocVan": ("//li[contains(text(), 'Bằng cấp:')]", "value"),
+    "YeuCauUngVien": ("//h2[contains(text(), 'Yêu Cầu Công Việc')]/parent::div[contains(@class, 'detail-row')]/*[not(self::h2)]", "section"),
+    "MoTaCongViec": ("//h2[contains(text(), 'Mô tả Công việc')]/parent::div[contains(@class, 'detail-row')]/*[not(self::h2)]", "section"),
+    "QuyenLoi": ("//h2[contains(text(), 'Phúc lợi')]/following-sibling::ul[@class='welfare-list']", "section"),
+    "HanNopHoSo": ("//strong[contains(.,'Hết hạn nộp')]/following-sibling::p", "value"),
+    "LinhVuc": ("//strong[contains(., 'Ngành nghề')]/following-sibling::p", "value"),
+}
+CAREERVIET_REQUIRED_FIELDS = ["CongViec", "MoTaCongViec"]
+
+CAREERVIET_LISTING_SPEC = {
+    "card": f"//div[{_has_class('job-item')}]",
+    "fields": {
+        "href": (f".//a[{_has_class('job_link')}]", "href"),
+        "title": (f".//a[{_has_class('job_link')}]", "text"),
+        "company": (f".//a[{_has_class('company-name')}]", "title"),
+        "company_link": (f".//a[{_has_class('company-name')}]", "href"),
+        "salary": (f".//*[{_has_class('salary')}]", "text"),
+        "location": (f".//*[{_has_class('location')}]", "text"),
+    },
+}
+
+
+# [THEM MOI] Spec chi tiet + cot bat buoc theo Nguon (dung boi lenh `parse` cua html_store)
+DETAIL_SPECS = {
+    "TopCV": (TOPCV_DETAIL_SPEC, TOPCV_REQUIRED_FIELDS),
+    "CareerLink": (CAREERLINK_DETAIL_SPEC, CAREERLINK_REQUIRED_FIELDS),
+    "CareerViet": (CAREERVIET_DETAIL_SPEC, CAREERVIET_REQUIRED_FIELDS),
+}
@@ -0,0 +1,228 @@
+# scrapers/throttle.py
+
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+
+# [THEM MOI] Toc do mac dinh (request/giay) cho tung host.
+# Tinh tu khoang nghi cu cua scraper: vd CareerLink nghi 4-8s giua 2 job -> ~1 request / 6s.
+DEFAULT_HOST_RATES = {
+    "www.topcv.vn": 1 / 3.5,
+    "www.careerlink.vn": 1 / 6,
+    "careerviet.vn": 1 / 6,
+    "jobsgo.vn": 1 / 3.5,
+    "ms.vietnamworks.com": 1.0, # API JSON (scrapers/Vietnamwork.py), truoc day nghi 1s giua 2 request
+}
+DEFAULT_RATE = 1 / 5
+
+
+def host_of(url_or_host):
+    """Lay host tu URL (hoac tra ve nguyen chuoi neu da la host)."""
+    if "://" in url_or_host:
+        return urlparse(url_or_host).netloc.lower()
+    return url_or_host.lower()
+
+
+class TokenBucket:
+    """
+    [THEM MOI] Token bucket an toan cho nhieu thread.
+    `rate` token/giay, toi da `capacity` token. Moi request ton 1 token;
+    neu het token thi "dat cho" truoc (token am) va tra ve thoi gian phai doi.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def reserve(self):
+        """Lay 1 token, tra ve so giay can doi truoc khi duoc gui request."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def set_rate(self, rate):
+        """Doi toc do (dung boi bo dieu tiet thich nghi)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class SharedTokenBucket:
+    """
+    [THEM MOI] Token bucket dung chung giua nhieu TIEN TRINH (vd cac danh muc cua scrapers/category_runner.py):
+    trang thai (token, toc do) nam trong multiprocessing.Manager, moi thao tac giu 1 Manager.Lock.
+    Cung giao dien voi TokenBucket -> AIMD giam toc o 1 tien trinh thi moi tien trinh cung cham lai.
+    """
+
+    def __init__(self, state, lock):
+        self._state = state
+        self._lock = lock
+
+    @classmethod
+    def create(cls, manager, rate, capacity=1):
+        state = manager.dict(rate=float(rate), capacity=float(capacity), tokens=float(capacity), last=time.time())
+        return cls(state, manager.Lock())
+
+    def _refilled(self, now):
+        """Doc trang thai + so token sau khi nap them (goi khi dang giu lock). time.time: dung chung moi tien trinh."""
+        state = self._state.copy()
+        return state, min(state["capacity"], state["tokens"] + max(0.0, now - state["last"]) * state["rate"])
+
+    @property
+    def rate(self):
+        return self._state["rate"]
+
+    def reserve(self):
+        with self._lock:
+            now = time.time()
+            state, tokens = self._refilled(now)
+            tokens -= 1
+            self._state.update(tokens=tokens, last=now)
+        if tokens >= 0:
+            return 0.0
+        return -tokens / state["rate"]
+
+    def set_rate(self, rate):
+        with self._lock:
+            now = time.time()
+            _, tokens = self._refilled(now)
+            self._state.update(tokens=tokens, last=now, rate=float(rate))
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """
+    [THEM MOI] Moi host 1 TokenBucket rieng, dung chung cho moi scraper/danh muc trong cung tien trinh.
+    `buckets`: bucket dung san theo host (vd SharedTokenBucket dung chung giua cac tien trinh).
+    """
+
+    def __init__(self, rates=None, default_rate=DEFAULT_RATE, capacity=1, buckets=None):
+        self.rates = dict(DEFAULT_HOST_RATES if rates is None else rates)
+        self.default_rate = default_rate
+        self.capacity = capacity
+        self._buckets = {host_of(host): bucket for host, bucket in (buckets or {}).items()}
+        self._adaptive = {}
+        self._lock = threading.Lock()
+
+    def rate_for(self, url_or_host):
+        return self.rates.get(host_of(url_or_host), self.default_rate)
+
+    def bucket(self, url_or_host):
+        host = host_of(url_or_host)
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate_for(host), self.capacity)
+            return self._buckets[host]
+
+    def adaptive(self, url_or_host, logger=None, **kwargs):
+        """[THEM MOI] Lay bo dieu tiet AIMD (dung chung theo host) gan voi bucket cua host."""
+        host = host_of(url_or_host)
+        bucket = self.bucket(host)
+        with self._lock:
+            if host not in self._adaptive:
+                self._adaptive[host] = AdaptiveThrottle(bucket, host, logger=logger, **kwargs)
+            return self._adaptive[host]
+
+    def wait(self, url):
+        """Chan (blocking) cho den khi host cua `url` con token."""
+        return self.bucket(url).acquire()
+
+
+# [THEM MOI] Dau hieu trang bi chan / qua tai (tim trong <title> hoac dau trang).
+BLOCK_MARKERS = (
+    "too many requests", "access denied", "captcha", "attention required",
+    "service unavailable", "just a moment", "429 ", "503 ",
+)
+BACKOFF_STATUS_CODES = (403, 429) # Cung voi moi ma 5xx -> giam toc
+
+
+def looks_blocked(text):
+    """Kiem tra title/noi dung co phai trang chan (captcha, 429, 503...) khong."""
+    if not text:
+        return False
+    text = text.lower()
+    return any(marker in text for marker in BLOCK_MARKERS)
+
+
+class AdaptiveThrottle:
+    """
+    [THEM MOI] Bo dieu tiet AIMD cho 1 host, dieu khien toc do cua TokenBucket:
+    - Trang tai nhanh (< slow_latency giay): tang cong `increase` request/giay.
+    - Timeout, HTTP 403/429/5xx, trang chan hoac tai cham: nhan toc do voi `decrease`.
+    """
+
+    def __init__(self, bucket, host, logger=None, min_rate=1 / 60, max_rate=1.0,
+                 increase=0.02, decrease=0.5, slow_latency=8.0, log_every=10):
+        self.bucket = bucket
+        self.host = host
+        self.logger = logger or logging.getLogger(__name__)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_latency = slow_latency
+        self.log_every = log_every
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self.bucket.rate
+
+    def record_success(self, latency):
+        """Ghi nhan 1 request thanh cong va thoi gian tai (giay)."""
+        if latency >= self.slow_latency:
+            self.record_failure(f"tai cham {latency:.1f}s")
+            return
+        with self._lock:
+            new_rate = min(self.max_rate, self.bucket.rate + self.increase)
+            self.bucket.set_rate(new_rate)
+            self._successes += 1
+            should_log = self._successes % self.log_every == 0
+        if should_log:
+            self.logger.info(f"[AIMD] {self.host}: toc do hien tai {new_rate:.3f} req/s (~{1 / new_rate:.1f}s/request)")
+
+    def record_failure(self, reason):
+        """Ghi nhan timeout / 403 / 429 / 5xx / trang chan -> giam toc do theo cap so nhan."""
+        with self._lock:
+            new_rate = max(self.min_rate, self.bucket.rate * self.decrease)
+            self.bucket.set_rate(new_rate)
+        self.logger.warning(f"[AIMD] {self.host}: {reason} -> giam toc do con {new_rate:.3f} req/s (~{1 / new_rate:.1f}s/request)")
+
+    def record_status(self, status_code, latency):
+        """
+        Tien ich cho request HTTP: tu phan loai theo ma trang thai.
+        [THAY DOI] 403/429/5xx/loi ket noi -> giam toc; 4xx khac (404, 410...) -> trung tinh (loi cua URL,
+        khong noi gi ve tai cua server); chi 2xx/3xx moi tang toc.
+        """
+        if status_code is None:
+            self.record_failure("loi ket noi/timeout")
+        elif status_code in BACKOFF_STATUS_CODES or status_code >= 500:
+            self.record_failure(f"HTTP {status_code}")
+        elif status_code >= 400:
+            return
+        else:
+            self.record_success(latency)